@@ -15,6 +15,8 @@
 from argparse import ArgumentParser
 from typing import List
 
+from inverse_text_normalization import postprocess, sentence_cache
+from inverse_text_normalization.asm import inverse_normalize
 from inverse_text_normalization.asm.inverse_normalize import INVERSE_NORMALIZERS
 
 '''
@@ -101,21 +103,23 @@ def indian_format(word, hindi_digits_with_zero):
         return word
 
 
-def inverse_normalize_text(text_list, verbose=False):
+def _inverse_normalize_results(text_list, verbose=False):
 
-    inverse_normalizer = INVERSE_NORMALIZERS['nemo']
-    hindi_digits_with_zero = '0123456789'
-    text_list = [sent.lower() for sent in text_list]
-    inverse_normalizer_prediction = inverse_normalizer(text_list, verbose=verbose)
-    astr_list = []
-    comma_sep_num_list = []
-    inverse_normalizer_prediction = [sent.replace('\r', '') for sent in inverse_normalizer_prediction]
-    for sent in inverse_normalizer_prediction:
-        trimmed_sent = ' '.join(
-            [remove_starting_zeros(word, hindi_digits_with_zero) for word in sent.split(' ')])
-        astr_list.append(trimmed_sent)
+    inputs = [sent.lower() for sent in text_list]
+    results = inverse_normalize.inverse_normalize_results(inputs, verbose=verbose)
+    # carriage returns, leading zeros, currency signs and digit groups in one pass, see postprocess;
+    # sentences the grammars failed on are passed through unchanged, see sentence_errors
+    return postprocess.postprocess_results(text_list, results, 'asm')
+
+
+def inverse_normalize_results(text_list, verbose=False):
+    # repeated sentences are served from the sentence cache
+    return sentence_cache.cached_results('asm', text_list,
+                                         lambda sentences: _inverse_normalize_results(sentences, verbose=verbose))
 
-    return astr_list
+
+def inverse_normalize_text(text_list, verbose=False):
+    return [result.output for result in inverse_normalize_results(text_list, verbose=verbose)]
 
 
 if __name__ == "__main__":
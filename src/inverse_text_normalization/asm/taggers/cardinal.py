@@ -16,6 +16,7 @@
 import pynini
 from pynini.lib import pynutil, utf8
 
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.asm.data_loader_utils import get_abs_path
 from inverse_text_normalization.asm.graph_utils import (
     NEMO_DIGIT,
@@ -67,9 +68,9 @@ class CardinalFst(GraphFst):
         HINDI_DIGIT = pynini.union(*hindi_digits).optimize()
         HINDI_DIGIT_WITH_ZERO = pynini.union(*hindi_digits_with_zero).optimize()
 
-        graph_zero = pynini.string_file(get_abs_path(data_path + "numbers/zero.tsv"))
-        graph_tens = pynini.string_file(get_abs_path(data_path + "numbers/tens.tsv"))
-        graph_digit = pynini.string_file(get_abs_path(data_path + "numbers/digit.tsv"))
+        graph_zero = string_file(get_abs_path(data_path + "numbers/zero.tsv"))
+        graph_tens = string_file(get_abs_path(data_path + "numbers/tens.tsv"))
+        graph_digit = string_file(get_abs_path(data_path + "numbers/digit.tsv"))
 
         with open(get_abs_path(data_path + "numbers/hundred.tsv"), encoding='utf-8') as f:
             hundreds = f.readlines()
@@ -17,6 +17,7 @@
 # lang_taggers = f'inverse_text_normalization.taggers.{LANG}_taggers'
 lang_taggers = 'inverse_text_normalization.asm.taggers'
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.asm.graph_utils import GraphFst
 exec(f"from {lang_taggers}.cardinal import CardinalFst")
 exec(f"from {lang_taggers}.date import DateFst")
@@ -44,21 +45,21 @@ class ClassifyFst(GraphFst):
     def __init__(self):
         super().__init__(name="tokenize_and_classify", kind="classify")
 
-        cardinal_graph_fst = CardinalFst()
+        cardinal_graph_fst = build_grammar(CardinalFst)
         cardinal = cardinal_graph_fst.fst
 
-        ordinal_graph_fst = OrdinalFst(cardinal_graph_fst)
+        ordinal_graph_fst = build_grammar(OrdinalFst, cardinal_graph_fst)
         ordinal = ordinal_graph_fst.fst
 
-        decimal_graph_fst = DecimalFst(cardinal_graph_fst)
+        decimal_graph_fst = build_grammar(DecimalFst, cardinal_graph_fst)
         decimal = decimal_graph_fst.fst
 
-        measure = MeasureFst(cardinal_graph_fst, decimal_graph_fst).fst
-        date = DateFst(ordinal_graph_fst).fst
-        word = WordFst().fst
-        time = TimeFst().fst
-        money = MoneyFst(cardinal_graph_fst, decimal_graph_fst).fst
-        whitelist = WhiteListFst().fst
+        measure = build_grammar(MeasureFst, cardinal_graph_fst, decimal_graph_fst).fst
+        date = build_grammar(DateFst, ordinal_graph_fst).fst
+        word = build_grammar(WordFst).fst
+        time = build_grammar(TimeFst).fst
+        money = build_grammar(MoneyFst, cardinal_graph_fst, decimal_graph_fst).fst
+        whitelist = build_grammar(WhiteListFst).fst
 
         graph = (
             pynutil.add_weight(whitelist, 1.01)
@@ -17,6 +17,8 @@
 # lang_taggers = f'inverse_text_normalization.taggers.{LANG}_taggers'
 lang_taggers = 'inverse_text_normalization.asm.taggers'
 
+from inverse_text_normalization.composition import prepare_for_composition
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.asm.graph_utils import GraphFst, delete_extra_space, delete_space
 exec(f"from {lang_taggers}.punctuation import PunctuationFst")
 exec(f"from {lang_taggers}.tokenize_and_classify import ClassifyFst")
@@ -38,9 +40,12 @@ class ClassifyFinalFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="tokenize_and_classify_final", kind="classify")
+        if self.fst is not None:
+            # loaded from an up-to-date FAR
+            return
 
-        classify = ClassifyFst().fst
-        punct = PunctuationFst().fst
+        classify = build_grammar(ClassifyFst).fst
+        punct = build_grammar(PunctuationFst).fst
         token = pynutil.insert("tokens { ") + classify + pynutil.insert(" }")
         token_plus_punct = (
             pynini.closure(punct + pynutil.insert(" ")) + token + pynini.closure(pynutil.insert(" ") + punct)
@@ -49,4 +54,4 @@ class ClassifyFinalFst(GraphFst):
         graph = token_plus_punct + pynini.closure(delete_extra_space + token_plus_punct)
         graph = delete_space + graph + delete_space
 
-        self.fst = graph.optimize()
+        self.fst = prepare_for_composition(graph)
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.asm.graph_utils import NEMO_CHAR, GraphFst, delete_space
 from inverse_text_normalization.asm.verbalizers.cardinal import CardinalFst
 from inverse_text_normalization.asm.verbalizers.decimal import DecimalFst
@@ -21,15 +22,8 @@ try:
     import pynini
     from pynini.lib import pynutil
 
-    decimal = DecimalFst()
-    cardinal = CardinalFst()
-
     PYNINI_AVAILABLE = True
 except (ModuleNotFoundError, ImportError):
-    # Add placeholders
-    decimal = None
-    cardinal = None
-
     PYNINI_AVAILABLE = False
 
 
@@ -41,6 +35,8 @@ class MeasureFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="measure", kind="verbalize")
+        decimal = build_grammar(DecimalFst)
+        cardinal = build_grammar(CardinalFst)
         optional_sign = pynini.closure(pynini.cross("negative: \"true\"", "-"), 0, 1)
         unit = (
             pynutil.delete("units:")
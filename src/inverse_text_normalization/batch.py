@@ -0,0 +1,209 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import multiprocessing
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from inverse_text_normalization import sentence_errors
+from inverse_text_normalization.sentence_errors import ItemResult
+
+'''
+Batch inverse text normalization on a pool of worker processes, for lists too large for one core, e.g.
+
+    run_predict.inverse_normalize_text(transcripts, 'hi', workers=8)
+    python -m inverse_text_normalization.batch --lang hi --input transcripts.txt --output itn.txt --workers 8
+
+Each worker preloads the grammars of the languages of its pool once and then normalizes chunks of the list with
+run_predict.inverse_normalize_results. Repeated sentences are sent once. Without a chunk size, the list is cut into
+about CHUNKS_PER_WORKER chunks per worker, between MIN_CHUNK_SIZE and MAX_CHUNK_SIZE sentences each, so that
+small lists are not swamped by inter-process overhead and large ones still balance across workers. Lists of at
+most MIN_CHUNK_SIZE sentences, or a single worker, are normalized in this process. Outputs keep the input order;
+a sentence the grammars fail on comes back unchanged with its error (see sentence_errors) instead of failing its
+chunk, and the command line reports the errors of the list.
+'''
+
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_SIZE = 16
+MAX_CHUNK_SIZE = 1000
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    """
+    Returns worker count of the batch mode, ITN_BATCH_WORKERS or the number of CPUs
+    """
+    return int(os.environ.get("ITN_BATCH_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def check_args(workers: Optional[int], chunk_size: Optional[int]):
+    """
+    Raises ValueError for a worker count or chunk size of less than 1
+
+    Args:
+        workers: number of worker processes, None for default_workers()
+        chunk_size: sentences per chunk, None for adaptive
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+
+def plan_chunks(n: int, workers: int, chunk_size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Cuts a list into chunks for the workers
+
+    Args:
+        n: length of the list
+        workers: number of worker processes
+        chunk_size: sentences per chunk, adaptive if None
+
+    Returns (start, end) of the chunks, in order
+    """
+    check_args(workers, chunk_size)
+    if chunk_size is None:
+        chunk_size = min(MAX_CHUNK_SIZE, max(MIN_CHUNK_SIZE, math.ceil(n / (workers * CHUNKS_PER_WORKER))))
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+
+def _preload(langs: Tuple[str, ...]):
+    from inverse_text_normalization import run_predict
+
+    run_predict.preload_languages(langs)
+
+
+def _normalize_chunk(texts: List[str], lang: str) -> List[ItemResult]:
+    from inverse_text_normalization import run_predict
+
+    return run_predict.inverse_normalize_results(texts, lang)
+
+
+def get_pool(workers: int, langs: Iterable[str] = ()) -> ProcessPoolExecutor:
+    """
+    Returns the shared pool with the given number of workers, starting it on first use
+
+    Args:
+        workers: number of worker processes
+        langs: language codes whose grammars the workers of a new pool preload, others load on first use
+    """
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                # spawn: workers compile or load the grammars themselves instead of inheriting a copy of this process
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_preload,
+                    initargs=(tuple(langs),),
+                )
+                _pools[workers] = pool
+    return pool
+
+
+def shutdown():
+    """
+    Stops the worker processes of all shared pools
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def inverse_normalize_batch(text_list: List[str], lang: str, workers: Optional[int] = None,
+                            chunk_size: Optional[int] = None) -> List[str]:
+    """
+    Normalizes a list of sentences on a pool of worker processes
+
+    Args:
+        text_list: sentences
+        lang: language code, e.g. 'hi', 'or'
+        workers: number of worker processes, default_workers() if None
+        chunk_size: sentences per chunk, adaptive if None
+
+    Returns outputs in the order of text_list, as run_predict.inverse_normalize_text
+    """
+    results = inverse_normalize_batch_results(text_list, lang, workers=workers, chunk_size=chunk_size)
+    return [result.output for result in results]
+
+
+def inverse_normalize_batch_results(text_list: List[str], lang: str, workers: Optional[int] = None,
+                                    chunk_size: Optional[int] = None) -> List[ItemResult]:
+    """
+    Normalizes a list of sentences on a pool of worker processes, with a result per sentence
+
+    Args:
+        text_list: sentences
+        lang: language code, e.g. 'hi', 'or'
+        workers: number of worker processes, default_workers() if None
+        chunk_size: sentences per chunk, adaptive if None
+
+    Returns results in the order of text_list, as run_predict.inverse_normalize_results
+    """
+    workers = default_workers() if workers is None else workers
+    check_args(workers, chunk_size)
+    if not text_list:
+        return []
+    unique = list(OrderedDict.fromkeys(text_list))
+    if workers <= 1 or len(unique) <= MIN_CHUNK_SIZE:
+        results = _normalize_chunk(unique, lang)
+    else:
+        pool = get_pool(workers, [lang])
+        futures = [pool.submit(_normalize_chunk, unique[start:end], lang)
+                   for start, end in plan_chunks(len(unique), workers, chunk_size)]
+        results = [result for future in futures for result in future.result()]
+    normalized = dict(zip(unique, results))
+    return [normalized[text] for text in text_list]
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language code, e.g. hi", required=True, type=str)
+    parser.add_argument("--input", help="text file, one sentence per line", required=True, type=str)
+    parser.add_argument("--output", help="text file for the normalized sentences", required=True, type=str)
+    parser.add_argument("--workers", help="number of worker processes", type=int, default=default_workers())
+    parser.add_argument("--chunk_size", help="sentences per chunk, adaptive by default", type=int)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.input, encoding="utf-8") as fp:
+        sentences = [line.rstrip("\n") for line in fp]
+    start = time.perf_counter()
+    results = inverse_normalize_batch_results(sentences, args.lang, workers=args.workers,
+                                              chunk_size=args.chunk_size)
+    with open(args.output, "w", encoding="utf-8") as fp:
+        fp.writelines(f"{result.output}\n" for result in results)
+    print(f"{len(results)} sentences in {time.perf_counter() - start:.2f}s with {args.workers} workers")
+    report = sentence_errors.summarize(results, max_samples=5)
+    if report["errors"]:
+        print(f"{report['errors']} sentences passed through unchanged: {report['error_types']}")
+        for sample in report["samples"]:
+            print(f"  {sample['error']}: {sample['text']}")
+    if report["limits"]:
+        print(f"{report['limits']} sentences over a limit of sentence_limits, not cached")
+    shutdown()
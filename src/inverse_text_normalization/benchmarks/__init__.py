@@ -0,0 +1,58 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+import re
+from typing import List
+
+'''
+Benchmarks of the ITN pipeline, run as `python -m inverse_text_normalization.benchmarks.<name> --help`.
+'''
+
+LANGUAGES = ("hi", "en", "gu", "te", "mr", "pa", "ta", "bn", "ml", "ori", "asm", "kn")
+
+# en has no itn_tests
+ENGLISH_SENTENCES = [
+    "i have twenty three apples",
+    "the meeting is at ten thirty",
+    "it costs five hundred dollars",
+    "he ran forty two point five kilometers",
+    "we met on the first of january",
+]
+
+_DATA_LIST = re.compile(r"\bdata\s*=\s*\[(.*?)\]", re.DOTALL)
+_STRING = re.compile(r"'([^'\\\n]*)'|\"([^\"\\\n]*)\"")
+
+
+def sample_sentences(lang: str) -> List[str]:
+    """
+    Returns the test inputs of a language package, read from the `data = [...]` lists of its itn_tests
+    (with a regex, so that test files that do not compile still count)
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    lang_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), lang)
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(lang_dir, "itn_tests", "*.py"))):
+        with open(path, encoding="utf-8") as fp:
+            source = fp.read()
+        for block in _DATA_LIST.findall(source):
+            sentences.extend(single or double for single, double in _STRING.findall(block))
+    sentences = [sentence.strip() for sentence in sentences if sentence.strip()]
+    if not sentences and lang == "en":
+        sentences = list(ENGLISH_SENTENCES)
+    # de-duplicate, keeping order
+    return list(dict.fromkeys(sentences))
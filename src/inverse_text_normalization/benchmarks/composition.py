@@ -0,0 +1,107 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import json
+import time
+from argparse import ArgumentParser
+from typing import Callable, Dict, List
+
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.benchmarks.field_order import generate_permutations
+from inverse_text_normalization.composition import compose_text
+from inverse_text_normalization.token_parser import parse_tokens
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Per-sentence composition time of the final tagger and verbalizer, before and after prepare_for_composition:
+
+    python -m inverse_text_normalization.benchmarks.composition [--lang hi ta] [--repeat 5]
+
+"before" composes with a copy of the grammar sorted on output labels, i.e. as unsorted for composition
+as the grammars were before they were prepared, using plain `text @ fst`.
+'''
+
+
+def _time_per_call(fn: Callable[[str], object], inputs: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            fn(text)
+    return (time.perf_counter() - start) / max(len(inputs) * repeat, 1)
+
+
+def benchmark_language(lang: str, repeat: int = 3) -> Dict[str, object]:
+    """
+    Measures mean composition time per sentence of one language package
+
+    Args:
+        lang: language package
+        repeat: passes over the sample sentences
+
+    Returns timings in milliseconds
+    """
+    module = importlib.import_module(f"inverse_text_normalization.{lang}.inverse_normalize")
+    tagger, verbalizer = module.tagger.fst, module.verbalizer.fst
+    unprepared_tagger = tagger.copy().arcsort(sort_type="olabel")
+    unprepared_verbalizer = verbalizer.copy().arcsort(sort_type="olabel")
+
+    texts = [pynini.escape(sentence) for sentence in sample_sentences(lang)]
+    tagged_texts = []
+    for text in texts:
+        tokens = parse_tokens(module.select_tag(compose_text(text, tagger)))
+        tagged_texts.append(pynini.escape(next(generate_permutations(tokens))))
+
+    result = {"lang": lang, "sentences": len(texts)}
+    for kind, inputs, before, after in (
+        ("tagger", texts, unprepared_tagger, tagger),
+        ("verbalizer", tagged_texts, unprepared_verbalizer, verbalizer),
+    ):
+        before_ms = 1000 * _time_per_call(lambda text: text @ before, inputs, repeat)
+        after_ms = 1000 * _time_per_call(lambda text: compose_text(text, after), inputs, repeat)
+        result[kind] = {
+            "before_ms": round(before_ms, 3),
+            "after_ms": round(after_ms, 3),
+            "speedup": round(before_ms / after_ms, 2) if after_ms else None,
+        }
+    return result
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages", nargs="+", choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument("--repeat", help="passes over the sample sentences", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = [benchmark_language(lang, repeat=args.repeat) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(results, fp, indent=2)
+    print(f"{'lang':<5} {'n':>4} {'tagger before':>14} {'after':>8} {'x':>6} {'verbalizer before':>18} {'after':>8} {'x':>6}")
+    for r in results:
+        t, v = r["tagger"], r["verbalizer"]
+        print(
+            f"{r['lang']:<5} {r['sentences']:>4} {t['before_ms']:>12.3f}ms {t['after_ms']:>6.3f}ms {t['speedup']:>6} "
+            f"{v['before_ms']:>16.3f}ms {v['after_ms']:>6.3f}ms {v['speedup']:>6}"
+        )
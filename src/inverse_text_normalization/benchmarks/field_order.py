@@ -0,0 +1,201 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import itertools
+import json
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from typing import Dict, List
+
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.field_order import FieldOrders
+from inverse_text_normalization.token_parser import PRESERVE_ORDER_KEY, parse_tokens
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Verbalizer compositions and time per sentence of the permutation loop and of FieldOrders:
+
+    python -m inverse_text_normalization.benchmarks.field_order [--lang en hi] [--join 3] [--repeat 3]
+
+The inputs are the sample sentences of each language plus field-heavy English ones (dates, measures, decimals
+with quantity, times with zone); --join concatenates that many sentences into one, as in long utterances,
+where the permutation loop grows with the product of the field orders of the tokens.
+'''
+
+FIELD_HEAVY_SENTENCES = [
+    "on the fifth of march twenty twenty one",
+    "he ran forty two point five kilometers",
+    "the company made two point five billion dollars",
+    "the call is at twelve thirty p m e s t",
+    "it weighs three hundred and five kilograms",
+    "we met on january first nineteen ninety",
+]
+
+
+def _permute(d: OrderedDict) -> List[str]:
+    """
+    Creates reorderings of dictionary elements and serializes as strings
+
+    Args:
+        d: (nested) dictionary of key value pairs
+
+    Return permutations of different string serializations of key value pairs
+    """
+    l = []
+    if PRESERVE_ORDER_KEY in d.keys():
+        d_permutations = [d.items()]
+    else:
+        d_permutations = itertools.permutations(d.items())
+    for perm in d_permutations:
+        subl = [""]
+        for k, v in perm:
+            if isinstance(v, str):
+                subl = ["".join(x) for x in itertools.product(subl, [f"{k}: \"{v}\" "])]
+            elif isinstance(v, OrderedDict):
+                rec = _permute(v)
+                subl = ["".join(x) for x in itertools.product(subl, [f" {k} {{ "], rec, [f" }} "])]
+            elif isinstance(v, bool):
+                subl = ["".join(x) for x in itertools.product(subl, [f"{k}: true "])]
+            else:
+                raise ValueError()
+        l.extend(subl)
+    return l
+
+
+def generate_permutations(tokens: List[dict]):
+    """
+    Generates permutations of string serializations of list of dictionaries, the permutation loop every language
+    package carried before field_order.py and the baseline of the benchmark
+
+    Args:
+        tokens: list of dictionaries
+
+    Returns string serialization of list of dictionaries
+    """
+
+    def _helper(prefix: str, tokens: List[dict], idx: int):
+        """
+        Generates permutations of string serializations of given dictionary
+
+        Args:
+            tokens: list of dictionaries
+            prefix: prefix string
+            idx:    index of next dictionary
+
+        Returns string serialization of dictionary
+        """
+        if idx == len(tokens):
+            yield prefix
+            return
+        token_options = _permute(tokens[idx])
+        for token_option in token_options:
+            yield from _helper(prefix + token_option, tokens, idx + 1)
+
+    return _helper("", tokens, 0)
+
+
+def _permutation_loop(module, tokens, verbalizer_fst, counter: List[int]):
+    for tagged_text in generate_permutations(tokens):
+        counter[0] += 1
+        lattice = module.find_verbalizer(pynini.escape(tagged_text), verbalizer_fst)
+        if lattice.num_states() != 0:
+            return module.select_verbalizer(lattice)
+    raise ValueError()
+
+
+def benchmark_language(lang: str, join: int = 1, repeat: int = 3) -> Dict[str, object]:
+    """
+    Measures verbalizer compositions and time per sentence of one language package, with both methods
+
+    Args:
+        lang: language package
+        join: sentences concatenated into one input
+        repeat: passes over the inputs
+
+    Returns compositions per sentence and milliseconds per sentence
+    """
+    module = importlib.import_module(f"inverse_text_normalization.{lang}.inverse_normalize")
+    sentences = sample_sentences(lang) + (FIELD_HEAVY_SENTENCES if lang == "en" else [])
+    texts = [" ".join(sentences[i : i + join]) for i in range(0, len(sentences), join)]
+    verbalizer_fst = module.verbalizer.fst
+    parsed = []
+    for text in texts:
+        parsed.append(parse_tokens(module.select_tag(module.find_tags(pynini.escape(text), module.tagger.fst))))
+
+    counter = [0]
+    start = time.perf_counter()
+    loop_outputs = [None] * len(parsed)
+    for _ in range(repeat):
+        for i, tokens in enumerate(parsed):
+            loop_outputs[i] = _permutation_loop(module, tokens, verbalizer_fst, counter)
+    loop_ms = 1000 * (time.perf_counter() - start) / (len(parsed) * repeat)
+    loop_compositions = counter[0] / (len(parsed) * repeat)
+
+    field_orders = FieldOrders()
+
+    def compose(tagged_text):
+        return module.find_verbalizer(pynini.escape(tagged_text), verbalizer_fst)
+
+    # first pass learns the field orders
+    cold_outputs = [module.select_verbalizer(field_orders.verbalize(tokens, compose)) for tokens in parsed]
+    cold_compositions = field_orders.stats["compositions"] / len(parsed)
+    field_orders.stats["compositions"] = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        warm_outputs = [module.select_verbalizer(field_orders.verbalize(tokens, compose)) for tokens in parsed]
+    warm_ms = 1000 * (time.perf_counter() - start) / (len(parsed) * repeat)
+
+    return {
+        "lang": lang,
+        "sentences": len(parsed),
+        "same_output": loop_outputs == cold_outputs == warm_outputs,
+        "loop": {"compositions": round(loop_compositions, 2), "ms": round(loop_ms, 3)},
+        "field_orders": {
+            "cold_compositions": round(cold_compositions, 2),
+            "compositions": round(field_orders.stats["compositions"] / (len(parsed) * repeat), 2),
+            "ms": round(warm_ms, 3),
+        },
+    }
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages", nargs="+", choices=LANGUAGES, default=["en", "hi"])
+    parser.add_argument("--join", help="sentences concatenated into one input", type=int, default=1)
+    parser.add_argument("--repeat", help="passes over the inputs", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = [benchmark_language(lang, join=args.join, repeat=args.repeat) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(results, fp, indent=2)
+    print(f"{'lang':<5} {'n':>4} {'loop comp':>10} {'loop ms':>9} {'cold comp':>10} {'comp':>6} {'ms':>8} {'same':>5}")
+    for r in results:
+        loop, orders = r["loop"], r["field_orders"]
+        print(
+            f"{r['lang']:<5} {r['sentences']:>4} {loop['compositions']:>10} {loop['ms']:>9.3f} "
+            f"{orders['cold_compositions']:>10} {orders['compositions']:>6} {orders['ms']:>8.3f} {str(r['same_output']):>5}"
+        )
@@ -0,0 +1,188 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import random
+import time
+from argparse import ArgumentParser
+from typing import Dict, List
+
+from inverse_text_normalization import postprocess
+from inverse_text_normalization.benchmarks import LANGUAGES
+
+'''
+Post-processing of grammar outputs, the three-pass pipeline it replaced against postprocess.py:
+
+    python -m inverse_text_normalization.benchmarks.postprocess [--lang hi ta] [--sentences 1000000]
+
+The outputs are synthetic written forms (words, numbers with and without leading zeros, amounts with a currency
+sign, decimals, times); both pipelines must give the same outputs.
+'''
+
+WORDS = ["मेरे", "पास", "लोग", "हैं", "रुपये", "की", "बोतल", "दो", "at", "the", "meeting", "km", "बजे", "तारीख"]
+
+
+def remove_starting_zeros(word: str, currencies: str, keep_zero_words: bool) -> str:
+    """
+    remove_starting_zeros of `<lang>/run_predict.py`, with the currency signs and zero words of a language
+    """
+    currency = ''
+    if word[0] in currencies:
+        currency = word[0]
+        word = word[1:]
+
+    if keep_zero_words and (word == "0" or word == "00" or word == "000"):
+        return word
+
+    if all(v == '0' for v in word):
+        word = ''
+
+    elif word[0] in '0123456789' and len(word) > 1:
+        if all([digit == "0" for digit in list(word)]):
+            return "1" + word
+        if '.' in word:
+            if len(word.split('.')[0]) == 1:
+                return word
+        pos_non_zero_nums = [pos for pos, word in enumerate(list(word)) if word != "0"]
+        first_non_zero_num = min(pos_non_zero_nums)
+        word = word[first_non_zero_num:]
+    if currency:
+        word = currency + ' ' + word
+    return word
+
+
+def format_numbers_with_commas(sent: str, lang: str) -> str:
+    """
+    format_numbers_with_commas of run_predict.py, which cut the digits into Indian groups for 'hi' only
+    """
+    words = []
+    for word in sent.split(' '):
+        word_contains_digit = any(map(str.isdigit, word))
+        currency_sign = ''
+        if word_contains_digit:
+            if len(word) > 4 and ':' not in word:
+                pos_of_first_digit_in_word = list(map(str.isdigit, word)).index(True)
+
+                if pos_of_first_digit_in_word != 0:  # word can be like $90,00,936.59
+                    currency_sign = word[:pos_of_first_digit_in_word]
+                    word = word[pos_of_first_digit_in_word:]
+
+                s, *d = str(word).partition(".")
+                # getting [num_before_decimal_point, decimal_point, num_after_decimal_point]
+                if lang == 'hi':
+                    # adding commas after every 2 digits after the last 3 digits
+                    r = "".join([s[x - 2:x] for x in range(-3, -len(s), -2)][::-1] + [s[-3:]])
+                else:
+                    r = "".join([s[x - 3:x] for x in range(-3, -len(s), -3)][::-1] + [s[-3:]])
+
+                word = "".join([r] + d)  # joining decimal points as is
+
+                if currency_sign:
+                    word = currency_sign + word
+                words.append(word)
+            else:
+                words.append(word)
+        else:
+            words.append(word)
+    return ' '.join(words)
+
+
+def legacy_postprocess(sentences: List[str], lang: str) -> List[str]:
+    """
+    Post-processes grammar outputs as `<lang>/run_predict.py` and run_predict.inverse_normalize_text did
+
+    Args:
+        sentences: grammar outputs
+        lang: language package
+    """
+    currencies, keep_zero_words = postprocess.LANGUAGE_RULES[lang]
+    sentences = [sent.replace('\r', '') for sent in sentences]
+    trimmed = [' '.join([remove_starting_zeros(word, currencies, keep_zero_words) for word in sent.split(' ')])
+               for sent in sentences]
+    return [format_numbers_with_commas(sent=sent, lang='hi') for sent in trimmed]
+
+
+def synthetic_outputs(n: int, seed: int = 0) -> List[str]:
+    """
+    Returns n synthetic grammar outputs
+
+    Args:
+        n: sentences
+        seed: random seed
+    """
+    rng = random.Random(seed)
+    numbers = [
+        lambda: str(rng.randint(1, 10 ** rng.randint(1, 9))),
+        lambda: "0" * rng.randint(1, 3) + str(rng.randint(1, 999)),
+        lambda: "0" * rng.randint(1, 5),
+        lambda: rng.choice("$₹£€") + str(rng.randint(0, 10 ** 7)),
+        lambda: f"{rng.randint(0, 99999)}.{rng.randint(0, 99)}",
+        lambda: f"{rng.randint(1, 12)}:{rng.randint(0, 59):02d}",
+    ]
+    outputs = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(3, 12))
+        if rng.random() < 0.4:
+            for _ in range(rng.randint(1, 3)):
+                words.insert(rng.randint(0, len(words)), rng.choice(numbers)())
+        sentence = " ".join(words)
+        outputs.append(sentence + "\r" if rng.random() < 0.05 else sentence)
+    return outputs
+
+
+def benchmark_language(lang: str, outputs: List[str]) -> Dict[str, object]:
+    """
+    Measures sentences per second of both pipelines on one language
+
+    Args:
+        lang: language package
+        outputs: grammar outputs
+    """
+    start = time.perf_counter()
+    expected = legacy_postprocess(outputs, lang)
+    legacy_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    fused = postprocess.postprocess_batch(outputs, lang)
+    fused_seconds = time.perf_counter() - start
+    return {
+        "lang": lang,
+        "sentences": len(outputs),
+        "legacy_sentences_per_second": round(len(outputs) / legacy_seconds, 1),
+        "fused_sentences_per_second": round(len(outputs) / fused_seconds, 1),
+        "speedup": round(legacy_seconds / fused_seconds, 2),
+        "same_output": fused == expected,
+    }
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages", nargs="+", choices=LANGUAGES, default=["hi", "ta", "pa"])
+    parser.add_argument("--sentences", help="synthetic grammar outputs", type=int, default=1000000)
+    parser.add_argument("--json", help="write the results to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    data = synthetic_outputs(args.sentences)
+    reports = [benchmark_language(lang, data) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(reports, fp, indent=2)
+    print(f"{'lang':<5} {'sentences':>10} {'legacy/s':>12} {'fused/s':>12} {'speedup':>8} {'same':>5}")
+    for r in reports:
+        print(
+            f"{r['lang']:<5} {r['sentences']:>10} {r['legacy_sentences_per_second']:>12.1f} "
+            f"{r['fused_sentences_per_second']:>12.1f} {r['speedup']:>8} {str(r['same_output']):>5}"
+        )
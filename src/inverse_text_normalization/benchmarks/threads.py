@@ -0,0 +1,89 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# every pass should normalize, not read the sentence cache
+os.environ.setdefault("ITN_SENTENCE_CACHE_SIZE", "0")
+
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.normalizer import InverseNormalizer
+
+'''
+Throughput of one shared InverseNormalizer served from thread pools of increasing size:
+
+    python -m inverse_text_normalization.benchmarks.threads [--lang hi] [--threads 1 2 4 8] [--repeat 5]
+
+Every thread count normalizes the sample sentences of the language `repeat` times; the outputs are checked
+against a single-threaded pass. The sentence cache is off unless ITN_SENTENCE_CACHE_SIZE is set.
+'''
+
+
+def benchmark_language(lang: str, threads: List[int], repeat: int = 5) -> Dict[str, object]:
+    """
+    Measures sentences per second of one language with each thread count
+
+    Args:
+        lang: language package
+        threads: thread pool sizes
+        repeat: passes over the sample sentences
+
+    Returns throughput and speedup over the first thread count, per thread count
+    """
+    normalizer = InverseNormalizer(lang)
+    sentences = sample_sentences(lang) * repeat
+    expected = [normalizer.normalize(sentence) for sentence in sentences]
+    results = []
+    for count in threads:
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            start = time.perf_counter()
+            outputs = list(pool.map(normalizer.normalize, sentences))
+            seconds = time.perf_counter() - start
+        results.append({
+            "threads": count,
+            "sentences_per_second": round(len(sentences) / seconds, 1),
+            "same_output": outputs == expected,
+        })
+    for result in results:
+        result["speedup"] = round(result["sentences_per_second"] / results[0]["sentences_per_second"], 2)
+    return {"lang": lang, "sentences": len(sentences), "results": results}
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages", nargs="+", choices=LANGUAGES, default=["hi"])
+    parser.add_argument("--threads", help="thread pool sizes", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", help="passes over the sample sentences", type=int, default=5)
+    parser.add_argument("--json", help="write the results to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    reports = [benchmark_language(lang, args.threads, repeat=args.repeat) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(reports, fp, indent=2)
+    print(f"{'lang':<5} {'threads':>7} {'sent/s':>10} {'speedup':>8} {'same':>5}")
+    for report in reports:
+        for r in report["results"]:
+            print(
+                f"{report['lang']:<5} {r['threads']:>7} {r['sentences_per_second']:>10.1f} {r['speedup']:>8} "
+                f"{str(r['same_output']):>5}"
+            )
@@ -12,16 +12,48 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+import json
 import string
+import time
+from argparse import ArgumentParser
 from collections import OrderedDict
 from typing import Dict, List, Union
 
-PRESERVE_ORDER_KEY = "preserve_order"
-EOS = "<EOS>"
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.token_parser import EOS, PRESERVE_ORDER_KEY, TokenParser
 
+try:
+    import pynini
 
-class TokenParser:
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Parse time per sentence of the shared TokenParser against the per-character parser it replaced:
+
+    python -m inverse_text_normalization.benchmarks.token_parser [--lang hi ta] [--repeat 20]
+
+With pynini the inputs are the tagger output of the sample sentences of each language; without it they are
+synthetic tagger output, every word of the sample sentences as a name token and every third one as a class
+token of CLASS_TOKENS.
+'''
+
+CLASS_TOKENS = [
+    'tokens { cardinal { negative: "-" integer: "23" } }',
+    'tokens { decimal { integer_part: "12" fractional_part: "5006" quantity: "billion" } }',
+    'tokens { measure { cardinal { integer: "12" } units: "kg" } }',
+    'tokens { money { currency: "$" integer_part: "12" fractional_part: "05" } }',
+    'tokens { time { hours: "12" minutes: "30" suffix: "p.m." } }',
+    'tokens { date { month: "january" day: "5" year: "2012" preserve_order: true } }',
+    'tokens { name: "." pause_length: "PAUSE_LONG\u00a0phrase_break:\u00a0true\u00a0type:\u00a0PUNCT" }',
+]
+
+
+class CharTokenParser:
     """
+    Per-character parser that every language package carried before token_parser.py, the baseline of the benchmark.
     Parses tokenized/classified text, e.g. 'tokens { money { integer: "20" currency: "$" } } tokens { name: "left"}'
 
     Args
@@ -191,3 +223,87 @@ class TokenParser:
             return True
         self.char = EOS
         return False
+
+
+def tagged_sentences(lang: str) -> List[str]:
+    """
+    Returns tagger output for the sample sentences of a language package
+
+    Args:
+        lang: language package
+    """
+    sentences = sample_sentences(lang)
+    if PYNINI_AVAILABLE:
+        module = importlib.import_module(f"inverse_text_normalization.{lang}.inverse_normalize")
+        return [module.select_tag(module.find_tags(pynini.escape(sentence))) for sentence in sentences]
+    tagged = []
+    for sentence in sentences:
+        tokens = []
+        for i, word in enumerate(sentence.replace('"', "").split()):
+            if i % 3 == 2:
+                tokens.append(CLASS_TOKENS[i % len(CLASS_TOKENS)])
+            else:
+                tokens.append(f'tokens {{ name: "{word}" }}')
+        if tokens:
+            tagged.append(" ".join(tokens))
+    return tagged
+
+
+def _time_per_sentence(parser, inputs: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            parser(text)
+            parser.parse()
+    return (time.perf_counter() - start) / max(len(inputs) * repeat, 1)
+
+
+def benchmark_language(lang: str, repeat: int = 20) -> Dict[str, object]:
+    """
+    Measures mean parse time per sentence of one language package with both parsers
+
+    Args:
+        lang: language package
+        repeat: passes over the tagged sentences
+
+    Returns timings in microseconds and whether both parsers gave the same dictionaries
+    """
+    inputs = tagged_sentences(lang)
+    char_parser, parser = CharTokenParser(), TokenParser()
+    same = True
+    for text in inputs:
+        char_parser(text)
+        parser(text)
+        same = same and char_parser.parse() == parser.parse()
+    before = _time_per_sentence(char_parser, inputs, repeat)
+    after = _time_per_sentence(parser, inputs, repeat)
+    return {
+        "lang": lang,
+        "sentences": len(inputs),
+        "same_output": same,
+        "char_us": round(1e6 * before, 2),
+        "regex_us": round(1e6 * after, 2),
+        "speedup": round(before / after, 2) if after else None,
+    }
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages", nargs="+", choices=LANGUAGES, default=list(LANGUAGES))
+    parser.add_argument("--repeat", help="passes over the tagged sentences", type=int, default=20)
+    parser.add_argument("--json", help="write the results to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = [benchmark_language(lang, repeat=args.repeat) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(results, fp, indent=2)
+    print(f"{'lang':<5} {'n':>4} {'char us':>9} {'regex us':>9} {'speedup':>8} {'same':>5}")
+    for r in results:
+        print(
+            f"{r['lang']:<5} {r['sentences']:>4} {r['char_us']:>9.2f} {r['regex_us']:>9.2f} "
+            f"{r['speedup']:>8} {str(r['same_output']):>5}"
+        )
@@ -12,9 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import itertools
 import sys
-from collections import OrderedDict
 from typing import List
 
 # from inverse_text_normalization.lang_params import LANG
@@ -23,99 +21,71 @@ from typing import List
 
 # exec(f"from {lang_taggers}.tokenize_and_classify_final import ClassifyFinalFst")
 
-from inverse_text_normalization.bn.taggers.tokenize_and_classify_final import ClassifyFinalFst
-from inverse_text_normalization.bn.token_parser import PRESERVE_ORDER_KEY, TokenParser
-from inverse_text_normalization.bn.verbalizers.verbalize_final import VerbalizeFinalFst
-from tqdm import tqdm
+from inverse_text_normalization import (
+    chunking,
+    native_verbalizer,
+    number_fallback,
+    sentence_errors,
+    sentence_limits,
+    span_window,
+    trigger_filter,
+)
+from inverse_text_normalization.composition import compose_text
+from inverse_text_normalization.field_order import FieldOrders
+from inverse_text_normalization.grammar_registry import get_registry
+from inverse_text_normalization.token_parser import parse_tokens
 
 try:
     import pynini
 
+    from inverse_text_normalization.bn.taggers.tokenize_and_classify_final import ClassifyFinalFst
+    from inverse_text_normalization.bn.verbalizers.verbalize_final import VerbalizeFinalFst
+
     tagger = ClassifyFinalFst()
     verbalizer = VerbalizeFinalFst()
-    parser = TokenParser()
+    # sub-grammars are composed into tagger and verbalizer by now, release the shared instances
+    get_registry('bn').clear()
 
     PYNINI_AVAILABLE = True
 except (ModuleNotFoundError, ImportError):
     # Add placeholders
     tagger = None
     verbalizer = None
-    parser = None
 
     PYNINI_AVAILABLE = False
 
+# tagger and verbalizer as one pair, read once per sentence so that a reload never mixes the two
+_grammars = (tagger, verbalizer)
+# field orders of the tagger output accepted by the verbalizer
+_field_orders = FieldOrders()
 
-def _permute(d: OrderedDict) -> List[str]:
-    """
-    Creates reorderings of dictionary elements and serializes as strings
 
-    Args:
-        d: (nested) dictionary of key value pairs
-
-    Return permutations of different string serializations of key value pairs
-    """
-    l = []
-    if PRESERVE_ORDER_KEY in d.keys():
-        d_permutations = [d.items()]
-    else:
-        d_permutations = itertools.permutations(d.items())
-    for perm in d_permutations:
-        subl = [""]
-        for k, v in perm:
-            if isinstance(v, str):
-                subl = ["".join(x) for x in itertools.product(subl, [f"{k}: \"{v}\" "])]
-            elif isinstance(v, OrderedDict):
-                rec = _permute(v)
-                subl = ["".join(x) for x in itertools.product(subl, [f" {k} {{ "], rec, [f" }} "])]
-            elif isinstance(v, bool):
-                subl = ["".join(x) for x in itertools.product(subl, [f"{k}: true "])]
-            else:
-                raise ValueError()
-        l.extend(subl)
-    return l
-
-
-def generate_permutations(tokens: List[dict]):
-    """
-    Generates permutations of string serializations of list of dictionaries
+def swap_grammars(new_tagger, new_verbalizer):
+    """
+    Replaces tagger and verbalizer, e.g. with grammars rebuilt by grammar_reload.reload_lexicons.
+    Sentences being normalized finish with the previous pair.
 
     Args:
-        tokens: list of dictionaries
-
-    Returns string serialization of list of dictionaries
+        new_tagger: ClassifyFinalFst
+        new_verbalizer: VerbalizeFinalFst
     """
+    global tagger, verbalizer, _grammars
+    _grammars = (new_tagger, new_verbalizer)
+    tagger, verbalizer = new_tagger, new_verbalizer
+    _field_orders.clear()
 
-    def _helper(prefix: str, tokens: List[dict], idx: int):
-        """
-        Generates permutations of string serializations of given dictionary
-
-        Args:
-            tokens: list of dictionaries
-            prefix: prefix string
-            idx:    index of next dictionary
 
-        Returns string serialization of dictionary
-        """
-        if idx == len(tokens):
-            yield prefix
-            return
-        token_options = _permute(tokens[idx])
-        for token_option in token_options:
-            yield from _helper(prefix + token_option, tokens, idx + 1)
-
-    return _helper("", tokens, 0)
-
-
-def find_tags(text: str) -> 'pynini.FstLike':
+def find_tags(text: str, tagger_fst: 'pynini.FstLike' = None) -> 'pynini.FstLike':
     """
     Given text use tagger Fst to tag text
 
     Args:
         text: sentence
+        tagger_fst: tagger to use, defaults to the current tagger
 
     Returns: tagged lattice
     """
-    lattice = text @ tagger.fst
+    lattice = compose_text(text, tagger.fst if tagger_fst is None else tagger_fst)
     return lattice
 
 
@@ -132,17 +102,23 @@ def select_tag(lattice: 'pynini.FstLike') -> str:
     return tagged_text
 
 
-def find_verbalizer(tagged_text: str) -> 'pynini.FstLike':
+if PYNINI_AVAILABLE:
+    # the words the current tagger changes on their own are the triggers of trigger_filter
+    trigger_filter.register_tagger('bn', lambda word: select_tag(find_tags(pynini.escape(word), _grammars[0].fst)))
+
+
+def find_verbalizer(tagged_text: str, verbalizer_fst: 'pynini.FstLike' = None) -> 'pynini.FstLike':
     """
     Given tagged text, e.g. token {name: ""} token {money {fractional: ""}}, creates verbalization lattice
     This is context-independent.
 
     Args:
         tagged_text: input text
+        verbalizer_fst: verbalizer to use, defaults to the current verbalizer
 
     Returns: verbalized lattice
     """
-    lattice = tagged_text @ verbalizer.fst
+    lattice = compose_text(tagged_text, verbalizer.fst if verbalizer_fst is None else verbalizer_fst)
     return lattice
 
 
@@ -169,25 +145,70 @@ def inverse_normalize(text: str, verbose: bool) -> str:
 
     Returns: written form
     """
+    # sentences without number words, digits or punctuation, see trigger_filter
+    output = trigger_filter.skip_grammars(text, 'bn')
+    if output is not None:
+        if verbose:
+            print(output)
+        return output
 
-    text = pynini.escape(text)
-    tagged_lattice = find_tags(text)
-    # # print("tagged lattice is ", tagged_lattice)
-    tagged_text = select_tag(tagged_lattice)
-    parser(tagged_text)
-    tokens = parser.parse()
-    tags_reordered = generate_permutations(tokens)
-    for tagged_text in tags_reordered:
-        tagged_text = pynini.escape(tagged_text)
-        # # print("tagged text is ", tagged_text)
-        verbalizer_lattice = find_verbalizer(tagged_text)
-        if verbalizer_lattice.num_states() == 0:
-            continue
-        output = select_verbalizer(verbalizer_lattice)
+    if not PYNINI_AVAILABLE:
+        # numbers only, see number_fallback
+        output = number_fallback.inverse_normalize(text, 'bn')
         if verbose:
             print(output)
         return output
-    raise ValueError()
+
+    # long inputs in chunks cut between number phrases (see chunking), and the number phrases of each chunk
+    # composed on their own through the span cache (see span_window)
+    output = chunking.normalize_chunks(text, 'bn', span_window.span_normalizer('bn', normalize_with_grammars))
+    if verbose:
+        print(output)
+    return output
+
+
+def normalize_with_grammars(text: str) -> str:
+    """
+    Normalizes text with the current tagger and verbalizer, within the limits of sentence_limits
+
+    Args:
+        text: sentence, or candidate span of a sentence
+
+    Returns: written form
+    """
+    return sentence_limits.normalize_within_limits(text, 'bn', _normalize_with_grammars)
+
+
+def _normalize_with_grammars(text: str, budget: sentence_limits.Budget) -> str:
+    """
+    Normalizes text with the current tagger and verbalizer
+
+    Args:
+        text: sentence, or candidate span of a sentence
+        budget: lattice and time limits, raises sentence_limits.LimitExceeded
+
+    Returns: written form
+    """
+    current_tagger, current_verbalizer = _grammars
+    text = pynini.escape(text)
+    tagged_lattice = find_tags(text, current_tagger.fst)
+    budget.check_lattice(tagged_lattice, current_tagger.fst)
+    tagged_text = select_tag(tagged_lattice)
+    budget.check_time()
+    # parse state stays local to the call, so that threads can normalize at the same time
+    tokens = parse_tokens(tagged_text)
+    # written form straight from the parsed tokens, the verbalizer FST only for what native_verbalizer does not cover
+    output = native_verbalizer.verbalize(tokens, 'bn')
+    if output is not None:
+        return output
+    # one verbalizer composition once the accepted field orders of the token shapes are known
+    verbalizer_lattice = _field_orders.verbalize(
+        tokens, lambda tagged_text: find_verbalizer(pynini.escape(tagged_text), current_verbalizer.fst)
+    )
+    if verbalizer_lattice is None or verbalizer_lattice.num_states() == 0:
+        raise ValueError()
+    output = select_verbalizer(verbalizer_lattice)
+    return output
 
 
 def inverse_normalize_identity(texts: List[str], verbose=False) -> List[str]:
@@ -202,6 +223,18 @@ def inverse_normalize_identity(texts: List[str], verbose=False) -> List[str]:
     return texts
 
 
+def inverse_normalize_results(texts: List[str], verbose=False) -> List[sentence_errors.ItemResult]:
+    """
+    NeMo inverse text normalizer with a result per input, see sentence_errors
+
+    Args:
+        texts: input strings
+
+    Returns results in the order of texts, failed inputs unchanged with their error
+    """
+    return sentence_errors.normalize_items(texts, 'bn', lambda text: inverse_normalize(text, verbose=verbose))
+
+
 def inverse_normalize_nemo(texts: List[str], verbose=False) -> List[str]:
     """
     NeMo inverse text normalizer 
@@ -209,16 +242,9 @@ def inverse_normalize_nemo(texts: List[str], verbose=False) -> List[str]:
     Args:
         texts: input strings
 
-    Returns converted input strings
+    Returns converted input strings, failed inputs unchanged
     """
-    res = []
-    for input in texts:
-        try:
-            text = inverse_normalize(input, verbose=verbose)
-        except:
-            raise Exception
-        res.append(text)
-    return res
+    return [result.output for result in inverse_normalize_results(texts, verbose=verbose)]
 
 
 INVERSE_NORMALIZERS = {
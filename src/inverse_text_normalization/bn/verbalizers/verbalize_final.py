@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.composition import prepare_for_composition
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.bn.graph_utils import GraphFst, delete_extra_space, delete_space
 from inverse_text_normalization.bn.verbalizers.punctuation import PunctuationFst
 from inverse_text_normalization.bn.verbalizers.verbalize import VerbalizeFst
@@ -36,9 +38,13 @@ class VerbalizeFinalFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="verbalize_final", kind="verbalize")
-        verbalize = VerbalizeFst().fst
-        punct = PunctuationFst().fst
-        word = WordFst().fst
+        if self.fst is not None:
+            # loaded from an up-to-date FAR
+            return
+
+        verbalize = build_grammar(VerbalizeFst).fst
+        punct = build_grammar(PunctuationFst).fst
+        word = build_grammar(WordFst).fst
         types = verbalize | word | punct
         graph = (
             pynutil.delete("tokens")
@@ -50,4 +56,4 @@ class VerbalizeFinalFst(GraphFst):
             + pynutil.delete("}")
         )
         graph = delete_space + pynini.closure(graph + delete_extra_space) + graph + delete_space
-        self.fst = graph
+        self.fst = prepare_for_composition(graph)
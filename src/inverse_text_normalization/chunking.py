@@ -0,0 +1,253 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextvars
+import os
+import threading
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_right
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from inverse_text_normalization.trigger_filter import PACKAGE_ROOT, TriggerMatcher, get_filter, split_words
+
+'''
+Boundary-aware chunking of long inputs: `<lang>/inverse_normalize.py` cuts an input of more than ITN_CHUNK_WORDS
+words (default 32, 0 turns chunking off) into chunks of about that many words, normalizes the chunks
+independently and joins them, so that a paragraph-length transcript makes many small lattices instead of one
+huge one.
+
+A chunk ends only
+    - after a word ending in a mark of PunctuationFst (, ; ( ) . ! ? :), which the tagger makes a token of its own, or
+    - between two words that contain no trigger of trigger_filter,
+so a number phrase such as "दस लाख एक हज़ार" and the context word on each side of it ("minus", a plural unit)
+always stay in one chunk. Neither cut is made next to a word of the tables the time tagger appends to a number
+(CONTEXT_TABLES, e.g. "p m", "c s t") or inside a phrase of several words from any data table of the language
+(e.g. "for example", "square meter"), so a token is never cut in half. A punctuation boundary in the second half of a chunk is preferred, otherwise the
+last boundary; a run without any boundary stays whole, however long. With ITN_CHUNK_THREADS above 1 the chunks
+of an input are normalized on a thread pool of that size.
+
+The chunks of an input:
+
+    python -m inverse_text_normalization.chunking --lang hi --words 8 "..."
+'''
+
+PUNCTUATION = ",;().!?:"
+DEFAULT_CHUNK_WORDS = 32
+# tables whose words the taggers append to a number as part of its token, e.g. "साढ़े दस p m c s t"
+CONTEXT_TABLES = ("time_suffix.tsv", "time_zone.tsv")
+
+_protections: Dict[str, Tuple[Set[str], TriggerMatcher]] = {}
+_protections_lock = threading.Lock()
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def chunk_words() -> int:
+    """
+    Returns words per chunk, ITN_CHUNK_WORDS
+    """
+    return int(os.environ.get("ITN_CHUNK_WORDS", DEFAULT_CHUNK_WORDS))
+
+
+def chunk_threads() -> int:
+    """
+    Returns threads that normalize the chunks of an input, ITN_CHUNK_THREADS
+    """
+    return int(os.environ.get("ITN_CHUNK_THREADS", 1))
+
+
+def _table_cells(path: str) -> List[List[str]]:
+    with open(path, encoding="utf-8") as fp:
+        return [cell.split() for line in fp for cell in line.rstrip("\r\n").split("\t")]
+
+
+def _load_protection(lang: str) -> Tuple[Set[str], TriggerMatcher]:
+    data_dir = os.path.join(PACKAGE_ROOT, lang, "data")
+    context_words = set()
+    phrases = set()
+    for root, _, files in os.walk(data_dir):
+        for file_name in sorted(files):
+            if not file_name.endswith(".tsv"):
+                continue
+            for cell in _table_cells(os.path.join(root, file_name)):
+                if file_name in CONTEXT_TABLES:
+                    context_words.update(cell)
+                if len(cell) > 1:
+                    phrases.add(f" {' '.join(cell)} ")
+    return context_words, TriggerMatcher(sorted(phrases))
+
+
+def _protection(lang: str) -> Tuple[Set[str], TriggerMatcher]:
+    protection = _protections.get(lang)
+    if protection is None:
+        with _protections_lock:
+            protection = _protections.get(lang)
+            if protection is None:
+                protection = _protections[lang] = _load_protection(lang)
+    return protection
+
+
+def clear(lang: Optional[str] = None):
+    """
+    Drops the phrases and context words read from the data tables, e.g. after a lexicon reload
+
+    Args:
+        lang: language package, all if None
+    """
+    with _protections_lock:
+        if lang is None:
+            _protections.clear()
+        else:
+            _protections.pop(lang, None)
+
+
+def protected_cuts(words: List[str], lang: str) -> Set[int]:
+    """
+    Finds the positions a sentence must not be cut at: next to a word of CONTEXT_TABLES or inside a phrase of
+    several words from a data table
+
+    Args:
+        words: words of the sentence
+        lang: language package, e.g. 'hi'
+
+    Returns indices of the first word after a forbidden cut
+    """
+    context_words, phrases = _protection(lang)
+    # punctuation the tagger splits off does not hide a word
+    stripped = [word.rstrip(PUNCTUATION) or word for word in words]
+    cuts = set()
+    for i, word in enumerate(stripped):
+        if word in context_words:
+            cuts.update((i, i + 1))
+    starts = []
+    position = 1
+    for word in stripped:
+        starts.append(position)
+        position += len(word) + 1
+    for start, end in phrases.finditer(f" {' '.join(stripped)} "):
+        # the match includes the spaces around the phrase
+        first = bisect_right(starts, start)
+        last = bisect_right(starts, end - 1)
+        cuts.update(range(first + 1, last))
+    return cuts
+
+
+def boundaries(words: List[str], lang: str) -> List[Tuple[int, bool]]:
+    """
+    Finds the positions a sentence may be cut at
+
+    Args:
+        words: words of the sentence
+        lang: language package, e.g. 'hi'
+
+    Returns (index of the first word after the cut, whether the cut follows a punctuation mark), in order
+    """
+    triggers = get_filter(lang).trigger_tokens(words)
+    protected = protected_cuts(words, lang)
+    cuts = []
+    for i in range(1, len(words)):
+        if i in protected:
+            continue
+        after_punctuation = words[i - 1][-1] in PUNCTUATION
+        if after_punctuation or not (triggers[i - 1] or triggers[i]):
+            cuts.append((i, after_punctuation))
+    return cuts
+
+
+def chunk_spans(words: List[str], lang: str, size: int) -> List[Tuple[int, int]]:
+    """
+    Cuts a sentence into chunks of about size words at its boundaries
+
+    Args:
+        words: words of the sentence
+        lang: language package, e.g. 'hi'
+        size: words per chunk
+
+    Returns (start, end) word indices of the chunks, in order and covering the sentence
+    """
+    spans = []
+    start = 0
+    last_punctuation = last_cut = None
+    # the end of the sentence closes the last chunk like a cut would
+    for cut, after_punctuation in boundaries(words, lang) + [(len(words), False)]:
+        while cut - start > size:
+            if last_punctuation is not None and last_punctuation - start > size // 2:
+                end = last_punctuation
+            elif last_cut is not None:
+                end = last_cut
+            else:
+                end = cut
+            spans.append((start, end))
+            start = end
+            last_punctuation = last_cut = None
+        if cut > start:
+            last_cut = cut
+            if after_punctuation:
+                last_punctuation = cut
+    if start < len(words):
+        spans.append((start, len(words)))
+    return spans
+
+
+def _executor(threads: int) -> ThreadPoolExecutor:
+    if threads not in _executors:
+        with _executors_lock:
+            if threads not in _executors:
+                _executors[threads] = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="itn-chunk")
+    return _executors[threads]
+
+
+def normalize_chunks(text: str, lang: str, normalize: Callable[[str], str]) -> str:
+    """
+    Normalizes a long input in chunks and joins them, a short one as a whole
+
+    Args:
+        text: sentence
+        lang: language package, e.g. 'hi'
+        normalize: normalizes a chunk with the grammars
+
+    Returns written form
+    """
+    size = chunk_words()
+    words = split_words(text)
+    if size <= 0 or len(words) <= size:
+        return normalize(text)
+    spans = chunk_spans(words, lang, size)
+    if len(spans) == 1:
+        return normalize(text)
+    chunks = [" ".join(words[start:end]) for start, end in spans]
+    threads = chunk_threads()
+    if threads > 1:
+        # each chunk in a copy of this context, so that sentence_limits.tracked_trips sees the limits it trips
+        futures = [_executor(threads).submit(contextvars.copy_context().run, normalize, chunk) for chunk in chunks]
+        outputs = [future.result() for future in futures]
+    else:
+        outputs = [normalize(chunk) for chunk in chunks]
+    return " ".join(output for output in outputs if output)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    parser.add_argument("--words", help="words per chunk", type=int, default=DEFAULT_CHUNK_WORDS)
+    parser.add_argument("text", help="sentence", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sentence_words = split_words(args.text)
+    for chunk_start, chunk_end in chunk_spans(sentence_words, args.lang, args.words):
+        print(" ".join(sentence_words[chunk_start:chunk_end]))
@@ -0,0 +1,59 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Preparation of the final tagger and verbalizer for composition.
+
+Both are only ever used as the right-hand side of `sentence @ fst`, where the sentence is a linear
+string acceptor. Composition then walks the single arc of each sentence state and looks up the
+matching arcs of the grammar state. With the grammar sorted on input labels that lookup is a binary
+search through its sorted matcher; an unsorted grammar is either sorted again on every call or scanned
+arc by arc. `optimize()` additionally determinizes and minimizes the grammar where that is safe.
+'''
+
+
+def prepare_for_composition(fst: 'pynini.Fst', optimize: bool = True) -> 'pynini.Fst':
+    """
+    Optimizes and input-label-sorts fst in place for use as right-hand side of compositions
+
+    Args:
+        fst: final tagger or verbalizer fst
+        optimize: also optimize, skip for fsts loaded from an archive that were prepared before export
+
+    Returns fst
+    """
+    if optimize:
+        fst.optimize()
+    # linear in the number of arcs, and optimize() does not keep the arcs sorted
+    return fst.arcsort(sort_type="ilabel")
+
+
+def compose_text(text: str, fst: 'pynini.Fst') -> 'pynini.Fst':
+    """
+    Composes an (escaped) sentence with a prepared tagger or verbalizer
+
+    Args:
+        text: escaped sentence
+        fst: fst prepared by prepare_for_composition
+
+    Returns output lattice
+    """
+    return pynini.compose(pynini.accep(text), fst)
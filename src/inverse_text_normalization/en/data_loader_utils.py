@@ -19,6 +19,8 @@ import os
 from collections import defaultdict, namedtuple
 from typing import Dict, List, Optional, Set, Tuple
 
+from inverse_text_normalization.grammar_deps import record_data_file
+
 EOS_TYPE = "EOS"
 PUNCT_TYPE = "PUNCT"
 PLAIN_TYPE = "PLAIN"
@@ -210,4 +212,6 @@ def get_abs_path(rel_path):
         
     Returns absolute path
     """
-    return os.path.dirname(os.path.abspath(__file__)) + '/' + rel_path
+    path = os.path.dirname(os.path.abspath(__file__)) + '/' + rel_path
+    record_data_file(path)
+    return path
@@ -15,6 +15,8 @@
 from argparse import ArgumentParser
 from typing import List
 
+from inverse_text_normalization import postprocess, sentence_cache
+from inverse_text_normalization.en import inverse_normalize
 from inverse_text_normalization.en.inverse_normalize import INVERSE_NORMALIZERS
 # from nemo_text_processing.inverse_text_normalization.inverse_normalize import InverseNormalizer
 
@@ -106,7 +108,7 @@ def indian_format(word, english_digits_with_zero):
         return word
 
 
-def inverse_normalize_text(text_list, verbose=False):
+def _inverse_normalize_results(text_list, verbose=False):
     # lang = lang
     # if lang == 'en':
     #
@@ -114,20 +116,20 @@ def inverse_normalize_text(text_list, verbose=False):
     #     return sent_updated
 
     # else:
-    inverse_normalizer = INVERSE_NORMALIZERS['nemo']
-    english_digits_with_zero = '0123456789'
-    inverse_normalizer_prediction = inverse_normalizer(text_list, verbose=verbose)
-    astr_list = []
-    comma_sep_num_list = []
-    inverse_normalizer_prediction = [sent.replace('\r', '') for sent in inverse_normalizer_prediction]
-    for sent in inverse_normalizer_prediction:
-        trimmed_sent = ' '.join(
-            [remove_starting_zeros(word, english_digits_with_zero) for word in sent.split(' ')])
-        astr_list.append(trimmed_sent)
-        # comma_sep_num_list.append(
-        #     ' '.join([indian_format(word, hindi_digits_with_zero) for word in trimmed_sent.split(' ')]))
+    results = inverse_normalize.inverse_normalize_results(text_list, verbose=verbose)
+    # carriage returns, leading zeros, currency signs and digit groups in one pass, see postprocess;
+    # sentences the grammars failed on are passed through unchanged, see sentence_errors
+    return postprocess.postprocess_results(text_list, results, 'en')
+
+
+def inverse_normalize_results(text_list, verbose=False):
+    # repeated sentences are served from the sentence cache
+    return sentence_cache.cached_results('en', text_list,
+                                         lambda sentences: _inverse_normalize_results(sentences, verbose=verbose))
 
-    return astr_list
+
+def inverse_normalize_text(text_list, verbose=False):
+    return [result.output for result in inverse_normalize_results(text_list, verbose=verbose)]
 
 
 if __name__ == "__main__":
@@ -16,6 +16,7 @@
 import pynini
 from pynini.lib import pynutil, utf8
 
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.en.data_loader_utils import get_abs_path
 from inverse_text_normalization.en.graph_utils import (
     NEMO_DIGIT,
@@ -64,15 +65,15 @@ class CardinalFst(GraphFst):
         ENGLISH_DIGIT = pynini.union(*english_digits).optimize()
         ENGLISH_DIGIT_WITH_ZERO = pynini.union(*english_digits_with_zero).optimize()
 
-        graph_zero = pynini.string_file(get_abs_path(data_path + "numbers/zero.tsv"))
+        graph_zero = string_file(get_abs_path(data_path + "numbers/zero.tsv"))
         #graph_tens = pynini.string_file(get_abs_path(data_path + "numbers/tens.tsv"))
-        graph_digit = pynini.string_file(get_abs_path(data_path + "numbers/digit.tsv"))
-        graph_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
-        graph_ties = pynini.string_file(get_abs_path(data_path + "numbers/ties.tsv"))
-        graph_chars = pynini.string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
-        graph_char_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
+        graph_digit = string_file(get_abs_path(data_path + "numbers/digit.tsv"))
+        graph_multiples = string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
+        graph_ties = string_file(get_abs_path(data_path + "numbers/ties.tsv"))
+        graph_chars = string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
+        graph_char_multiples = string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
         #graph_tens_en = pynini.string_file(get_abs_path(data_path + "numbers/tens-en.tsv"))
-        graph_teen = pynini.string_file(get_abs_path(data_path + "numbers/teen.tsv"))
+        graph_teen = string_file(get_abs_path(data_path + "numbers/teen.tsv"))
 
         graph_tens = pynini.union(graph_ties + delete_space + graph_digit, graph_teen)
 
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 
+from inverse_text_normalization.grammar_registry import build_grammar
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.en.data_loader_utils import get_abs_path
 from inverse_text_normalization.en.graph_utils import (
     GraphFst,
@@ -45,11 +47,11 @@ class TimeFst(GraphFst):
         super().__init__(name="time", kind="classify")
         # hours, minutes, seconds, suffix, zone, style, speak_period
 
-        suffix_graph = pynini.string_file(get_abs_path("data/time_suffix.tsv"))
-        time_zone_graph = pynini.invert(pynini.string_file(get_abs_path("data/time_zone.tsv")))
+        suffix_graph = string_file(get_abs_path("data/time_suffix.tsv"))
+        time_zone_graph = pynini.invert(string_file(get_abs_path("data/time_zone.tsv")))
 
         # only used for < 1000 thousand -> 0 weight
-        cardinal = pynutil.add_weight(CardinalFst().graph_no_exception, weight=-0.7)
+        cardinal = pynutil.add_weight(build_grammar(CardinalFst).graph_no_exception, weight=-0.7)
 
         labels_hour = [num_to_word(x) for x in range(0, 24)]
         labels_minute_single = [num_to_word(x) for x in range(1, 10)]
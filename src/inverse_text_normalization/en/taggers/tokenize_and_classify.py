@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.en.graph_utils import GraphFst
 from inverse_text_normalization.en.taggers.cardinal import CardinalFst
 from inverse_text_normalization.en.taggers.date import DateFst
@@ -39,21 +40,21 @@ class ClassifyFst(GraphFst):
     def __init__(self):
         super().__init__(name="tokenize_and_classify", kind="classify")
 
-        cardinal_graph_fst = CardinalFst()
+        cardinal_graph_fst = build_grammar(CardinalFst)
         cardinal = cardinal_graph_fst.fst
 
-        ordinal_graph_fst = OrdinalFst(cardinal_graph_fst)
+        ordinal_graph_fst = build_grammar(OrdinalFst, cardinal_graph_fst)
         ordinal = ordinal_graph_fst.fst
 
-        decimal_graph_fst = DecimalFst(cardinal_graph_fst)
+        decimal_graph_fst = build_grammar(DecimalFst, cardinal_graph_fst)
         decimal = decimal_graph_fst.fst
 
-        measure = MeasureFst(cardinal_graph_fst, decimal_graph_fst).fst
-        date = DateFst(ordinal_graph_fst).fst
-        word = WordFst().fst
-        time = TimeFst().fst
+        measure = build_grammar(MeasureFst, cardinal_graph_fst, decimal_graph_fst).fst
+        date = build_grammar(DateFst, ordinal_graph_fst).fst
+        word = build_grammar(WordFst).fst
+        time = build_grammar(TimeFst).fst
         # money = MoneyFst(cardinal_graph_fst, decimal_graph_fst).fst
-        whitelist = WhiteListFst().fst
+        whitelist = build_grammar(WhiteListFst).fst
 
         graph = (
             pynutil.add_weight(whitelist, 1.01)
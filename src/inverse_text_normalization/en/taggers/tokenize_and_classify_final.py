@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.composition import prepare_for_composition
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.en.graph_utils import GraphFst, delete_extra_space, delete_space
 from inverse_text_normalization.en.taggers.punctuation import PunctuationFst
 from inverse_text_normalization.en.taggers.tokenize_and_classify import ClassifyFst
@@ -33,9 +35,12 @@ class ClassifyFinalFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="tokenize_and_classify_final", kind="classify")
+        if self.fst is not None:
+            # loaded from an up-to-date FAR
+            return
 
-        classify = ClassifyFst().fst
-        punct = PunctuationFst().fst
+        classify = build_grammar(ClassifyFst).fst
+        punct = build_grammar(PunctuationFst).fst
         token = pynutil.insert("tokens { ") + classify + pynutil.insert(" }")
         token_plus_punct = (
             pynini.closure(punct + pynutil.insert(" ")) + token + pynini.closure(pynutil.insert(" ") + punct)
@@ -44,4 +49,4 @@ class ClassifyFinalFst(GraphFst):
         graph = token_plus_punct + pynini.closure(delete_extra_space + token_plus_punct)
         graph = delete_space + graph + delete_space
 
-        self.fst = graph.optimize()
+        self.fst = prepare_for_composition(graph)
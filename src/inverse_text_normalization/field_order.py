@@ -0,0 +1,163 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+'''
+Field order of the parsed tagger output accepted by the verbalizer, so that a sentence needs one verbalizer
+composition instead of one per combination of field orders of its tokens.
+
+The permutation loop the language packages used before (`benchmarks/field_order.generate_permutations`) yields
+every ordering of the fields of every token, and the product across the tokens of a sentence, until one composes
+with the verbalizer. The verbalizer however
+verbalizes each token on its own, so whether an ordering of a token is accepted does not depend on the other
+tokens, and the first accepted combination is the first accepted ordering of each token. FieldOrders finds
+that ordering per token, trying its orderings in the order generate_permutations does, and remembers it per
+token shape (class and field names), e.g. `tokens { date { day month year } }`. Once a shape has been seen,
+its tokens are serialized in the accepted order directly.
+
+A remembered order that is not accepted for a new token (if the verbalizer accepted an order only for some
+values) sends the sentence through the per-token search again, so the output is always the one of the
+permutation loop.
+'''
+
+PRESERVE_ORDER_KEY = "preserve_order"
+
+# field order of a (nested) token: its keys in order, and the field orders of its dict values
+FieldOrder = Tuple[Tuple[str, ...], Tuple[Tuple[str, 'FieldOrder'], ...]]
+
+
+def token_shape(d: dict) -> tuple:
+    """
+    Returns the field names of a parsed token with their nesting, without values
+    """
+    return tuple((k, token_shape(v) if isinstance(v, dict) else type(v).__name__) for k, v in d.items())
+
+
+def orderings(d: OrderedDict) -> Iterator[Tuple[str, FieldOrder]]:
+    """
+    Serializes a parsed token in every field order, in the order of `_permute` of benchmarks/field_order.py
+
+    Args:
+        d: (nested) dictionary of key value pairs
+
+    Returns iterator of (serialization, field order)
+    """
+    if PRESERVE_ORDER_KEY in d.keys():
+        d_permutations = [tuple(d.items())]
+    else:
+        d_permutations = itertools.permutations(d.items())
+    for perm in d_permutations:
+        keys = tuple(k for k, _ in perm)
+        sub = [("", ())]
+        for k, v in perm:
+            if isinstance(v, str):
+                sub = [(s + f"{k}: \"{v}\" ", children) for s, children in sub]
+            elif isinstance(v, OrderedDict):
+                sub = [
+                    (s + f" {k} {{ " + rec + " } ", children + ((k, rec_order),))
+                    for s, children in sub
+                    for rec, rec_order in orderings(v)
+                ]
+            elif isinstance(v, bool):
+                sub = [(s + f"{k}: true ", children) for s, children in sub]
+            else:
+                raise ValueError()
+        for s, children in sub:
+            yield s, (keys, children)
+
+
+def serialize(d: OrderedDict, order: FieldOrder) -> str:
+    """
+    Serializes a parsed token in the given field order
+
+    Args:
+        d: (nested) dictionary of key value pairs
+        order: field order of a token of the same shape
+
+    Returns serialization as generated by `_permute` of benchmarks/field_order.py
+    """
+    keys, children = order
+    children = dict(children)
+    s = ""
+    for k in keys:
+        v = d[k]
+        if isinstance(v, str):
+            s += f"{k}: \"{v}\" "
+        elif isinstance(v, OrderedDict):
+            s += f" {k} {{ " + serialize(v, children[k]) + " } "
+        elif isinstance(v, bool):
+            s += f"{k}: true "
+        else:
+            raise ValueError()
+    return s
+
+
+class FieldOrders:
+    """
+    Field orders accepted by the verbalizer of one language, per token shape
+    """
+
+    def __init__(self):
+        self._orders: Dict[tuple, FieldOrder] = {}
+        self._lock = threading.Lock()
+        self.stats = {"direct": 0, "searched": 0, "compositions": 0}
+
+    def clear(self):
+        """
+        Forgets the accepted orders, e.g. when the verbalizer is replaced
+        """
+        with self._lock:
+            self._orders.clear()
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.stats[key] += n
+
+    def verbalize(self, tokens: List[dict], compose: Callable[[str], 'pynini.Fst']) -> Optional['pynini.Fst']:
+        """
+        Composes the parsed tokens of a sentence with the verbalizer, serialized in accepted field orders
+
+        Args:
+            tokens: parsed tagger output
+            compose: composes a serialized (unescaped) sentence with the verbalizer
+
+        Returns verbalizer lattice, None if no field order of some token is accepted
+        """
+        shapes = [token_shape(token) for token in tokens]
+        orders = [self._orders.get(shape) for shape in shapes]
+        if all(order is not None for order in orders):
+            lattice = compose("".join(serialize(token, order) for token, order in zip(tokens, orders)))
+            self._count("compositions")
+            if lattice.num_states() != 0:
+                self._count("direct")
+                return lattice
+
+        self._count("searched")
+        serialized = []
+        for token, shape in zip(tokens, shapes):
+            for s, order in orderings(token):
+                self._count("compositions")
+                if compose(s).num_states() != 0:
+                    serialized.append(s)
+                    with self._lock:
+                        self._orders[shape] = order
+                    break
+            else:
+                return None
+        self._count("compositions")
+        return compose("".join(serialized))
@@ -0,0 +1,228 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import os
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import pynini
+    from pynini import Far
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Versioned FAR cache for compiled grammars.
+
+Every language package keeps its compiled grammars under `<lang>/grammars/<kind>/<name>.far`
+(or `$ITN_GRAMMAR_DIR/<lang>/<kind>/<name>.far` when that variable is set). Each archive holds
+a single FST whose key is the grammar version, a hash over the grammar sources and data files
+of the language and the modules of the package root every language builds its grammars with
+(SHARED_GRAMMAR_SOURCES). An archive whose key does not match the current version is ignored.
+'''
+
+# bump whenever the layout of the archives changes
+GRAMMAR_CACHE_VERSION = "1"
+
+# files and directories of a language package that determine its compiled grammars
+GRAMMAR_SOURCES = ("graph_utils.py", "utils.py", "data_loader_utils.py", "taggers", "verbalizers", "data")
+GRAMMAR_SOURCE_SUFFIXES = (".py", ".tsv", ".txt")
+# modules of the package root that take part in building the grammars of every language package
+SHARED_GRAMMAR_SOURCES = (
+    "composition.py",
+    "grammar_deps.py",
+    "grammar_registry.py",
+    "plural_utils.py",
+    "string_file_cache.py",
+)
+PACKAGE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def cache_enabled() -> bool:
+    """
+    Returns false if the FAR cache is switched off with ITN_DISABLE_GRAMMAR_CACHE=1
+    """
+    return os.environ.get("ITN_DISABLE_GRAMMAR_CACHE", "0") not in ("1", "true", "True")
+
+
+@contextmanager
+def cache_disabled():
+    """
+    Switches the FAR cache off inside the block, e.g. to compile grammars while their archives are rewritten,
+    and restores ITN_DISABLE_GRAMMAR_CACHE afterwards
+    """
+    previous = os.environ.get("ITN_DISABLE_GRAMMAR_CACHE")
+    os.environ["ITN_DISABLE_GRAMMAR_CACHE"] = "1"
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("ITN_DISABLE_GRAMMAR_CACHE", None)
+        else:
+            os.environ["ITN_DISABLE_GRAMMAR_CACHE"] = previous
+
+
+def _source_files(lang_dir: str):
+    for source in GRAMMAR_SOURCES:
+        path = os.path.join(lang_dir, source)
+        if os.path.isfile(path):
+            yield path
+        elif os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+                for file_name in sorted(files):
+                    if file_name.endswith(GRAMMAR_SOURCE_SUFFIXES):
+                        yield os.path.join(root, file_name)
+
+
+@lru_cache(maxsize=None)
+def shared_sources_digest() -> str:
+    """
+    Returns hex digest over SHARED_GRAMMAR_SOURCES
+    """
+    digest = hashlib.sha256()
+    for source in SHARED_GRAMMAR_SOURCES:
+        digest.update(source.encode("utf-8"))
+        with open(os.path.join(PACKAGE_ROOT, source), "rb") as fp:
+            digest.update(hashlib.sha256(fp.read()).digest())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def grammar_hash(lang_dir: str) -> str:
+    """
+    Computes the grammar version of a language package
+
+    Args:
+        lang_dir: directory of the language package, e.g. .../inverse_text_normalization/hi
+
+    Returns hex digest over the grammar sources and data files, and the shared grammar modules
+    """
+    digest = hashlib.sha256(GRAMMAR_CACHE_VERSION.encode("utf-8"))
+    if PYNINI_AVAILABLE:
+        digest.update(pynini.__version__.encode("utf-8"))
+    digest.update(shared_sources_digest().encode("utf-8"))
+    for path in _source_files(lang_dir):
+        digest.update(os.path.relpath(path, lang_dir).encode("utf-8"))
+        with open(path, "rb") as fp:
+            digest.update(hashlib.sha256(fp.read()).digest())
+    return digest.hexdigest()
+
+
+def grammar_dir(lang_dir: str) -> Path:
+    """
+    Returns directory that holds the FAR archives of a language package
+    """
+    root = os.environ.get("ITN_GRAMMAR_DIR")
+    if root:
+        return Path(root) / os.path.basename(lang_dir)
+    return Path(lang_dir) / "grammars"
+
+
+def far_path(lang_dir: str, kind: str, name: str) -> Path:
+    """
+    Returns path of the FAR archive for grammar `name` of `kind` 'classify' or 'verbalize'
+    """
+    return grammar_dir(lang_dir) / kind / (name + ".far")
+
+
+def far_version(path: Path) -> Optional[str]:
+    """
+    Returns grammar version the FAR archive was exported for, None if missing or unreadable
+    """
+    if not path.exists():
+        return None
+    try:
+        return Far(str(path), mode="r", arc_type="standard", far_type="default").get_key()
+    except Exception:
+        return None
+
+
+def load_far(path: Path, version: str) -> Optional['pynini.FstLike']:
+    """
+    Loads fst from FAR archive if it was exported for the given grammar version
+
+    Args:
+        path: FAR file path
+        version: expected grammar version
+
+    Returns fst or None if the archive is missing, stale or unreadable
+    """
+    if not cache_enabled() or not path.exists():
+        return None
+    try:
+        far = Far(str(path), mode="r", arc_type="standard", far_type="default")
+        if far.get_key() != version:
+            return None
+        return far.get_fst()
+    except Exception:
+        return None
+
+
+def load_far_entries(path: Path) -> Optional[Dict[str, 'pynini.FstLike']]:
+    """
+    Loads all fsts of a FAR archive
+
+    Args:
+        path: FAR file path
+
+    Returns fsts by key or None if the archive is missing or unreadable
+    """
+    if not path.exists():
+        return None
+    try:
+        far = Far(str(path), mode="r", arc_type="standard", far_type="default")
+        entries = {}
+        while not far.done():
+            entries[far.get_key()] = far.get_fst()
+            far.next()
+        return entries
+    except Exception:
+        return None
+
+
+def save_far_entries(path: Path, entries: Dict[str, 'pynini.FstLike']):
+    """
+    Writes fsts to a FAR archive. Writes to a temporary file first
+    so that concurrently starting workers never read a partial archive.
+
+    Args:
+        path: FAR file path
+        entries: fsts by key
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    far = Far(str(tmp_path), mode="w", arc_type="standard", far_type="default")
+    # archives are written in key order
+    for key in sorted(entries):
+        far[key] = entries[key]
+    far.close()
+    os.replace(tmp_path, path)
+
+
+def save_far(path: Path, fst: 'pynini.FstLike', version: str):
+    """
+    Writes fst to FAR archive keyed by the grammar version
+
+    Args:
+        path: FAR file path
+        fst: fst to export
+        version: grammar version
+    """
+    save_far_entries(path, {version: fst})
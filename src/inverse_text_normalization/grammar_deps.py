@@ -0,0 +1,420 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from pathlib import Path, PurePath
+from typing import Callable, Dict, List, Optional, Set
+
+from inverse_text_normalization.grammar_cache import (
+    GRAMMAR_CACHE_VERSION,
+    SHARED_GRAMMAR_SOURCES,
+    load_far_entries,
+    save_far_entries,
+)
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Dependency graph and incremental on-disk cache of sub-grammars.
+
+While the registry builds a grammar, every data file it reads through `get_abs_path` and every
+sub-grammar it asks the registry for is recorded, e.g.
+taggers.time.TimeFst -> taggers.cardinal.CardinalFst -> data/numbers/*.tsv.
+
+With ITN_INCREMENTAL_BUILD=1 every grammar is also written to `<node cache dir>/<node>.far`,
+next to a json record of those dependencies. The node cache is `$ITN_NODE_CACHE_DIR/<lang>`, else
+`$ITN_GRAMMAR_DIR/<lang>/nodes`, else `~/.cache/inverse_text_normalization/<lang>/nodes` (or under
+$XDG_CACHE_HOME), never the installed package. A cache that cannot be written, e.g. on a read-only
+file system, is skipped with a warning and the grammars are only built in memory. Later builds load
+it instead of compiling it, unless its module, one of its data files, the language's graph_utils/utils
+modules, a shared grammar module of the package root (grammar_cache.SHARED_GRAMMAR_SOURCES) or one
+of its sub-grammars changed. After editing hi/data/whitelist.tsv only WhiteListFst and the grammars
+composing it are compiled:
+
+    python -m inverse_text_normalization.grammar_deps --lang hi [--graph]
+'''
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules every grammar of a language depends on
+BASE_SOURCES = ("graph_utils.py", "utils.py", "data_loader_utils.py")
+
+_local = threading.local()
+_module_data_files: Dict[str, Set[str]] = {}
+_digests: Dict[tuple, str] = {}
+_digests_lock = threading.Lock()
+
+
+def node_cache_dir(lang: str) -> Path:
+    """
+    Returns the directory of the incremental cache of a language package, see the module description
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    root = os.environ.get("ITN_NODE_CACHE_DIR")
+    if root:
+        return Path(root) / lang
+    if os.environ.get("ITN_GRAMMAR_DIR"):
+        return Path(os.environ["ITN_GRAMMAR_DIR"]) / lang / "nodes"
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "inverse_text_normalization" / lang / "nodes"
+
+
+def incremental_enabled() -> bool:
+    """
+    Returns true if sub-grammars are cached on disk, switched on with ITN_INCREMENTAL_BUILD=1
+    or for the current thread by `incremental_build()`
+    """
+    if getattr(_local, "incremental", False):
+        return True
+    return os.environ.get("ITN_INCREMENTAL_BUILD", "0") in ("1", "true", "True")
+
+
+@contextmanager
+def incremental_build():
+    """
+    Caches sub-grammars built by the current thread inside the block on disk, regardless of ITN_INCREMENTAL_BUILD
+    """
+    previous = getattr(_local, "incremental", False)
+    _local.incremental = True
+    try:
+        yield
+    finally:
+        _local.incremental = previous
+
+
+class BuildDeps:
+    """
+    Data files and sub-grammars used while building one grammar
+    """
+
+    def __init__(self):
+        self.data: Set[str] = set()
+        self.children: List[Optional[str]] = []
+
+
+def _stack() -> List[BuildDeps]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def track_build():
+    """
+    Records the dependencies of the grammar built inside the block
+    """
+    deps = BuildDeps()
+    _stack().append(deps)
+    try:
+        yield deps
+    finally:
+        _stack().pop()
+
+
+def record_data_file(path: str):
+    """
+    Records that a data file is read, called by `get_abs_path`.
+    Files read at module level are attributed to the module reading them.
+    """
+    stack = _stack()
+    if stack:
+        stack[-1].data.add(path)
+    else:
+        # frame 0 is this function, frame 1 get_abs_path
+        module = sys._getframe(2).f_globals.get("__name__")
+        _module_data_files.setdefault(module, set()).add(path)
+
+
+def record_child(node_id: Optional[str]):
+    """
+    Records that the grammar being built composes the sub-grammar node_id
+    """
+    stack = _stack()
+    if stack:
+        stack[-1].children.append(node_id)
+
+
+def module_data_files(module: str) -> Set[str]:
+    """
+    Returns data files read by a module at import time
+    """
+    return _module_data_files.get(module, set())
+
+
+def file_digest(path: str) -> Optional[str]:
+    """
+    Returns sha256 of file content, None if it does not exist.
+    Digests are memoized by modification time and size.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        with open(path, "rb") as fp:
+            digest = hashlib.sha256(fp.read()).hexdigest()
+        with _digests_lock:
+            _digests[key] = digest
+    return digest
+
+
+def _rel(path: str) -> str:
+    return os.path.relpath(path, PACKAGE_ROOT)
+
+
+def _abs(rel_path: str) -> str:
+    return os.path.join(PACKAGE_ROOT, rel_path)
+
+
+class NodeCache:
+    """
+    Incremental on-disk cache of the sub-grammars of one language, keyed by node ids handed out by the registry
+
+    Args:
+        lang: language package, e.g. 'hi'
+        nodes_dir: directory of the cache, node_cache_dir(lang) at the time of use if None
+    """
+
+    def __init__(self, lang: str, nodes_dir: Optional[str] = None):
+        self.lang = lang
+        self.lang_dir = os.path.join(PACKAGE_ROOT, "inverse_text_normalization", lang)
+        self._nodes_dir = None if nodes_dir is None else Path(nodes_dir)
+        self.graph: Dict[str, Dict[str, object]] = {}
+        self.loaded: List[str] = []
+        self.rebuilt: List[str] = []
+        self._save_failed = False
+
+    @property
+    def nodes_dir(self) -> Path:
+        return node_cache_dir(self.lang) if self._nodes_dir is None else self._nodes_dir
+
+    def _record_path(self, node_id: str) -> Path:
+        return self.nodes_dir / (node_id + ".json")
+
+    def _far_path(self, node_id: str) -> Path:
+        return self.nodes_dir / (node_id + ".far")
+
+    def _read_record(self, node_id: str) -> Optional[Dict[str, object]]:
+        try:
+            with open(self._record_path(node_id), encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def base_digest(self) -> str:
+        """
+        Returns digest over the modules every grammar of the language depends on, its own and the shared ones
+        """
+        digest = hashlib.sha256(GRAMMAR_CACHE_VERSION.encode("utf-8"))
+        if PYNINI_AVAILABLE:
+            digest.update(pynini.__version__.encode("utf-8"))
+        for source in BASE_SOURCES:
+            digest.update(source.encode("utf-8"))
+            digest.update(str(file_digest(os.path.join(self.lang_dir, source))).encode("utf-8"))
+        for source in SHARED_GRAMMAR_SOURCES:
+            digest.update(source.encode("utf-8"))
+            digest.update(str(file_digest(_abs(os.path.join("inverse_text_normalization", source)))).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _digest(self, record: Dict[str, object], child_digests: List[Optional[str]]) -> Optional[str]:
+        digest = hashlib.sha256(self.base_digest().encode("utf-8"))
+        for rel_path in [record["module"]] + sorted(record["data"]):
+            file_hash = file_digest(_abs(rel_path))
+            if file_hash is None:
+                return None
+            digest.update(f"{rel_path}:{file_hash}".encode("utf-8"))
+        for child_digest in child_digests:
+            if child_digest is None:
+                return None
+            digest.update(child_digest.encode("utf-8"))
+        return digest.hexdigest()
+
+    def current_digest(self, node_id: str, _seen: Optional[Dict[str, Optional[str]]] = None) -> Optional[str]:
+        """
+        Returns digest the node would have if it were built now from the current files, None if unknown
+
+        Args:
+            node_id: node id
+        """
+        seen = {} if _seen is None else _seen
+        if node_id not in seen:
+            record = self._read_record(node_id)
+            if record is None:
+                seen[node_id] = None
+            else:
+                children = [self.current_digest(child, seen) if child else None for child in record["children"]]
+                seen[node_id] = self._digest(record, children)
+        return seen[node_id]
+
+    def load(self, cls, node_id: str):
+        """
+        Returns the grammar restored from disk, None if it is missing or out of date
+        """
+        record = self._read_record(node_id)
+        if record is None or self.current_digest(node_id) != record["digest"]:
+            return None
+        entries = load_far_entries(self._far_path(node_id))
+        if entries is None or set(entries) != set(record["fsts"]):
+            return None
+        grammar = cls.__new__(cls)
+        for attr, value in record["attrs"].items():
+            setattr(grammar, attr, Path(value["path"]) if "path" in value else value["value"])
+        for attr, fst in entries.items():
+            setattr(grammar, attr, fst)
+        self.graph[node_id] = {key: record[key] for key in ("grammar", "data", "children")}
+        return grammar
+
+    def save(self, node_id: str, grammar, record: Dict[str, object]):
+        """
+        Writes the grammar and its dependency record to disk. Grammars holding anything
+        but fsts and plain values are not cached, and neither are grammars whose cache cannot be written:
+        the grammar built in memory is used as it is.
+        """
+        fsts = {}
+        attrs = {}
+        for attr, value in vars(grammar).items():
+            if PYNINI_AVAILABLE and isinstance(value, pynini.Fst):
+                fsts[attr] = value
+            elif isinstance(value, PurePath):
+                attrs[attr] = {"path": str(value)}
+            elif value is None or isinstance(value, (str, int, float, bool)):
+                attrs[attr] = {"value": value}
+            else:
+                logger.debug(f"not caching {node_id}: {attr} is a {type(value).__name__}")
+                return
+        children = [self.current_digest(child) if child else None for child in record["children"]]
+        record = dict(record, fsts=sorted(fsts), attrs=attrs, digest=self._digest(record, children))
+        if record["digest"] is None:
+            return
+        record_path = self._record_path(node_id)
+        tmp_path = record_path.with_name(f"{record_path.name}.{os.getpid()}.tmp")
+        try:
+            save_far_entries(self._far_path(node_id), fsts)
+            with open(tmp_path, "w", encoding="utf-8") as fp:
+                json.dump(record, fp, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, record_path)
+        except OSError as e:
+            # e.g. a read-only install; warn once per language
+            if not self._save_failed:
+                logger.warning(f"{self.lang}: not caching sub-grammars in {self.nodes_dir}: {e}")
+            self._save_failed = True
+
+    def build(self, cls, name: str, node_id: Optional[str], construct: Callable[[], object]):
+        """
+        Returns the grammar, loaded from disk if it is up to date and incremental builds are on,
+        otherwise constructed, recording its dependencies
+
+        Args:
+            cls: GraphFst subclass
+            name: grammar name
+            node_id: node id, None if the grammar cannot be cached, e.g. for unhashable arguments
+            construct: builds the grammar
+        """
+        record_child(node_id)
+        incremental = incremental_enabled() and node_id is not None
+        if incremental:
+            grammar = self.load(cls, node_id)
+            if grammar is not None:
+                self.loaded.append(node_id)
+                return grammar
+
+        with track_build() as deps:
+            grammar = construct()
+        data = deps.data | module_data_files(cls.__module__)
+        record = {
+            "grammar": name,
+            "module": _rel(sys.modules[cls.__module__].__file__),
+            "data": sorted(_rel(path) for path in data),
+            "children": deps.children,
+        }
+        if node_id is not None:
+            self.graph[node_id] = {key: record[key] for key in ("grammar", "data", "children")}
+            self.rebuilt.append(node_id)
+        if incremental:
+            self.save(node_id, grammar, record)
+        return grammar
+
+    def format_graph(self) -> str:
+        """
+        Formats the dependency graph of the grammars built so far, one tree per root
+        """
+        children = {child for node in self.graph.values() for child in node["children"]}
+        lines = []
+
+        def visit(node_id: Optional[str], depth: int):
+            node = self.graph.get(node_id)
+            if node is None:
+                lines.append("  " * depth + f"{node_id or '<uncached grammar>'}")
+                return
+            lines.append("  " * depth + node["grammar"])
+            for path in node["data"]:
+                lines.append("  " * (depth + 1) + path)
+            for child in node["children"]:
+                visit(child, depth + 1)
+
+        for node_id in self.graph:
+            if node_id not in children:
+                visit(node_id, 0)
+        return "\n".join(lines)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    parser.add_argument("--graph", help="print the dependency graph", action='store_true')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ["ITN_INCREMENTAL_BUILD"] = "1"
+    # compose the final grammars from the sub-grammars instead of loading them from their archives
+    os.environ["ITN_DISABLE_GRAMMAR_CACHE"] = "1"
+    from inverse_text_normalization.grammar_registry import get_registry
+
+    start = time.perf_counter()
+    package = f"inverse_text_normalization.{args.lang}"
+    importlib.import_module(f"{package}.taggers.tokenize_and_classify_final").ClassifyFinalFst()
+    importlib.import_module(f"{package}.verbalizers.verbalize_final").VerbalizeFinalFst()
+    nodes = get_registry(args.lang).nodes
+    if args.graph:
+        print(nodes.format_graph())
+    for node_id in nodes.rebuilt:
+        print(f"rebuilt {nodes.graph[node_id]['grammar']}")
+    print(
+        f"{args.lang}: {len(nodes.rebuilt)} grammars rebuilt, {len(nodes.loaded)} loaded "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
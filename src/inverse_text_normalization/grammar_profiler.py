@@ -0,0 +1,226 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import importlib
+import json
+import os
+import pkgutil
+import time
+from argparse import ArgumentParser
+from typing import Dict, List, Tuple
+
+from inverse_text_normalization.grammar_registry import get_registry, grammar_name
+from inverse_text_normalization.resource_utils import current_rss, format_bytes, rss_since
+
+'''
+Profiles compile time and size of every grammar of a language, e.g.
+
+    python -m inverse_text_normalization.grammar_profiler --lang ta ori
+    python -m inverse_text_normalization.grammar_profiler --lang ta --json ta_profile.json
+
+Every GraphFst subclass constructor of the language is instrumented. For each grammar the profiler records
+wall time (including and excluding the sub-grammars it builds), RSS growth, and states, arcs and serialized
+size of its fst as built and after an extra optimize(), with the time and RSS growth of that optimize(). The
+fsts are measured in a second pass once the build is done, so the measurements of the sub-grammars do not
+count towards the time and RSS of the grammars that build them.
+'''
+
+
+def fst_size(fst) -> Dict[str, int]:
+    """
+    Returns number of states, arcs and serialized bytes of fst
+    """
+    states = fst.num_states()
+    arcs = sum(fst.num_arcs(state) for state in fst.states())
+    try:
+        num_bytes = len(fst.write_to_string())
+    except Exception:
+        num_bytes = -1
+    return {"states": states, "arcs": arcs, "bytes": num_bytes}
+
+
+def _grammar_classes(lang: str) -> List[type]:
+    """
+    Imports every tagger and verbalizer module of the language and returns its GraphFst subclasses
+    """
+    graph_utils = importlib.import_module(f"inverse_text_normalization.{lang}.graph_utils")
+    for kind in ("taggers", "verbalizers"):
+        package = importlib.import_module(f"inverse_text_normalization.{lang}.{kind}")
+        for module_info in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{package.__name__}.{module_info.name}")
+
+    classes = []
+    pending = list(graph_utils.GraphFst.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+class GrammarProfiler:
+    """
+    Instruments the constructors of the GraphFst subclasses of one language
+
+    Args:
+        lang: language package, e.g. 'ta'
+        check_optimize: also measure each fst after an extra optimize()
+    """
+
+    def __init__(self, lang: str, check_optimize: bool = True):
+        self.lang = lang
+        self.check_optimize = check_optimize
+        self.records: List[Dict[str, object]] = []
+        self._stack: List[Dict[str, object]] = []
+        self._built: List[Tuple[object, Dict[str, object]]] = []
+        self._originals = {}
+
+    def _wrap(self, cls, init):
+        profiler = self
+
+        @functools.wraps(init)
+        def profiled_init(grammar, *args, **kwargs):
+            if type(grammar) is not cls:
+                # a subclass constructor calling super().__init__
+                return init(grammar, *args, **kwargs)
+            record = {"name": grammar_name(cls), "children_seconds": 0.0}
+            profiler._stack.append(record)
+            rss_before = current_rss()
+            start = time.perf_counter()
+            try:
+                init(grammar, *args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                profiler._stack.pop()
+            record["kind"] = getattr(grammar, "kind", None)
+            record["seconds"] = round(seconds, 4)
+            record["self_seconds"] = round(seconds - record.pop("children_seconds"), 4)
+            record["rss_bytes"] = rss_since(rss_before)
+            if profiler._stack:
+                profiler._stack[-1]["children_seconds"] += seconds
+            profiler._built.append((grammar.fst, record))
+            profiler.records.append(record)
+
+        return profiled_init
+
+    def measure(self):
+        """
+        Measures the fsts of the grammars built so far, called on leaving the profiler
+        """
+        for fst, record in self._built:
+            if fst is not None:
+                self._measure(fst, record)
+        self._built.clear()
+
+    def _measure(self, fst, record: Dict[str, object]):
+        record["fst"] = fst_size(fst)
+        if self.check_optimize:
+            rss_before = current_rss()
+            start = time.perf_counter()
+            optimized = fst.copy().optimize()
+            record["optimize_seconds"] = round(time.perf_counter() - start, 4)
+            record["optimize_rss_bytes"] = rss_since(rss_before)
+            record["optimized_fst"] = fst_size(optimized)
+
+    def __enter__(self):
+        for cls in _grammar_classes(self.lang):
+            init = cls.__dict__.get("__init__")
+            if init is not None:
+                self._originals[cls] = init
+                cls.__init__ = self._wrap(cls, init)
+        return self
+
+    def __exit__(self, *exc):
+        for cls, init in self._originals.items():
+            cls.__init__ = init
+        self._originals.clear()
+        self.measure()
+        return False
+
+    def report(self) -> Dict[str, object]:
+        """
+        Returns per-grammar records, slowest first
+        """
+        return {
+            "lang": self.lang,
+            "grammars": sorted(self.records, key=lambda r: r["self_seconds"], reverse=True),
+        }
+
+
+def profile_language(lang: str, check_optimize: bool = True) -> Dict[str, object]:
+    """
+    Compiles the final tagger and verbalizer of a language from source under the profiler
+
+    Args:
+        lang: language package
+        check_optimize: also measure each fst after an extra optimize()
+
+    Returns profile report
+    """
+    # profile the compile, not a FAR read
+    os.environ["ITN_DISABLE_GRAMMAR_CACHE"] = "1"
+    os.environ["ITN_INCREMENTAL_BUILD"] = "0"
+    with GrammarProfiler(lang, check_optimize=check_optimize) as profiler:
+        package = f"inverse_text_normalization.{lang}"
+        importlib.import_module(f"{package}.taggers.tokenize_and_classify_final").ClassifyFinalFst()
+        importlib.import_module(f"{package}.verbalizers.verbalize_final").VerbalizeFinalFst()
+    get_registry(lang).clear()
+    return profiler.report()
+
+
+def format_report(lang_report: Dict[str, object]) -> str:
+    """
+    Formats a profile report as a table
+    """
+
+    def size(record: Dict[str, object], key: str, field: str) -> str:
+        return str(record[key][field]) if key in record else "-"
+
+    header = (
+        f"{'grammar':<48} {'total s':>8} {'self s':>8} {'rss':>10} {'states':>8} {'arcs':>9} "
+        f"{'size':>10} {'opt s':>7} {'opt rss':>10} {'opt states':>10} {'opt arcs':>9} {'opt size':>10}"
+    )
+    lines = [f"== {lang_report['lang']}", header]
+    for r in lang_report["grammars"]:
+        lines.append(
+            f"{r['name']:<48} {r['seconds']:>8.3f} {r['self_seconds']:>8.3f} {format_bytes(r['rss_bytes']):>10} "
+            f"{size(r, 'fst', 'states'):>8} {size(r, 'fst', 'arcs'):>9} "
+            f"{format_bytes(r['fst']['bytes']) if 'fst' in r else '-':>10} "
+            f"{r.get('optimize_seconds', '-'):>7} "
+            f"{format_bytes(r['optimize_rss_bytes']) if 'optimize_rss_bytes' in r else '-':>10} "
+            f"{size(r, 'optimized_fst', 'states'):>10} "
+            f"{size(r, 'optimized_fst', 'arcs'):>9} "
+            f"{format_bytes(r['optimized_fst']['bytes']) if 'optimized_fst' in r else '-':>10}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages to profile", nargs="+", required=True)
+    parser.add_argument("--json", help="write the reports to this JSON file", type=str)
+    parser.add_argument("--skip_optimize_check", help="do not re-optimize each fst", action='store_true')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    reports = [profile_language(lang, check_optimize=not args.skip_optimize_check) for lang in args.lang]
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(reports, fp, indent=2, ensure_ascii=False)
+    else:
+        for lang_report in reports:
+            print(format_report(lang_report))
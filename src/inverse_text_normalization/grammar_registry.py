@@ -0,0 +1,251 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import importlib
+import os
+import threading
+import time
+from argparse import ArgumentParser
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from inverse_text_normalization.grammar_deps import NodeCache, record_child
+from inverse_text_normalization.resource_utils import current_rss, format_bytes, rss_since, sum_bytes
+
+'''
+Build-once registry for sub-grammars.
+
+Taggers and verbalizers ask the registry for the grammars they compose, e.g.
+`build_grammar(CardinalFst)` or `build_grammar(DecimalFst, cardinal)`, instead of constructing them.
+Each GraphFst subclass is then compiled once per process and constructor arguments, and the
+registry keeps track of how much compile time and memory the reuse saved.
+It also records the dependency graph of the grammars and, with ITN_INCREMENTAL_BUILD=1,
+loads unchanged grammars from disk instead of compiling them, see grammar_deps.
+'''
+
+
+class GrammarStats:
+    """
+    Build and reuse counters of one grammar
+
+    Args:
+        name: grammar name, e.g. 'taggers.cardinal.CardinalFst'
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.builds = 0
+        self.hits = 0
+        self.seconds = 0.0
+        # None where the resident set size is not available
+        self.rss_bytes: Optional[int] = 0
+
+    @property
+    def saved_seconds(self) -> float:
+        return self.hits * self.seconds / max(self.builds, 1)
+
+    @property
+    def saved_bytes(self) -> Optional[int]:
+        if self.rss_bytes is None:
+            return None
+        return self.hits * self.rss_bytes // max(self.builds, 1)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "builds": self.builds,
+            "hits": self.hits,
+            "build_seconds": round(self.seconds, 4),
+            "build_rss_bytes": self.rss_bytes,
+            "saved_seconds": round(self.saved_seconds, 4),
+            "saved_rss_bytes": self.saved_bytes,
+        }
+
+
+class GrammarRegistry:
+    """
+    Memoizes GraphFst subclasses of one language, keyed by class and constructor arguments.
+    Grammar arguments are matched by identity, so grammars built from shared sub-grammars are shared as well.
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self._grammars = {}
+        self._stats: Dict[str, GrammarStats] = OrderedDict()
+        # id(grammar) -> node id, for the grammars in self._grammars
+        self._node_ids: Dict[int, str] = {}
+        self.nodes = NodeCache(lang)
+        # re-entrant: building a grammar builds its sub-grammars through the registry
+        self._lock = threading.RLock()
+
+    def build(self, cls, *args, **kwargs):
+        """
+        Returns the grammar built from cls(*args, **kwargs), building it on first request
+
+        Args:
+            cls: GraphFst subclass
+            args: constructor arguments
+            kwargs: constructor keyword arguments
+
+        Returns GraphFst instance
+        """
+        key = (cls, args, tuple(sorted(kwargs.items())))
+        name = grammar_name(cls)
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = GrammarStats(name)
+            grammar = self._grammars.get(key)
+            if grammar is not None:
+                stats.hits += 1
+                record_child(self._node_ids.get(id(grammar)))
+                return grammar
+
+            node_id = self._node_id(cls, args, kwargs)
+            rss_before = current_rss()
+            start = time.perf_counter()
+            grammar = self.nodes.build(cls, name, node_id, lambda: cls(*args, **kwargs))
+            stats.seconds += time.perf_counter() - start
+            rss_bytes = rss_since(rss_before)
+            stats.rss_bytes = sum_bytes([stats.rss_bytes, None if rss_bytes is None else max(rss_bytes, 0)])
+            stats.builds += 1
+            self._grammars[key] = grammar
+            if node_id is not None:
+                self._node_ids[id(grammar)] = node_id
+            return grammar
+
+    def _node_id(self, cls, args: tuple, kwargs: dict) -> Optional[str]:
+        """
+        Returns a stable id for cls(*args, **kwargs) across processes, e.g. 'taggers.decimal.DecimalFst-3f1c9e0a2b',
+        None if an argument is neither a grammar built by this registry nor a plain value
+        """
+        parts = []
+        for arg in list(args) + [value for _, value in sorted(kwargs.items())]:
+            if id(arg) in self._node_ids:
+                parts.append(self._node_ids[id(arg)])
+            elif arg is None or isinstance(arg, (str, int, float, bool)):
+                parts.append(repr(arg))
+            else:
+                return None
+        name = grammar_name(cls)
+        key = f"{name}({', '.join(parts)}; {', '.join(sorted(kwargs))})"
+        return f"{name}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]}"
+
+    def clear(self):
+        """
+        Drops the built grammars, e.g. once they are composed into the final tagger and verbalizer. Keeps statistics.
+        """
+        with self._lock:
+            self._grammars.clear()
+            self._node_ids.clear()
+
+    def report(self) -> Dict[str, object]:
+        """
+        Returns build statistics of the language and the compile time and memory saved by reuse
+        """
+        with self._lock:
+            grammars = [stats.to_dict() for stats in self._stats.values()]
+        return {
+            "lang": self.lang,
+            "grammars": grammars,
+            "saved_seconds": round(sum(g["saved_seconds"] for g in grammars), 4),
+            "saved_rss_bytes": sum_bytes(g["saved_rss_bytes"] for g in grammars),
+        }
+
+
+_registries: Dict[str, GrammarRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def grammar_name(cls) -> str:
+    """
+    Returns name of a grammar class relative to its language package, e.g. 'taggers.cardinal.CardinalFst'
+    """
+    return ".".join(cls.__module__.split(".")[2:] + [cls.__name__])
+
+
+def grammar_lang(cls) -> str:
+    """
+    Returns language package of a grammar class, e.g. 'hi' for inverse_text_normalization.hi.taggers.cardinal
+    """
+    return cls.__module__.split(".")[1]
+
+
+def get_registry(lang: str) -> GrammarRegistry:
+    """
+    Returns the grammar registry of a language package
+    """
+    with _registries_lock:
+        registry = _registries.get(lang)
+        if registry is None:
+            registry = _registries[lang] = GrammarRegistry(lang)
+        return registry
+
+
+def build_grammar(cls, *args, **kwargs):
+    """
+    Returns the shared instance of cls(*args, **kwargs) from the registry of its language
+
+    Args:
+        cls: GraphFst subclass
+        args: constructor arguments
+        kwargs: constructor keyword arguments
+
+    Returns GraphFst instance
+    """
+    return get_registry(grammar_lang(cls)).build(cls, *args, **kwargs)
+
+
+def report(lang: Optional[str] = None) -> List[Dict[str, object]]:
+    """
+    Returns registry reports of one or all languages
+    """
+    with _registries_lock:
+        registries = [_registries[lang]] if lang else list(_registries.values())
+    return [registry.report() for registry in registries]
+
+
+def format_report(lang_report: Dict[str, object]) -> str:
+    """
+    Formats a language report as a table
+    """
+    lines = [f"{'grammar':<45} {'builds':>6} {'hits':>5} {'build s':>9} {'build rss':>11} {'saved s':>9}"]
+    for g in lang_report["grammars"]:
+        lines.append(
+            f"{g['name']:<45} {g['builds']:>6} {g['hits']:>5} {g['build_seconds']:>9.3f} "
+            f"{format_bytes(g['build_rss_bytes']):>11} {g['saved_seconds']:>9.3f}"
+        )
+    lines.append(
+        f"{lang_report['lang']}: reuse saved {lang_report['saved_seconds']:.3f}s of compile time "
+        f"and {format_bytes(lang_report['saved_rss_bytes'])} of memory"
+    )
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # build from source so that every sub-grammar goes through the registry
+    os.environ["ITN_DISABLE_GRAMMAR_CACHE"] = "1"
+    importlib.import_module(f"inverse_text_normalization.{args.lang}.inverse_normalize")
+    print(format_report(get_registry(args.lang).report()))
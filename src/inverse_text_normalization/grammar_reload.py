@@ -0,0 +1,103 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Tuple
+
+from inverse_text_normalization import chunking, sentence_cache, span_window, trigger_filter
+from inverse_text_normalization.grammar_cache import grammar_hash
+from inverse_text_normalization.grammar_deps import incremental_build
+from inverse_text_normalization.grammar_registry import get_registry
+
+'''
+Hot reload of lexicon TSVs in running workers, e.g. after adding an entry to hi/data/whitelist.tsv:
+
+    from inverse_text_normalization.grammar_reload import reload_lexicons
+    reload_lexicons('hi')             # returns a Future
+    reload_lexicons('hi', wait=True)  # or block until the new grammars are in place
+
+The grammars are rebuilt in a background thread with incremental builds on (see grammar_deps), so only
+sub-grammars whose data files changed are compiled; the first reload of a worker that loaded its grammars
+from a FAR compiles them all once and caches them. The new tagger and verbalizer are then swapped into
+`<lang>/inverse_normalize.py` together. Sentences already being normalized finish with the old grammars.
+
+Tables a module reads at import time, such as the months of taggers/date.py, still need a restart.
+'''
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="itn-reload")
+_pending: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def rebuild_grammars(lang: str) -> Tuple[object, object]:
+    """
+    Builds tagger and verbalizer of a language package from its current data files
+
+    Args:
+        lang: language package, e.g. 'hi'
+
+    Returns ClassifyFinalFst and VerbalizeFinalFst
+    """
+    # data files changed since the grammar version was computed
+    grammar_hash.cache_clear()
+    package = f"inverse_text_normalization.{lang}"
+    registry = get_registry(lang)
+    rebuilt_before = len(registry.nodes.rebuilt)
+    with incremental_build():
+        tagger = importlib.import_module(f"{package}.taggers.tokenize_and_classify_final").ClassifyFinalFst()
+        verbalizer = importlib.import_module(f"{package}.verbalizers.verbalize_final").VerbalizeFinalFst()
+    registry.clear()
+    rebuilt = [registry.nodes.graph[node]["grammar"] for node in registry.nodes.rebuilt[rebuilt_before:]]
+    logger.info(f"{lang}: rebuilt {', '.join(rebuilt) or 'no sub-grammars'}")
+    return tagger, verbalizer
+
+
+def _reload(lang: str) -> Dict[str, object]:
+    start = time.perf_counter()
+    tagger, verbalizer = rebuild_grammars(lang)
+    importlib.import_module(f"inverse_text_normalization.{lang}.inverse_normalize").swap_grammars(tagger, verbalizer)
+    # new lexicon entries are new triggers, and cached sentences may normalize differently
+    trigger_filter.clear(lang)
+    chunking.clear(lang)
+    sentence_cache.clear(lang)
+    span_window.clear_span_cache(lang)
+    seconds = time.perf_counter() - start
+    logger.info(f"{lang}: swapped in reloaded grammars after {seconds:.2f}s")
+    return {"lang": lang, "seconds": round(seconds, 2)}
+
+
+def reload_lexicons(lang: str, wait: bool = False) -> Future:
+    """
+    Rebuilds the grammars of a language package from its current data files in the background and swaps them in.
+    A reload requested while another one of the language is still queued shares that one.
+
+    Args:
+        lang: language package, e.g. 'hi'
+        wait: block until the new grammars are in place
+
+    Returns future of the reload info
+    """
+    with _pending_lock:
+        future = _pending.get(lang)
+        if future is None or future.running() or future.done():
+            future = _pending[lang] = _executor.submit(_reload, lang)
+    if wait:
+        future.result()
+    return future
@@ -17,6 +17,7 @@
 import pynini
 from pynini.lib import pynutil, utf8
 
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.hi.data_loader_utils import get_abs_path
 from inverse_text_normalization.hi.graph_utils import (
     NEMO_DIGIT,
@@ -65,14 +66,14 @@ class CardinalFst(GraphFst):
         HINDI_DIGIT = pynini.union(*hindi_digits).optimize()
         HINDI_DIGIT_WITH_ZERO = pynini.union(*hindi_digits_with_zero).optimize()
 
-        graph_zero = pynini.string_file(get_abs_path(data_path + "numbers/zero.tsv"))
-        graph_tens = pynini.string_file(get_abs_path(data_path + "numbers/tens.tsv"))
-        graph_digit = pynini.string_file(get_abs_path(data_path + "numbers/digit.tsv"))
-        graph_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
-        graph_ties = pynini.string_file(get_abs_path(data_path + "numbers/ties.tsv"))
-        graph_chars = pynini.string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
-        graph_char_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
-        graph_tens_en = pynini.string_file(get_abs_path(data_path + "numbers/tens-en.tsv"))
+        graph_zero = string_file(get_abs_path(data_path + "numbers/zero.tsv"))
+        graph_tens = string_file(get_abs_path(data_path + "numbers/tens.tsv"))
+        graph_digit = string_file(get_abs_path(data_path + "numbers/digit.tsv"))
+        graph_multiples = string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
+        graph_ties = string_file(get_abs_path(data_path + "numbers/ties.tsv"))
+        graph_chars = string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
+        graph_char_multiples = string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
+        graph_tens_en = string_file(get_abs_path(data_path + "numbers/tens-en.tsv"))
 
         cents = pynini.accep("सौ") | pynini.accep("हंड्रेड") | pynini.accep("हन्ड्रड")
         thousands = pynini.accep("थाउज़न्ड") | pynini.accep("हज़ार") | pynini.accep("थाउज़ेंड") | pynini.accep("हजार") | pynini.accep("थाउजेंड")
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.hi.data_loader_utils import get_abs_path
 from inverse_text_normalization.hi.graph_utils import (
     NEMO_DIGIT,
@@ -66,8 +67,8 @@ class DecimalFst(GraphFst):
             cardinal.graph_hundred_component_at_least_one_none_zero_digit
         )
 
-        graph_decimal = pynini.string_file(get_abs_path(data_path+"numbers/digit.tsv"))
-        graph_decimal |= pynini.string_file(get_abs_path(data_path +"numbers/zero.tsv")) | pynini.cross("शून्य", "0")
+        graph_decimal = string_file(get_abs_path(data_path+"numbers/digit.tsv"))
+        graph_decimal |= string_file(get_abs_path(data_path +"numbers/zero.tsv")) | pynini.cross("शून्य", "0")
 
         graph_decimal = pynini.closure(graph_decimal + delete_space) + graph_decimal
         self.graph = graph_decimal
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.hi.graph_utils import NEMO_CHAR, GraphFst, delete_space
 from inverse_text_normalization.hi.verbalizers.decimal import DecimalFst
 
@@ -20,13 +21,8 @@ try:
     import pynini
     from pynini.lib import pynutil
 
-    decimal = DecimalFst()
-
     PYNINI_AVAILABLE = True
 except (ModuleNotFoundError, ImportError):
-    # Add placeholders
-    decimal = None
-
     PYNINI_AVAILABLE = False
 
 
@@ -38,6 +34,7 @@ class MoneyFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="money", kind="verbalize")
+        decimal = build_grammar(DecimalFst)
         unit = (
             pynutil.delete("currency:")
             + delete_space
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.hi.graph_utils import GraphFst
 from inverse_text_normalization.hi.verbalizers.cardinal import CardinalFst
 from inverse_text_normalization.hi.verbalizers.date import DateFst
@@ -31,14 +32,14 @@ class VerbalizeFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="verbalize", kind="verbalize")
-        cardinal = CardinalFst().fst
-        ordinal = OrdinalFst().fst
-        decimal = DecimalFst().fst
-        measure = MeasureFst().fst
-        time = TimeFst().fst
-        date = DateFst().fst
+        cardinal = build_grammar(CardinalFst).fst
+        ordinal = build_grammar(OrdinalFst).fst
+        decimal = build_grammar(DecimalFst).fst
+        measure = build_grammar(MeasureFst).fst
+        time = build_grammar(TimeFst).fst
+        date = build_grammar(DateFst).fst
         # money = MoneyFst().fst
-        whitelist = WhiteListFst().fst
+        whitelist = build_grammar(WhiteListFst).fst
         graph = time | date | measure | ordinal | decimal | cardinal | whitelist
         # graph = time | date | money | measure | ordinal | decimal | cardinal | whitelist
         self.fst = graph
@@ -0,0 +1,56 @@
+'''
+Please move this file to src/ before running the tests
+
+The worker pool test normalizes with the WFST grammars and only runs where pynini is installed.
+'''
+
+import unittest
+
+from inverse_text_normalization import batch
+from inverse_text_normalization.batch import MAX_CHUNK_SIZE, MIN_CHUNK_SIZE, plan_chunks
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+
+class BatchInverseTextNormalization(unittest.TestCase):
+
+    def test_chunks_cover_the_list_in_order(self):
+        chunks = plan_chunks(1000, 4, chunk_size=300)
+
+        self.assertEqual([(0, 300), (300, 600), (600, 900), (900, 1000)], chunks)
+
+    def test_adaptive_chunks_stay_within_bounds(self):
+        self.assertEqual(MIN_CHUNK_SIZE, plan_chunks(40, 8)[0][1])
+        self.assertEqual(20000 // (8 * batch.CHUNKS_PER_WORKER), plan_chunks(20000, 8)[0][1])
+        self.assertEqual(MAX_CHUNK_SIZE, plan_chunks(10 ** 7, 2)[0][1])
+
+    def test_workers_and_chunk_size_below_one_are_rejected(self):
+        for workers, chunk_size in [(0, None), (-2, None), (4, 0), (4, -300)]:
+            with self.subTest(workers=workers, chunk_size=chunk_size):
+                with self.assertRaises(ValueError):
+                    plan_chunks(1000, workers, chunk_size)
+                with self.assertRaises(ValueError):
+                    batch.inverse_normalize_batch_results(['दो'] * 100, 'hi', workers=workers, chunk_size=chunk_size)
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'worker pool test needs pynini')
+    def test_pool_output_matches_serial_output(self):
+        from inverse_text_normalization import run_predict
+
+        sentences = ['मेरे पास दस लाख लोग हैं', 'मुझे दो सौ पानी की बोतल दो', 'रीटा के पास सोलह बिल्लियाँ हैं।']
+        # more distinct sentences than MIN_CHUNK_SIZE, so that they go to the pool
+        numbers = ['एक', 'दो', 'तीन', 'चार', 'पाँच', 'छह']
+        data = [f'{sentence} {number}' for sentence in sentences for number in numbers] * 2
+        try:
+            self.assertEqual(run_predict.inverse_normalize_text(data, 'hi'),
+                             run_predict.inverse_normalize_text(data, 'hi', workers=2, chunk_size=1))
+        finally:
+            batch.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import os
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import chunking
+from inverse_text_normalization.trigger_filter import split_words
+
+
+class Chunking(unittest.TestCase):
+
+    def test_number_phrases_are_not_split(self):
+        words = split_words('आज मैंने बाज़ार से दस लाख एक हज़ार चार सौ रुपये का सामान खरीदा और फिर घर आया')
+
+        chunks = [' '.join(words[start:end]) for start, end in chunking.chunk_spans(words, 'hi', 4)]
+
+        self.assertIn('दस लाख एक हज़ार चार सौ रुपये', ' | '.join(chunks))
+        self.assertEqual(words, ' '.join(chunks).split(' '))
+
+    def test_time_suffixes_and_zones_are_not_split(self):
+        words = split_words('वह घर आया साढ़े दस p m c s t और फिर for example वह घर गया')
+
+        # without protection the chunks are 'वह घर आया', 'साढ़े दस p', 'm c s', ...
+        spans = chunking.chunk_spans(words, 'hi', 3)
+        chunks = [' '.join(words[start:end]) for start, end in spans]
+
+        self.assertNotIn(words.index('m'), [start for start, _ in spans])
+        self.assertIn('साढ़े दस p m c s t', ' | '.join(chunks))
+        self.assertIn('for example', ' | '.join(chunks))
+
+    def test_punctuation_boundaries_are_preferred(self):
+        words = split_words('मैं घर आया, उसके बाद मैंने खाना खाया')
+
+        self.assertEqual([(0, 3), (3, 8)], chunking.chunk_spans(words, 'hi', 5))
+
+    @mock.patch.dict(os.environ, {'ITN_CHUNK_WORDS': '3'})
+    def test_long_inputs_are_normalized_in_chunks(self):
+        chunks = []
+
+        def normalize(text):
+            chunks.append(text)
+            return text.upper()
+
+        output = chunking.normalize_chunks('alpha beta gamma delta epsilon zeta eta', 'en', normalize)
+
+        self.assertEqual('ALPHA BETA GAMMA DELTA EPSILON ZETA ETA', output)
+        self.assertEqual(['alpha beta gamma', 'delta epsilon zeta', 'eta'], chunks)
+
+    def test_short_inputs_are_normalized_whole(self):
+        self.assertEqual('A  B', chunking.normalize_chunks('a  b', 'en', str.upper))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import unittest
+from collections import OrderedDict
+
+from inverse_text_normalization.field_order import FieldOrders, orderings, serialize
+
+
+class _Lattice:
+
+    def __init__(self, accepted):
+        self.accepted = accepted
+
+    def num_states(self):
+        return 1 if self.accepted else 0
+
+
+def _date(day, month):
+    return OrderedDict([('date', OrderedDict([('month', month), ('day', day)]))])
+
+
+def _accepts_day_first(tagged_text):
+    return _Lattice('month' not in tagged_text or tagged_text.index('day') < tagged_text.index('month'))
+
+
+class FieldOrder(unittest.TestCase):
+
+    def test_orderings_follow_the_permutation_order(self):
+        token = OrderedDict([('money', OrderedDict([('integer_part', 'पाँच'), ('currency', 'रुपये')]))])
+
+        self.assertEqual([' money { integer_part: "पाँच" currency: "रुपये"  } ',
+                          ' money { currency: "रुपये" integer_part: "पाँच"  } '],
+                         [s for s, _ in orderings(token)])
+
+    def test_serialize_reproduces_an_ordering(self):
+        token = _date('पाँच', 'मार्च')
+
+        for s, order in orderings(token):
+            self.assertEqual(s, serialize(token, order))
+
+    def test_accepted_order_is_reused_with_one_composition(self):
+        field_orders = FieldOrders()
+        compositions = []
+
+        def compose(tagged_text):
+            compositions.append(tagged_text)
+            return _accepts_day_first(tagged_text)
+
+        field_orders.verbalize([_date('पाँच', 'मार्च')], compose)
+        del compositions[:]
+        lattice = field_orders.verbalize([_date('दस', 'मई'), _date('दो', 'जून')], compose)
+
+        self.assertEqual(1, lattice.num_states())
+        self.assertEqual([' date { day: "दस" month: "मई"  }  date { day: "दो" month: "जून"  } '], compositions)
+
+    def test_no_accepted_order_returns_none(self):
+        self.assertIsNone(FieldOrders().verbalize([_date('पाँच', 'मार्च')], lambda tagged_text: _Lattice(False)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+'''
+Please move this file to src/ before running the tests
+
+The reload test rebuilds the WFST grammars and only runs where pynini is installed.
+'''
+
+import os
+import stat
+import tempfile
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import grammar_cache, grammar_deps
+from inverse_text_normalization.grammar_deps import NodeCache, incremental_build, node_cache_dir
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+
+class PlainGrammar:
+
+    def __init__(self):
+        self.name = 'plain'
+
+
+class NodeCacheTests(unittest.TestCase):
+
+    def build(self, nodes_dir):
+        cache = NodeCache('hi', nodes_dir=nodes_dir)
+        with incremental_build(), self.assertLogs('inverse_text_normalization.grammar_deps', 'WARNING') as logs:
+            grammar = cache.build(PlainGrammar, 'PlainGrammar', 'plain', PlainGrammar)
+            cache.build(PlainGrammar, 'PlainGrammar', 'plain_again', PlainGrammar)
+        return grammar, logs
+
+    def test_cache_dir_is_configurable(self):
+        with mock.patch.dict(os.environ, {'ITN_NODE_CACHE_DIR': '/tmp/itn_nodes'}):
+            self.assertEqual('/tmp/itn_nodes/hi', str(node_cache_dir('hi')))
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': '/tmp/cache'}), mock.patch.dict(os.environ):
+            os.environ.pop('ITN_NODE_CACHE_DIR', None)
+            os.environ.pop('ITN_GRAMMAR_DIR', None)
+            self.assertEqual('/tmp/cache/inverse_text_normalization/hi/nodes', str(node_cache_dir('hi')))
+
+    @unittest.skipIf(os.geteuid() == 0, 'root can write to read-only directories')
+    def test_read_only_cache_dir_builds_in_memory(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.chmod(root, stat.S_IRUSR | stat.S_IXUSR)
+            try:
+                grammar, logs = self.build(os.path.join(root, 'nodes'))
+            finally:
+                os.chmod(root, stat.S_IRWXU)
+
+        self.assertEqual('plain', grammar.name)
+        self.assertEqual(1, len(logs.records))
+
+    def test_unwritable_cache_dir_builds_in_memory(self):
+        with tempfile.NamedTemporaryFile() as fp:
+            # a directory below a file cannot be created, not even by root
+            grammar, logs = self.build(os.path.join(fp.name, 'nodes'))
+
+        self.assertEqual('plain', grammar.name)
+        self.assertEqual(1, len(logs.records))
+
+    def test_shared_grammar_modules_are_part_of_the_versions(self):
+        digests = {}
+
+        def file_digest(path):
+            return digests.get(os.path.basename(path), 'same')
+
+        with tempfile.TemporaryDirectory() as root:
+            for source in grammar_cache.SHARED_GRAMMAR_SOURCES:
+                with open(os.path.join(root, source), 'w') as fp:
+                    fp.write('# shared\n')
+            with mock.patch.object(grammar_cache, 'PACKAGE_ROOT', root), \
+                    mock.patch.object(grammar_deps, 'file_digest', file_digest):
+                grammar_cache.shared_sources_digest.cache_clear()
+                versions = [grammar_cache.shared_sources_digest(), NodeCache('hi', nodes_dir=root).base_digest()]
+                with open(os.path.join(root, 'plural_utils.py'), 'a') as fp:
+                    fp.write('# edited\n')
+                digests['plural_utils.py'] = 'edited'
+                grammar_cache.shared_sources_digest.cache_clear()
+                edited = [grammar_cache.shared_sources_digest(), NodeCache('hi', nodes_dir=root).base_digest()]
+            grammar_cache.shared_sources_digest.cache_clear()
+
+        self.assertNotEqual(versions[0], edited[0])
+        self.assertNotEqual(versions[1], edited[1])
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'rebuilding the grammars needs pynini')
+    def test_reload_rebuilds_into_an_unwritable_cache_dir(self):
+        from inverse_text_normalization.grammar_reload import rebuild_grammars
+
+        with tempfile.NamedTemporaryFile() as fp:
+            with mock.patch.dict(os.environ, {'ITN_NODE_CACHE_DIR': fp.name}):
+                tagger, verbalizer = rebuild_grammars('hi')
+
+        self.assertIsNotNone(tagger.fst)
+        self.assertIsNotNone(verbalizer.fst)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+'''
+Please move this file to src/ before running the tests
+
+The differential test compares native_verbalizer with the verbalizer FST and only runs where pynini is installed.
+'''
+
+import importlib
+import unittest
+
+from inverse_text_normalization import native_verbalizer
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.token_parser import parse_tokens
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+
+class NativeVerbalizer(unittest.TestCase):
+
+    def test_number_classes_are_rendered(self):
+        data = ['tokens { cardinal { negative: "-" integer: "23" } }',
+                'tokens { ordinal { integer: "21" } } tokens { ordinal { integer: "112" } }',
+                'tokens { decimal { negative: "true" integer_part: "12" fractional_part: "5006" quantity: "billion" } }',
+                'tokens { measure { cardinal { integer: "12" } units: "kg" } }',
+                'tokens { money { currency: "$" integer_part: "12" fractional_part: "05" } }']
+        expected_output = ['-23', '21st 112th', '-12.5006 billion', '12 kg', '$12.05']
+
+        self.assertEqual(expected_output, [native_verbalizer.verbalize(parse_tokens(text), 'gu') for text in data])
+
+    def test_time_and_date_fields_are_ordered_as_the_verbalizer_accepts(self):
+        data = ['tokens { time { minutes: "5" hours: "2" suffix: "a.m." } }',
+                'tokens { date { year: "2012" day: "5" month: "january" } }',
+                'tokens { date { month: "january" day: "5" year: "2012" preserve_order: true } }']
+        expected_output = ['02:05 a.m.', '5 january 2012', 'january 5 2012']
+
+        self.assertEqual(expected_output, [native_verbalizer.verbalize(parse_tokens(text), 'en') for text in data])
+
+    def test_words_and_punctuation_are_joined(self):
+        text = ('tokens { name: "its" } tokens { time { hours: "12" minutes: "30" } } tokens { name: "now" } '
+                'tokens { name: "." pause_length: "PAUSE_LONG phrase_break: true type: PUNCT" }')
+
+        self.assertEqual('its 12:30 now .', native_verbalizer.verbalize(parse_tokens(text), 'en'))
+
+    def test_tokens_the_verbalizer_rejects_need_the_fst(self):
+        data = ['tokens { fraction { numerator: "1" denominator: "2" } }',
+                'tokens { money { currency: "$" integer_part: "12" } }',
+                'tokens { time { hours: "123" minutes: "30" } }',
+                'tokens { date { year: "2012" day: "5" month: "january" preserve_order: true } }']
+
+        self.assertEqual([None] * 4, [native_verbalizer.verbalize(parse_tokens(text), 'hi') for text in data])
+
+    def test_signed_money_needs_the_fst(self):
+        data = ['tokens { money { currency: "₹" negative: "true" integer_part: "12" } }',
+                'tokens { money { negative: "true" currency: "₹" integer_part: "12" fractional_part: "50" } }']
+
+        self.assertEqual([None, None], [native_verbalizer.verbalize(parse_tokens(text), 'gu') for text in data])
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'differential test against the verbalizer FST needs pynini')
+    def test_native_output_matches_the_verbalizer_fst(self):
+        for lang in LANGUAGES:
+            module = importlib.import_module(f'inverse_text_normalization.{lang}.inverse_normalize')
+            for sentence in sample_sentences(lang):
+                tokens = parse_tokens(module.select_tag(module.find_tags(pynini.escape(sentence))))
+                output = native_verbalizer.verbalize(tokens, lang)
+                if output is None:
+                    continue
+                with self.subTest(lang=lang, sentence=sentence):
+                    lattice = module._field_orders.verbalize(
+                        tokens, lambda tagged_text: module.find_verbalizer(pynini.escape(tagged_text)))
+                    self.assertEqual(module.select_verbalizer(lattice), output)
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'differential test against the verbalizer FST needs pynini')
+    def test_signed_money_is_left_to_the_verbalizer_fst(self):
+        text = 'tokens { money { currency: "₹" negative: "true" integer_part: "12" } }'
+        for lang in LANGUAGES:
+            if lang in native_verbalizer.LANGUAGES_WITHOUT_MONEY:
+                continue
+            module = importlib.import_module(f'inverse_text_normalization.{lang}.inverse_normalize')
+            tokens = parse_tokens(text)
+            with self.subTest(lang=lang):
+                self.assertIsNone(native_verbalizer.verbalize(tokens, lang))
+                lattice = module._field_orders.verbalize(
+                    tokens, lambda tagged_text: module.find_verbalizer(pynini.escape(tagged_text)))
+                self.assertTrue(lattice is None or lattice.num_states() == 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
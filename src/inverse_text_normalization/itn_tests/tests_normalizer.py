@@ -0,0 +1,43 @@
+'''
+Please move this file to src/ before running the tests
+
+The InverseNormalizer test loads the WFST grammars and only runs where pynini is installed.
+'''
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from inverse_text_normalization.benchmarks.token_parser import CLASS_TOKENS
+from inverse_text_normalization.token_parser import parse_tokens
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+
+class ConcurrentInverseTextNormalization(unittest.TestCase):
+
+    def test_threads_parse_independently(self):
+        data = CLASS_TOKENS * 200
+        expected_output = [parse_tokens(text) for text in data]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            self.assertEqual(expected_output, list(pool.map(parse_tokens, data)))
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'InverseNormalizer test needs pynini')
+    def test_shared_normalizer_gives_serial_output(self):
+        from inverse_text_normalization.normalizer import InverseNormalizer
+
+        normalizer = InverseNormalizer('hi')
+        data = ['मेरे पास दस लाख लोग हैं', 'मुझे दो सौ पानी की बोतल दो', 'रीटा के पास सोलह बिल्लियाँ हैं।'] * 20
+        expected_output = normalizer.normalize_list(data)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            self.assertEqual(expected_output, list(pool.map(normalizer.normalize, data)))
+
+
+if __name__ == '__main__':
+    unittest.main()
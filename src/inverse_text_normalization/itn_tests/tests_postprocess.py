@@ -0,0 +1,50 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import unittest
+
+from inverse_text_normalization import postprocess, run_predict
+from inverse_text_normalization.benchmarks.postprocess import (
+    format_numbers_with_commas,
+    legacy_postprocess,
+    synthetic_outputs,
+)
+from inverse_text_normalization.postprocess import PostProcessor
+
+
+class PostProcessTests(unittest.TestCase):
+
+    def test_zeros_are_trimmed_and_currencies_separated(self):
+        data = ['मेरे पास 007 लोग हैं\r', '$500 की बोतल', '0.5 km और 00.5 km', '₹0000 दो']
+        expected_output = ['मेरे पास 7 लोग हैं', '$ 500 की बोतल', '0.5 km और .5 km', '₹  दो']
+
+        self.assertEqual(expected_output, postprocess.postprocess_batch(data, 'hi'))
+
+    def test_zero_words_and_currencies_follow_the_language(self):
+        self.assertEqual(['0 and 000', '£05'], postprocess.postprocess_batch(['0 and 000', '£05'], 'hi'))
+        self.assertEqual([' and ', '£ 5'], postprocess.postprocess_batch(['0 and 000', '£05'], 'pa'))
+
+    def test_output_matches_the_previous_passes(self):
+        data = synthetic_outputs(2000) + ['$', '$5.5', '05.5', '€0', '10:30', '₹1234567.50']
+        for lang in postprocess.LANGUAGE_RULES:
+            with self.subTest(lang=lang):
+                self.assertEqual(legacy_postprocess(data, lang), postprocess.postprocess_batch(data, lang))
+
+    def test_digit_groups_are_separated(self):
+        indian = PostProcessor('$₹', True, separator=',')
+        western = PostProcessor('$₹', True, grouping='western', separator=',')
+
+        self.assertEqual('$ 12,34,567.50 at 10:30', indian.process('$01234567.50 at 10:30'))
+        self.assertEqual('$ 1,234,567.50 at 1234', western.process('$01234567.50 at 1234'))
+
+    def test_deprecated_format_numbers_with_commas_still_works(self):
+        data = synthetic_outputs(200) + ['$90000936.59', '₹1234567.50 at 10:30']
+        for lang in ('hi', 'en'):
+            with self.subTest(lang=lang), self.assertWarns(DeprecationWarning):
+                output = [run_predict.format_numbers_with_commas(sent, lang) for sent in data]
+            self.assertEqual([format_numbers_with_commas(sent, lang) for sent in data], output)
+
+
+if __name__ == '__main__':
+    unittest.main()
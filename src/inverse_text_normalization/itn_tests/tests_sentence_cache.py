@@ -0,0 +1,79 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import sentence_cache
+from inverse_text_normalization.sentence_cache import SentenceCache
+
+
+class SentenceCacheTest(unittest.TestCase):
+
+    def test_misses_are_computed_once_per_call(self):
+        cache = SentenceCache(maxsize=10)
+        calls = []
+
+        def compute(texts):
+            calls.append(texts)
+            return [text.upper() for text in texts]
+
+        self.assertEqual(['A', 'B', 'A'], cache.map(['a', 'b', 'a'], compute))
+        self.assertEqual(['B', 'C'], cache.map(['b', 'c'], compute))
+        self.assertEqual([['a', 'b'], ['c']], calls)
+        metrics = cache.metrics()
+        self.assertEqual((1, 4, 3), (metrics['hits'], metrics['misses'], metrics['size']))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = SentenceCache(maxsize=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+
+        self.assertEqual(('A', None, 'C'), (cache.get('a'), cache.get('b'), cache.get('c')))
+        self.assertEqual(1, cache.metrics()['evictions'])
+
+    def test_expired_entries_are_misses(self):
+        cache = SentenceCache(maxsize=2, ttl=60)
+        cache.put('a', 'A', stored=time.time() - 120)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.metrics()['expirations'])
+
+    def test_persisted_entries_of_the_same_version_are_loaded(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, 'hi.json')
+            cache = SentenceCache(maxsize=2, path=path, version='1')
+            cache.put('दो', '2')
+            cache.save()
+
+            self.assertEqual('2', SentenceCache(maxsize=2, path=path, version='1').get('दो'))
+            self.assertIsNone(SentenceCache(maxsize=2, path=path, version='2').get('दो'))
+
+    def test_outputs_are_kept_apart_per_output_setting(self):
+        calls = []
+
+        def compute(texts):
+            calls.append(texts)
+            return [os.environ.get('ITN_DIGIT_SEPARATOR', '') for _ in texts]
+
+        with mock.patch.dict(os.environ, {'ITN_DIGIT_SEPARATOR': ','}):
+            comma = sentence_cache.cached('settings_test', ['दो'], compute)
+            comma_key = sentence_cache.settings_key()
+        with mock.patch.dict(os.environ, {'ITN_DIGIT_SEPARATOR': ' '}):
+            space = sentence_cache.cached('settings_test', ['दो'], compute)
+            space_key = sentence_cache.settings_key()
+
+        self.assertEqual(([','], [' ']), (comma, space))
+        self.assertEqual([['दो'], ['दो']], calls)
+        # persisted as settings_test.<settings>.json
+        self.assertNotEqual(comma_key, space_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import unittest
+
+from inverse_text_normalization import postprocess, sentence_cache, sentence_errors, sentence_limits
+from inverse_text_normalization.sentence_errors import ERROR, LIMIT, OK, ItemResult
+
+
+def normalize(text):
+    if 'bad' in text:
+        raise ValueError()
+    return text.upper()
+
+
+class SentenceErrorsTests(unittest.TestCase):
+
+    def test_failed_sentences_pass_through_unchanged(self):
+        data = ['one 007', 'bad 007', 'two']
+        expected_output = [ItemResult('one 007', 'ONE 007'), ItemResult('bad 007', 'bad 007', ERROR, 'ValueError'),
+                           ItemResult('two', 'TWO')]
+
+        self.assertEqual(expected_output, sentence_errors.normalize_items(data, 'errors_test', normalize))
+        self.assertEqual({'errors_test': {'ValueError': 1}}, sentence_errors.metrics('errors_test'))
+        self.assertEqual([{'error': 'ValueError', 'text': 'bad 007'}], sentence_errors.samples('errors_test'))
+
+    def test_errors_of_a_batch_are_summarized(self):
+        results = sentence_errors.normalize_items(['a', 'bad 1', 'b', 'bad 2'], 'summary_test', normalize)
+
+        report = sentence_errors.summarize(results, max_samples=1)
+
+        self.assertEqual({'sentences': 4, 'errors': 2, 'limits': 0, 'error_types': {'ValueError': 2},
+                          'samples': [{'error': 'ValueError', 'text': 'bad 1'}]}, report)
+
+    def test_only_normalized_sentences_are_post_processed(self):
+        results = [ItemResult('007', '007'), ItemResult('bad 007', 'bad 007', ERROR, 'ValueError')]
+
+        processed = postprocess.postprocess_results(['007', 'bad 007'], results, 'hi')
+
+        self.assertEqual(['7', 'bad 007'], [result.output for result in processed])
+
+    def test_failed_sentences_are_not_cached(self):
+        calls = []
+
+        def compute(texts):
+            calls.extend(texts)
+            return sentence_errors.normalize_items(texts, 'cache_test', normalize)
+
+        sentence_cache.cached_results('cache_test', ['ok', 'bad'], compute)
+        results = sentence_cache.cached_results('cache_test', ['ok', 'bad'], compute)
+
+        self.assertEqual(['ok', 'bad', 'bad'], calls)
+        self.assertEqual([OK, ERROR], [result.status for result in results])
+
+    def test_sentences_over_a_limit_are_not_cached(self):
+        calls = []
+
+        def over_limit(text, budget):
+            raise sentence_limits.LimitExceeded('seconds', 9.0)
+
+        def normalize_text(text):
+            return sentence_limits.normalize_within_limits(text, 'limit_cache_test', over_limit)
+
+        def compute(texts):
+            calls.extend(texts)
+            return sentence_errors.normalize_items(texts, 'limit_cache_test', normalize_text)
+
+        sentence_cache.cached_results('limit_cache_test', ['दो  सौ'], compute)
+        results = sentence_cache.cached_results('limit_cache_test', ['दो  सौ'], compute)
+
+        self.assertEqual(['दो  सौ', 'दो  सौ'], calls)
+        self.assertEqual([ItemResult('दो  सौ', 'दो सौ', LIMIT, 'LimitExceeded: seconds 9.0 over the limit of 5')],
+                         results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import os
+import time
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import sentence_limits
+
+
+class _Lattice:
+
+    def __init__(self, states, arcs_per_state=1):
+        self.states_count = states
+        self.arcs_per_state = arcs_per_state
+        self.arcs_counted = 0
+
+    def num_states(self):
+        return self.states_count
+
+    def states(self):
+        return range(self.states_count)
+
+    def num_arcs(self, state):
+        self.arcs_counted += 1
+        return self.arcs_per_state
+
+
+def upper_with_lattice(text, budget):
+    # one lattice state per character
+    budget.check_lattice(_Lattice(len(text)))
+    return text.upper()
+
+
+class SentenceLimits(unittest.TestCase):
+
+    def test_sentences_within_the_limits_are_normalized(self):
+        self.assertEqual('दस लाख', sentence_limits.normalize_within_limits('दस लाख', 'limits_ok', lambda t, b: t))
+        self.assertEqual({}, sentence_limits.metrics('limits_ok'))
+
+    @mock.patch.dict(os.environ, {'ITN_MAX_INPUT_CHARS': '20', 'ITN_LIMIT_CHUNK_WORDS': '3'})
+    def test_long_input_is_normalized_in_chunks(self):
+        text = 'one two three four five six seven'
+
+        output = sentence_limits.normalize_within_limits(text, 'limits_chunk', upper_with_lattice)
+
+        self.assertEqual('ONE TWO THREE FOUR FIVE SIX SEVEN', output)
+        self.assertEqual(1, sentence_limits.metrics('limits_chunk')['limits_chunk']['input_chars'])
+        self.assertEqual(text, sentence_limits.samples('limits_chunk')[0]['text'])
+
+    @mock.patch.dict(os.environ, {'ITN_MAX_LATTICE_STATES': '10', 'ITN_LIMIT_FALLBACK': 'identity'})
+    def test_large_lattice_falls_back_to_identity(self):
+        output = sentence_limits.normalize_within_limits('a  long sentence', 'limits_identity', upper_with_lattice)
+
+        self.assertEqual('a long sentence', output)
+        self.assertEqual(1, sentence_limits.metrics('limits_identity')['limits_identity']['lattice_states'])
+
+    @mock.patch.dict(os.environ, {'ITN_MAX_LATTICE_ARCS': '10', 'ITN_LIMIT_CHUNK_WORDS': '2'})
+    def test_chunks_over_a_limit_are_copied(self):
+        def normalize(text, budget):
+            budget.check_lattice(_Lattice(1, arcs_per_state=len(text)))
+            return text.upper()
+
+        output = sentence_limits.normalize_within_limits('ab cd efghij klmnop', 'limits_arcs', normalize)
+
+        self.assertEqual('AB CD efghij klmnop', output)
+        self.assertEqual(2, sentence_limits.metrics('limits_arcs')['limits_arcs']['lattice_arcs'])
+
+    @mock.patch.dict(os.environ, {'ITN_MAX_LATTICE_ARCS': '100'})
+    def test_arcs_are_only_counted_when_the_grammar_bound_is_over_the_limit(self):
+        grammar = _Lattice(3, arcs_per_state=5)
+        budget = sentence_limits.Budget('limits_bound')
+        small, large = _Lattice(20, arcs_per_state=5), _Lattice(30, arcs_per_state=5)
+
+        budget.check_lattice(small, grammar)
+        with self.assertRaises(sentence_limits.LimitExceeded):
+            budget.check_lattice(large, grammar)
+
+        self.assertEqual(0, small.arcs_counted)
+        self.assertEqual(30, large.arcs_counted)
+        self.assertEqual(3, grammar.arcs_counted)
+
+    @mock.patch.dict(os.environ, {'ITN_MAX_NUMBER_WORDS': '3', 'ITN_LIMIT_FALLBACK': 'identity'})
+    def test_runs_of_number_words_are_stopped_before_the_tagger(self):
+        calls = []
+
+        def normalize(text, budget):
+            calls.append(text)
+            return text
+
+        with sentence_limits.tracked_trips() as trips:
+            output = sentence_limits.normalize_within_limits('दो सौ तीन हज़ार चार', 'hi', normalize)
+
+        self.assertEqual('दो सौ तीन हज़ार चार', output)
+        self.assertEqual([], calls)
+        self.assertEqual(['number_words'], [trip.name for trip in trips])
+
+    @mock.patch.dict(os.environ, {'ITN_SENTENCE_TIME_BUDGET': '0.01', 'ITN_LIMIT_FALLBACK': 'identity'})
+    def test_slow_sentence_exceeds_the_time_budget(self):
+        def normalize(text, budget):
+            time.sleep(0.02)
+            budget.check_time()
+            return text.upper()
+
+        self.assertEqual('slow', sentence_limits.normalize_within_limits('slow', 'limits_time', normalize))
+        self.assertEqual(1, sentence_limits.metrics('limits_time')['limits_time']['seconds'])
+
+
+if __name__ == '__main__':
+    unittest.main()
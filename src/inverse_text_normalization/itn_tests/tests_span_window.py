@@ -0,0 +1,106 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import os
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import sentence_limits
+from inverse_text_normalization.span_window import candidate_spans, clear_span_cache, normalize_spans, \
+    span_cache_metrics, span_normalizer
+
+
+class SpanWindow(unittest.TestCase):
+
+    def setUp(self):
+        clear_span_cache()
+
+    def test_trigger_words_are_widened_by_context_and_merged(self):
+        words = 'he said twenty one dogs ate five cakes today'.split()
+
+        self.assertEqual([(1, 8)], candidate_spans(words, 'en', context=1))
+        self.assertEqual([(2, 4), (6, 7)], candidate_spans(words, 'en', context=0))
+
+    def test_only_spans_are_normalized_and_spliced_back(self):
+        spans = []
+
+        def normalize(span):
+            spans.append(span)
+            return f'<{span}>'
+
+        output = normalize_spans('मुझे दो सौ पानी की बोतल दो', 'hi', normalize, context=0)
+
+        self.assertEqual(['दो सौ', 'दो'], spans)
+        self.assertEqual('मुझे <दो सौ> पानी की बोतल <दो>', output)
+
+    def test_repeated_spans_skip_normalization(self):
+        spans = []
+
+        def normalize(span):
+            spans.append(span)
+            return f'<{span}>'
+
+        normalize_spans('मेरे पास दस लाख लोग हैं', 'hi', normalize, context=0)
+        hits = span_cache_metrics()['hi']['hits']
+        output = normalize_spans('उसने दस लाख कमाए', 'hi', normalize, context=0)
+
+        self.assertEqual(['दस लाख'], spans)
+        self.assertEqual('उसने <दस लाख> कमाए', output)
+        self.assertEqual(hits + 1, span_cache_metrics()['hi']['hits'])
+
+    def test_runs_hit_next_to_other_words(self):
+        spans = []
+
+        def normalize(span):
+            spans.append(span)
+            return span.replace('दस लाख', '<दस लाख>')
+
+        normalize_spans('मेरे पास दस लाख हैं', 'hi', normalize, context=1)
+        normalize_spans('उसने दो कमाए', 'hi', normalize, context=1)
+        output = normalize_spans('उसने दस लाख कमाए', 'hi', normalize, context=1)
+
+        self.assertEqual(['पास दस लाख हैं', 'उसने दो कमाए'], spans)
+        self.assertEqual('उसने <दस लाख> कमाए', output)
+
+    def test_context_words_the_grammars_consume_stay_in_the_key(self):
+        spans = []
+
+        def normalize(span):
+            spans.append(span)
+            return span.replace('लगभग ', '~')
+
+        normalize_spans('उसने लगभग दस कमाए', 'hi', normalize, context=1)
+        normalize_spans('उसने दस कमाए', 'hi', normalize, context=1)
+        output = normalize_spans('हमने लगभग दस कमाए', 'hi', normalize, context=1)
+
+        self.assertEqual(['लगभग दस कमाए', 'उसने दस कमाए'], spans)
+        self.assertEqual('हमने ~दस कमाए', output)
+
+    def test_chunks_are_normalized_span_by_span_by_default(self):
+        def normalize(span):
+            return f'<{span}>'
+
+        with mock.patch.dict(os.environ, {'ITN_SPAN_CONTEXT': '0'}):
+            self.assertEqual('मुझे <दो सौ> पानी', span_normalizer('hi', normalize)('मुझे दो सौ पानी'))
+        with mock.patch.dict(os.environ, {'ITN_SPAN_WINDOW': '0'}):
+            self.assertIs(normalize, span_normalizer('hi', normalize))
+
+    def test_spans_over_a_limit_are_not_cached(self):
+        spans = []
+
+        def over_limit(text, budget):
+            raise sentence_limits.LimitExceeded('seconds', 9.0)
+
+        def normalize(span):
+            spans.append(span)
+            return sentence_limits.normalize_within_limits(span, 'hi', over_limit)
+
+        normalize_spans('मेरे पास दस लाख लोग हैं', 'hi', normalize, context=0)
+        normalize_spans('उसने दस लाख कमाए', 'hi', normalize, context=0)
+
+        self.assertEqual(['दस लाख', 'दस लाख'], spans)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+'''
+Please move this file to src/ before running the tests
+'''
+
+import unittest
+from collections import OrderedDict
+
+from inverse_text_normalization.benchmarks.token_parser import CLASS_TOKENS, CharTokenParser, tagged_sentences
+from inverse_text_normalization.token_parser import TokenParser
+
+
+def parse(parser, tagged_text):
+    parser(tagged_text)
+    return parser.parse()
+
+
+class TokenParserTests(unittest.TestCase):
+
+    def test_tokens_are_parsed_into_nested_dictionaries(self):
+        text = 'tokens { name: "its" } tokens { measure { cardinal { integer: "12" } units: "kg" } }'
+        expected_output = [OrderedDict([('tokens', OrderedDict([('name', 'its')]))]),
+                           OrderedDict([('tokens', OrderedDict([('measure', OrderedDict([
+                               ('cardinal', OrderedDict([('integer', '12')])), ('units', 'kg')]))]))])]
+
+        self.assertEqual(expected_output, parse(TokenParser(), text))
+
+    def test_output_matches_the_per_character_parser(self):
+        data = CLASS_TOKENS + ['tokens { name: "a"b" }  tokens { name: "" }', 'tokens{name:"x" } } tokens { name: "y" }']
+        data += tagged_sentences('hi') + tagged_sentences('ta')
+
+        for text in data:
+            with self.subTest(text=text):
+                self.assertEqual(parse(CharTokenParser(), text), parse(TokenParser(), text))
+
+    def test_malformed_text_raises(self):
+        data = ['tokens { name: "x" ', 'tokens { name: x }', 'tokens { preserve_order: "true" }', 'tokens { name: " x" }']
+
+        for text in data:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse(TokenParser(), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
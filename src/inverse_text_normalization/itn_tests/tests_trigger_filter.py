@@ -0,0 +1,80 @@
+'''
+Please move this file to src/ before running the tests
+
+The differential test loads the WFST grammars of every language and only runs where pynini is installed.
+'''
+
+import importlib
+import os
+import unittest
+from unittest import mock
+
+from inverse_text_normalization import trigger_filter
+from inverse_text_normalization.benchmarks import LANGUAGES, sample_sentences
+from inverse_text_normalization.trigger_filter import TriggerMatcher, get_filter, split_words
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+
+class TriggerFilter(unittest.TestCase):
+
+    def test_matcher_finds_overlapping_triggers(self):
+        matcher = TriggerMatcher(['he', 'she', 'his', 'hers'])
+
+        self.assertEqual([(1, 4), (2, 4), (2, 6)], list(matcher.finditer('ushers')))
+        self.assertFalse(matcher.search('hxsx'))
+
+    def test_number_free_sentences_skip_the_grammars(self):
+        data = ['मुझे  पानी की बोतल चाहिए', 'hello there']
+        expected_output = ['मुझे पानी की बोतल चाहिए', 'hello there']
+
+        self.assertEqual(expected_output, [trigger_filter.skip_grammars(data[0], 'hi'),
+                                           trigger_filter.skip_grammars(data[1], 'en')])
+
+    def test_numbers_digits_and_punctuation_need_the_grammars(self):
+        data = ['मुझे दो सौ पानी की बोतल दो', 'रीटा के पास 16 बिल्लियाँ', 'रीटा के पास बिल्लियाँ हैं।']
+
+        self.assertEqual([None, None, None], [trigger_filter.skip_grammars(text, 'hi') for text in data])
+
+    def test_letters_only_trigger_as_whole_words(self):
+        self.assertIsNone(trigger_filter.skip_grammars('i have a dog', 'en'))
+        self.assertEqual('what time is it now', trigger_filter.skip_grammars('what time is it now', 'en'))
+
+    def test_words_the_tagger_changes_trigger(self):
+        def tag_word(word):
+            return 'tokens { name: "डॉ." }' if word == 'डॉक्टर' else f'tokens {{ name: "{word}" }}'
+
+        with mock.patch.dict(trigger_filter._taggers, {'hi': tag_word}):
+            trigger_filter.clear('hi')
+            self.addCleanup(trigger_filter.clear, 'hi')
+
+            self.assertIsNone(trigger_filter.skip_grammars('डॉक्टर  से मिलो', 'hi'))
+            self.assertEqual('पानी की बोतल', trigger_filter.skip_grammars('पानी की बोतल', 'hi'))
+            self.assertEqual([True, False, False], get_filter('hi').trigger_tokens(['डॉक्टर', 'से', 'मिलो']))
+
+    @unittest.skipUnless(PYNINI_AVAILABLE, 'the differential test needs pynini')
+    def test_fast_path_output_matches_the_grammars_in_every_language(self):
+        for lang in LANGUAGES:
+            module = importlib.import_module(f'inverse_text_normalization.{lang}.inverse_normalize')
+            words = [word for sentence in sample_sentences(lang) for word in split_words(sentence)]
+            plain = list(dict.fromkeys(w for w, is_trigger in zip(words, get_filter(lang).trigger_tokens(words))
+                                       if not is_trigger))
+            data = [' '.join(plain[i:i + 6]) for i in range(0, len(plain), 6)]
+            fast_path = {text: trigger_filter.skip_grammars(text, lang) for text in data}
+            # whole sentences through the grammars, spans would be cut by the same triggers
+            with mock.patch.dict(os.environ, {'ITN_TRIGGER_PREFILTER': '0', 'ITN_SPAN_WINDOW': '0'}):
+                expected_output = {text: module.inverse_normalize(text, verbose=False)
+                                   for text, output in fast_path.items() if output is not None}
+
+            with self.subTest(lang=lang):
+                self.assertTrue(expected_output)
+                self.assertEqual(expected_output, {text: fast_path[text] for text in expected_output})
+
+
+if __name__ == '__main__':
+    unittest.main()
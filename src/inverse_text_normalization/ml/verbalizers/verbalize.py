@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from inverse_text_normalization.grammar_registry import build_grammar
 from inverse_text_normalization.ml.graph_utils import GraphFst
 from inverse_text_normalization.ml.verbalizers.cardinal import CardinalFst
 from inverse_text_normalization.ml.verbalizers.date import DateFst
@@ -31,13 +32,13 @@ class VerbalizeFst(GraphFst):
 
     def __init__(self):
         super().__init__(name="verbalize", kind="verbalize")
-        cardinal = CardinalFst().fst
-        ordinal = OrdinalFst().fst
-        decimal = DecimalFst().fst
-        measure = MeasureFst().fst
-        time = TimeFst().fst
-        date = DateFst().fst
-        money = MoneyFst().fst
-        whitelist = WhiteListFst().fst
+        cardinal = build_grammar(CardinalFst).fst
+        ordinal = build_grammar(OrdinalFst).fst
+        decimal = build_grammar(DecimalFst).fst
+        measure = build_grammar(MeasureFst).fst
+        time = build_grammar(TimeFst).fst
+        date = build_grammar(DateFst).fst
+        money = build_grammar(MoneyFst).fst
+        whitelist = build_grammar(WhiteListFst).fst
         graph = time | date | money | measure | ordinal | decimal | cardinal | whitelist
         self.fst = graph
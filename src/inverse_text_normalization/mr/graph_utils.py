@@ -16,6 +16,9 @@
 import os
 import string
 from pathlib import Path
+
+from inverse_text_normalization import plural_utils
+from inverse_text_normalization.grammar_cache import far_path, grammar_hash, load_far, save_far
 # from inverse_text_normalization.lang_params import LANG
 # lang_data_path = f'inverse_text_normalization/data/{LANG}_data/'
 data_path = 'data/'
@@ -23,8 +26,6 @@ data_path = 'data/'
 try:
     import pynini
     from inverse_text_normalization.mr.data_loader_utils import get_abs_path
-    from pynini import Far
-    from pynini.examples import plurals
     from pynini.lib import byte, pynutil, utf8
 
     NEMO_CHAR = utf8.VALID_UTF8_CHAR
@@ -50,22 +51,6 @@ try:
     insert_space = pynutil.insert(" ")
     delete_extra_space = pynini.cross(pynini.closure(NEMO_WHITE_SPACE, 1), " ")
 
-    suppletive = pynini.string_file(get_abs_path(data_path + 'suppletive.tsv'))
-    # _v = pynini.union("a", "e", "i", "o", "u")
-    _c = pynini.union(
-        "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "t", "v", "w", "x", "y", "z"
-    )
-    _ies = NEMO_SIGMA + _c + pynini.cross("y", "ies")
-    _es = NEMO_SIGMA + pynini.union("s", "sh", "ch", "x", "z") + pynutil.insert("es")
-    _s = NEMO_SIGMA + pynutil.insert("s")
-
-    graph_plural = plurals._priority_union(
-        suppletive, plurals._priority_union(_ies, plurals._priority_union(_es, _s, NEMO_SIGMA), NEMO_SIGMA), NEMO_SIGMA
-    ).optimize()
-
-    SINGULAR_TO_PLURAL = graph_plural
-    PLURAL_TO_SINGULAR = pynini.invert(graph_plural)
-
     PYNINI_AVAILABLE = True
 except (ModuleNotFoundError, ImportError):
     # Create placeholders
@@ -92,19 +77,20 @@ except (ModuleNotFoundError, ImportError):
     insert_space = None
     delete_extra_space = None
 
-    suppletive = None
-    # _v = pynini.union("a", "e", "i", "o", "u")
-    _c = None
-    _ies = None
-    _es = None
-    _s = None
+    PYNINI_AVAILABLE = False
 
-    graph_plural = None
+# English plural/singular transducers, built on first access and shared by all languages
+_LAZY_PLURALS = {
+    "SINGULAR_TO_PLURAL": plural_utils.singular_to_plural,
+    "graph_plural": plural_utils.singular_to_plural,
+    "PLURAL_TO_SINGULAR": plural_utils.plural_to_singular,
+}
 
-    SINGULAR_TO_PLURAL = None
-    PLURAL_TO_SINGULAR = None
 
-    PYNINI_AVAILABLE = False
+def __getattr__(name):
+    if name in _LAZY_PLURALS:
+        return _LAZY_PLURALS[name](get_abs_path(data_path + 'suppletive.tsv')) if PYNINI_AVAILABLE else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_plurals(fst):
@@ -116,7 +102,7 @@ def get_plurals(fst):
 
     Returns plurals to given singular forms
     """
-    return SINGULAR_TO_PLURAL @ fst
+    return plural_utils.singular_to_plural(get_abs_path(data_path + 'suppletive.tsv')) @ fst
 
 
 def get_singulars(fst):
@@ -128,7 +114,7 @@ def get_singulars(fst):
 
     Returns singulars to given plural forms
     """
-    return PLURAL_TO_SINGULAR @ fst
+    return plural_utils.plural_to_singular(get_abs_path(data_path + 'suppletive.tsv')) @ fst
 
 
 def convert_space(fst) -> 'pynini.FstLike':
@@ -156,12 +142,12 @@ class GraphFst:
 
     def __init__(self, name: str, kind: str):
         self.name = name
-        self.kind = str
+        self.kind = kind
         self._fst = None
 
-        self.far_path = Path(os.path.dirname(__file__) + '/grammars/' + kind + '/' + name + '.far')
+        self.far_path = far_path(os.path.dirname(__file__), kind, name)
         if self.far_exist():
-            self._fst = Far(self.far_path, mode="r", arc_type="standard", far_type="default").get_fst()
+            self._fst = load_far(self.far_path, grammar_hash(os.path.dirname(__file__)))
 
     def far_exist(self) -> bool:
         """
@@ -169,6 +155,12 @@ class GraphFst:
         """
         return self.far_path.exists()
 
+    def export_far(self):
+        """
+        Exports fst to FAR, keyed by the current grammar version of the language
+        """
+        save_far(self.far_path, self.fst, grammar_hash(os.path.dirname(__file__)))
+
     @property
     def fst(self) -> 'pynini.FstLike':
         return self._fst
@@ -0,0 +1,286 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+'''
+Written form rendered in Python from the parsed tagger output, instead of serializing the tokens again and
+composing them with VerbalizeFinalFst.
+
+`<lang>/verbalizers` only strip the class wrappers and field names, join the fields and add a few characters
+(sign, decimal point, ordinal suffix, leading zero of the hours), so every class of the verbalizers is rendered
+here from the dictionaries of TokenParser: cardinal, ordinal, decimal, measure, money (not in hi and en, whose
+VerbalizeFst leaves it out), time, date, whitelist, word and punctuation. A token is only rendered when the
+verbalizer FST would accept it, with the fields in the order the permutation loop would find, and gives the
+same output; a sentence with any other token (fraction, unexpected fields or values) returns None and goes
+through the verbalizer FST as before. Set ITN_NATIVE_VERBALIZER=0 to always use the FST.
+'''
+
+PRESERVE_ORDER_KEY = "preserve_order"
+FIELD_ORDER_KEY = "field_order"
+NON_BREAKING_SPACE = u"\u00A0"
+DIGITS = "0123456789"
+
+# verbalizers/verbalize.py of these language packages leave money out
+LANGUAGES_WITHOUT_MONEY = ("hi", "en")
+
+# field orders accepted by verbalizers/date.py, before any preserve_order and field_order
+DATE_ORDERS = {
+    ("month",),
+    ("month", "day"),
+    ("month", "year"),
+    ("month", "day", "year"),
+    ("year",),
+    ("day", "month"),
+    ("day", "month", "year"),
+}
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    """
+    Returns whether the native verbalizer is on, set ITN_NATIVE_VERBALIZER=0 to turn it off
+    """
+    return os.environ.get("ITN_NATIVE_VERBALIZER", "1") != "0"
+
+
+def _is_value(v) -> bool:
+    # the verbalizers read field values up to the closing quote
+    return isinstance(v, str) and '"' not in v
+
+
+def _fields(d: OrderedDict, fields: Tuple[str, ...], required: Tuple[str, ...] = ()) -> Optional[Dict[str, str]]:
+    """
+    Returns the string fields of a token whose verbalizer accepts them only in the order of fields,
+    None if the token has other fields or values, or lacks a required field
+    """
+    if PRESERVE_ORDER_KEY in d or not set(d).issubset(fields) or not set(required).issubset(d):
+        return None
+    if not all(_is_value(v) for v in d.values()):
+        return None
+    return d
+
+
+def _no_space(v: str) -> bool:
+    return " " not in v
+
+
+def _numbers(fields: Dict[str, str]) -> str:
+    """
+    Renders integer_part, fractional_part and quantity as `numbers` of verbalizers/decimal.py, without the sign
+    """
+    output = fields.get("integer_part", "")
+    if "fractional_part" in fields:
+        output += "." + fields["fractional_part"]
+    if "quantity" in fields:
+        output += " " + fields["quantity"]
+    return output
+
+
+def _signed_numbers(d: OrderedDict, sign: str) -> Optional[str]:
+    """
+    Renders negative, integer_part, fractional_part and quantity as verbalizers/decimal.py
+    """
+    fields = _fields(d, ("negative", "integer_part", "fractional_part", "quantity"))
+    if fields is None or fields.get("negative", sign) != sign:
+        return None
+    return ("-" if "negative" in fields else "") + _numbers(fields)
+
+
+def _cardinal(d: OrderedDict) -> Optional[str]:
+    fields = _fields(d, ("negative", "integer"), required=("integer",))
+    if fields is None or len(fields.get("negative", "-")) != 1:
+        return None
+    return fields.get("negative", "") + fields["integer"]
+
+
+def _ordinal(d: OrderedDict) -> Optional[str]:
+    fields = _fields(d, ("integer",), required=("integer",))
+    if fields is None:
+        return None
+    integer = fields["integer"]
+    if integer.endswith(("11", "12", "13")):
+        return integer + "th"
+    return integer + {"1": "st", "2": "nd", "3": "rd"}.get(integer[-1], "th")
+
+
+def _decimal(d: OrderedDict) -> Optional[str]:
+    return _signed_numbers(d, "true")
+
+
+def _measure(d: OrderedDict) -> Optional[str]:
+    if set(d) not in ({"cardinal", "units"}, {"decimal", "units"}) or not isinstance(d["units"], str):
+        return None
+    if not _is_value(d["units"]) or not _no_space(d["units"]):
+        return None
+    if "cardinal" in d:
+        number = d["cardinal"]
+        if not isinstance(number, OrderedDict):
+            return None
+        fields = _fields(number, ("negative", "integer"), required=("integer",))
+        if fields is None or fields.get("negative", "true") != "true":
+            return None
+        number = ("-" if "negative" in fields else "") + fields["integer"]
+    else:
+        number = _signed_numbers(d["decimal"], "true") if isinstance(d["decimal"], OrderedDict) else None
+        if number is None:
+            return None
+    return number + " " + d["units"]
+
+
+def _money(d: OrderedDict) -> Optional[str]:
+    # verbalizers/money.py takes decimal.numbers, which has no sign: a negative amount needs the FST
+    if "negative" in d:
+        return None
+    fields = _fields(d, ("currency", "integer_part", "fractional_part", "quantity"), required=("currency",))
+    if fields is None or not _no_space(fields["currency"]):
+        return None
+    return fields["currency"] + _numbers(fields)
+
+
+def _time(d: OrderedDict) -> Optional[str]:
+    fields = _fields(d, ("hours", "minutes", "suffix", "zone"), required=("hours", "minutes"))
+    if fields is None:
+        return None
+    hours, minutes = fields["hours"], fields["minutes"]
+    for number in (hours, minutes):
+        if not 1 <= len(number) <= 2 or any(c not in DIGITS for c in number):
+            return None
+    output = hours.zfill(2) + ":" + minutes.zfill(2)
+    for key in ("suffix", "zone"):
+        if key in fields:
+            if not _no_space(fields[key]):
+                return None
+            output += " " + fields[key]
+    return output
+
+
+def _date_order(order: Tuple[str, ...]) -> bool:
+    main = tuple(k for k in order if k not in (PRESERVE_ORDER_KEY, FIELD_ORDER_KEY))
+    return order[: len(main)] == main and main in DATE_ORDERS
+
+
+def _date(d: OrderedDict) -> Optional[str]:
+    for k, v in d.items():
+        if k == PRESERVE_ORDER_KEY:
+            if v is not True:
+                return None
+        elif k not in ("day", "month", "year", FIELD_ORDER_KEY) or not _is_value(v):
+            return None
+    if FIELD_ORDER_KEY in d and len(d[FIELD_ORDER_KEY]) != 1:
+        return None
+    # verbalizers/date.py may delete trailing whitespace of the year
+    if "year" in d and d["year"] != d["year"].rstrip(" \t\n\r" + NON_BREAKING_SPACE):
+        return None
+    if PRESERVE_ORDER_KEY in d:
+        orders = [tuple(d)]
+    else:
+        orders = itertools.permutations(d)
+    for order in orders:
+        if _date_order(order):
+            return " ".join(d[k] for k in order if k not in (PRESERVE_ORDER_KEY, FIELD_ORDER_KEY))
+    return None
+
+
+CLASSES: Dict[str, Callable[[OrderedDict], Optional[str]]] = {
+    "cardinal": _cardinal,
+    "ordinal": _ordinal,
+    "decimal": _decimal,
+    "measure": _measure,
+    "money": _money,
+    "time": _time,
+    "date": _date,
+}
+
+
+def verbalize_token(token: dict, lang: str) -> Optional[str]:
+    """
+    Renders one parsed token, e.g. {'tokens': {'cardinal': {'integer': '420'}}} -> 420
+
+    Args:
+        token: dictionary of TokenParser
+        lang: language package, e.g. 'hi'
+
+    Returns written form, None if the token needs the verbalizer FST
+    """
+    if list(token) != ["tokens"] or not isinstance(token["tokens"], OrderedDict):
+        return None
+    d = token["tokens"]
+    if set(d) == {"name"}:
+        # word and whitelist
+        if not _is_value(d["name"]) or not _no_space(d["name"]):
+            return None
+        return d["name"].replace(NON_BREAKING_SPACE, " ")
+    if set(d) == {"name", "pause_length"}:
+        # punctuation keeps non-breaking spaces
+        if not _is_value(d["name"]) or not _is_value(d["pause_length"]) or "}" in d["pause_length"]:
+            return None
+        return d["name"]
+    if len(d) != 1:
+        return None
+    (name, fields), = d.items()
+    if name not in CLASSES or not isinstance(fields, OrderedDict):
+        return None
+    if name == "money" and lang in LANGUAGES_WITHOUT_MONEY:
+        return None
+    output = CLASSES[name](fields)
+    if output is None:
+        return None
+    return output.replace(NON_BREAKING_SPACE, " ")
+
+
+def verbalize(tokens: List[dict], lang: str) -> Optional[str]:
+    """
+    Renders the parsed tagger output of a sentence, as VerbalizeFinalFst would
+
+    Args:
+        tokens: parsed tagger output
+        lang: language package, e.g. 'hi'
+
+    Returns written form, None if some token needs the verbalizer FST
+    """
+    if not enabled():
+        return None
+    outputs = []
+    for token in tokens:
+        output = verbalize_token(token, lang)
+        if output is None:
+            _count(lang, "fst")
+            return None
+        outputs.append(output)
+    _count(lang, "native")
+    return " ".join(outputs)
+
+
+def _count(lang: str, key: str):
+    with _stats_lock:
+        counts = _stats.setdefault(lang, {"native": 0, "fst": 0})
+        counts[key] += 1
+
+
+def stats(lang: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Returns sentences rendered natively and sentences sent to the verbalizer FST, per language package
+
+    Args:
+        lang: only this language package
+    """
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items() if lang is None or k == lang}
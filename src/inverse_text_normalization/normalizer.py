@@ -0,0 +1,95 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+from typing import List
+
+from inverse_text_normalization import run_predict
+from inverse_text_normalization.sentence_errors import ItemResult
+
+'''
+Inverse text normalization of one language as an object that threads can share, e.g. to serve concurrent
+requests from a thread pool:
+
+    normalizer = InverseNormalizer('hi')
+    with ThreadPoolExecutor(8) as pool:
+        outputs = list(pool.map(normalizer.normalize, sentences))
+
+An InverseNormalizer holds no grammars of its own: it wraps run_predict and the module globals of the language
+package, so all normalizers of a language in a process share the one tagger and verbalizer pair, loaded once and
+only read while normalizing, and a lexicon reload swaps that pair for all of them. Everything a sentence needs while it is normalized (the parsed tagger output, the
+lattices) is local to the call, and the caches and counters on the way are guarded by locks. Whether threads
+also compose in parallel depends on the pynini build releasing the GIL in compose and shortestpath;
+`python -m inverse_text_normalization.benchmarks.threads` measures the scaling.
+'''
+
+
+class InverseNormalizer:
+    """
+    Thread-safe inverse text normalization of one language
+
+    Args:
+        lang: language code, e.g. 'hi', 'or'
+    """
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        # compiles (or loads) the grammars on first use in this process
+        run_predict.get_itn(lang)
+        package = run_predict.ITN_LANGUAGE_PACKAGES[lang]
+        self._grammars = importlib.import_module(f"inverse_text_normalization.{package}.inverse_normalize")
+
+    def normalize(self, text: str) -> str:
+        """
+        Normalizes one sentence, as run_predict.inverse_normalize_text
+
+        Args:
+            text: sentence
+
+        Returns written form
+        """
+        return self.normalize_list([text])[0]
+
+    def normalize_list(self, texts: List[str]) -> List[str]:
+        """
+        Normalizes a list of sentences, as run_predict.inverse_normalize_text
+
+        Args:
+            texts: sentences
+
+        Returns outputs in the order of texts
+        """
+        return run_predict.inverse_normalize_text(texts, self.lang)
+
+    def normalize_results(self, texts: List[str]) -> List[ItemResult]:
+        """
+        Normalizes a list of sentences with a result per sentence, as run_predict.inverse_normalize_results
+
+        Args:
+            texts: sentences
+
+        Returns results in the order of texts
+        """
+        return run_predict.inverse_normalize_results(texts, self.lang)
+
+    def inverse_normalize(self, text: str) -> str:
+        """
+        Normalizes one sentence with the grammars only, without removing leading zeros or formatting numbers
+
+        Args:
+            text: sentence
+
+        Returns written form
+        """
+        return self._grammars.inverse_normalize(text, verbose=False)
@@ -0,0 +1,375 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import string
+import threading
+from argparse import ArgumentParser
+from typing import Dict, List, Optional, Tuple
+
+'''
+Pure-Python inverse text normalization of numbers, used by `<lang>/inverse_normalize.py` when pynini
+is not installed.
+
+The tables of `<lang>/data/numbers` (and `data/ordinals`) are read into dictionaries, and spoken
+cardinals (with hundred/thousand/lakh/crore magnitudes), decimals and ordinals are converted to digits
+the way the cardinal, decimal and ordinal grammars do. Every other word is left unchanged, so money,
+measure, date and time expressions are not converted without pynini.
+
+    python -m inverse_text_normalization.number_fallback --lang hi "चार हज़ार चार सौ बीस"
+'''
+
+logger = logging.getLogger(__name__)
+
+HUNDRED, THOUSAND, LAKH, CRORE = 100, 1000, 100000, 10000000
+
+# Words that <lang>/taggers/cardinal.py and decimal.py spell out in code rather than read from data/numbers.
+# Languages without magnitude words here read them from numbers/{hundred,thousands,lakh,crore}.tsv,
+# languages without a point word from numbers/decimal.tsv.
+GRAMMAR_WORDS = {
+    "hi": {
+        HUNDRED: ["सौ", "हंड्रेड", "हन्ड्रड"],
+        THOUSAND: ["थाउज़न्ड", "हज़ार", "थाउज़ेंड", "हजार", "थाउजेंड"],
+        LAKH: ["लाख", "लैक", "लेक"],
+        CRORE: ["करोड़", "क्रोर"],
+        "and": ["एंड"],
+        "point": ["दशमलव"],
+    },
+    "en": {
+        HUNDRED: ["hundred", "hundreds"],
+        THOUSAND: ["thousand", "thousands"],
+        LAKH: ["lakh", "lakhs"],
+        CRORE: ["crore", "crores"],
+        "and": ["and"],
+        "point": ["point"],
+    },
+    "mr": {
+        HUNDRED: ["शंभर", "शे", "हंड्रेड", "हन्ड्रड"],
+        THOUSAND: ["थाउज़न्ड", "हज़ार", "थाउज़ेंड", "हजार", "थाउजेंड"],
+        LAKH: ["लाख", "लैक", "लेक", "लक्ष"],
+        CRORE: ["कोटी", "क्रोर"],
+        "and": ["एंड"],
+    },
+    "ori": {
+        HUNDRED: ["ଶହେ", "ଶହ"],
+        THOUSAND: ["ହଜାର", "ଥାଉଜେଣ୍ଡ"],
+        LAKH: ["ଲକ୍ଷ", "ଲକ୍ଷେ", "ଲାଖ୍‌"],
+        CRORE: ["କୋଟି", "କ୍ରୋର"],
+        "and": ["ଆଣ୍ଡ"],
+        "point": ["દશાંશ"],
+    },
+    "ta": {
+        HUNDRED: ["ஹண்ட்ரட்‌", "ஹண்ட்ரெட்‌", "ஹன்ட்ரட்‌", "ஹன்ட்ரெட்‌"],
+        THOUSAND: ["தவுசண்ட்‌", "தௌசண்ட்‌", "ஆயிரம்"],
+        LAKH: ["லேக்‌", "லாக்‌", "லட்சம்", "லட்சத்து"],
+        CRORE: ["க்ரோர்‌", "கோடி", "கோடியே"],
+        "and": ["அண்ட்‌"],
+        "point": ["દશાંશ"],
+    },
+}
+for _lang in ("gu", "te", "bn", "ml", "asm", "kn"):
+    GRAMMAR_WORDS[_lang] = {"point": ["દશાંશ"]}
+GRAMMAR_WORDS["pa"] = {}
+
+MAGNITUDE_FILES = {HUNDRED: "hundred.tsv", THOUSAND: "thousands.tsv", LAKH: "lakh.tsv", CRORE: "crore.tsv"}
+
+# number tables per language: 1-99 words, words prefixing a hundred (e.g. उन्नीस सौ), and words for whole numbers
+TENS_FILES = {"en": ("teen.tsv",), "ta": ("tens.tsv", "ta_tens.tsv")}
+HUNDRED_PREFIX_FILES = {"hi": ("tens.tsv", "tens-en.tsv"), "en": ("teen.tsv",)}
+WHOLE_NUMBER_FILES = {"ta": ("ta_hundreds.tsv", "ta_exceptions.tsv")}
+# languages whose cardinal grammar composes ties.tsv (twenty -> 2) with a digit
+TIES_LANGUAGES = ("hi", "en", "mr", "ori", "ta")
+
+MINUS_WORDS = ("minus",)
+# split off the end of a number word, e.g. "बीस," -> "बीस" + ","
+TRAILING_PUNCTUATION = string.punctuation
+
+
+def _read_table(path: str) -> Dict[Tuple[str, ...], str]:
+    """
+    Reads a word -> value tsv into a dict keyed by the word split into tokens
+    """
+    table = {}
+    if not os.path.exists(path):
+        return table
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            columns = line.rstrip("\r\n").split("\t")
+            if len(columns) == 1:
+                # a few tables separate the columns with spaces
+                columns = columns[0].rsplit(None, 1)
+            if len(columns) < 2 or not columns[0].strip():
+                continue
+            table.setdefault(tuple(columns[0].split()), columns[-1].strip())
+    return table
+
+
+def _read_words(path: str) -> List[str]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as fp:
+        return [line.split("\t")[0].strip() for line in fp if line.strip()]
+
+
+class NumberLexicon:
+    """
+    Number words of one language package, read from its data tables
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), lang, "data")
+        numbers_dir = os.path.join(data_dir, "numbers")
+        words = GRAMMAR_WORDS.get(lang, {})
+
+        def table(*files: str) -> Dict[Tuple[str, ...], int]:
+            merged = {}
+            for file_name in files:
+                for key, value in _read_table(os.path.join(numbers_dir, file_name)).items():
+                    if value.isdigit():
+                        merged.setdefault(key, int(value))
+            return merged
+
+        self.zero = table("zero.tsv", "ta_zero.tsv" if lang == "ta" else "zero.tsv")
+        self.digit = table("digit.tsv", "ta_digit.tsv" if lang == "ta" else "digit.tsv")
+        self.tens = table(*TENS_FILES.get(lang, ("tens.tsv",)))
+        self.hundred_prefix = table(*HUNDRED_PREFIX_FILES.get(lang, TENS_FILES.get(lang, ("tens.tsv",))))
+        self.ties = table("ties.tsv") if lang in TIES_LANGUAGES else {}
+        self.whole = table(*WHOLE_NUMBER_FILES.get(lang, ()))
+
+        self.magnitudes: Dict[str, int] = {}
+        for value, file_name in MAGNITUDE_FILES.items():
+            for word in words.get(value) or _read_words(os.path.join(numbers_dir, file_name)):
+                self.magnitudes.setdefault(word, value)
+        self.and_words = set(words.get("and", ()))
+        self.point_words = set(words.get("point") or _read_words(os.path.join(numbers_dir, "decimal.tsv")))
+
+        # ordinal word endings rewritten to cardinal word endings, as in taggers/ordinal.py
+        self.ordinal_endings: List[Tuple[str, str]] = []
+        for file_name in ("digit.tsv", "teen.tsv"):
+            for key, value in _read_table(os.path.join(data_dir, "ordinals", file_name)).items():
+                self.ordinal_endings.append((" ".join(key), value))
+        self.ordinal_endings += [("tieth", "ty"), ("th", "")]
+
+        tables = (self.zero, self.digit, self.tens, self.hundred_prefix, self.ties, self.whole)
+        self.max_entry_tokens = max([len(key) for t in tables for key in t] or [1])
+        # words such as छ: that end in punctuation themselves
+        self.words = {word for t in tables for key in t for word in key} | set(self.magnitudes) | self.point_words
+
+    def match(self, table: Dict[Tuple[str, ...], int], tokens: List[str], i: int) -> Optional[Tuple[int, int]]:
+        """
+        Returns (value, end) of the longest table entry starting at tokens[i], None if there is none
+        """
+        for length in range(min(self.max_entry_tokens, len(tokens) - i), 0, -1):
+            value = table.get(tuple(tokens[i : i + length]))
+            if value is not None:
+                return value, i + length
+        return None
+
+
+class NumberParser:
+    """
+    Recursive-descent parser for the spoken number forms of the cardinal, decimal and ordinal grammars
+
+    Args:
+        lexicon: number words of the language
+    """
+
+    def __init__(self, lexicon: NumberLexicon):
+        self.lexicon = lexicon
+
+    def _skip_and(self, tokens: List[str], i: int) -> int:
+        return i + 1 if i < len(tokens) and tokens[i] in self.lexicon.and_words else i
+
+    def _magnitude(self, tokens: List[str], i: int, value: int) -> bool:
+        return i < len(tokens) and self.lexicon.magnitudes.get(tokens[i]) == value
+
+    def _below_hundred(self, tokens: List[str], i: int) -> Optional[Tuple[int, int]]:
+        lexicon = self.lexicon
+        candidates = [lexicon.match(lexicon.tens, tokens, i), lexicon.match(lexicon.digit, tokens, i)]
+        ties = lexicon.match(lexicon.ties, tokens, i)
+        if ties is not None:
+            value, end = ties
+            digit = lexicon.match(lexicon.digit, tokens, end)
+            candidates.append((value * 10 + digit[0], digit[1]) if digit else (value * 10, end))
+        candidates = [c for c in candidates if c is not None]
+        return max(candidates, key=lambda c: c[1]) if candidates else None
+
+    def _below_thousand(self, tokens: List[str], i: int) -> Optional[Tuple[int, int]]:
+        """
+        1-999 and the 'nineteen hundred' form, e.g. चार सौ बीस, उन्नीस सौ, बीस
+        """
+        lexicon = self.lexicon
+        candidates = []
+        for prefix in (lexicon.match(lexicon.digit, tokens, i), lexicon.match(lexicon.hundred_prefix, tokens, i), (1, i)):
+            if prefix is None or not self._magnitude(tokens, prefix[1], HUNDRED):
+                continue
+            end = self._skip_and(tokens, prefix[1] + 1)
+            rest = self._below_hundred(tokens, end)
+            candidates.append((prefix[0] * HUNDRED + rest[0], rest[1]) if rest else (prefix[0] * HUNDRED, prefix[1] + 1))
+        for match in (self._below_hundred(tokens, i), lexicon.match(lexicon.whole, tokens, i)):
+            if match is not None:
+                candidates.append(match)
+        return max(candidates, key=lambda c: c[1]) if candidates else None
+
+    def cardinal(self, tokens: List[str], i: int) -> Optional[Tuple[int, int]]:
+        """
+        Parses a cardinal starting at tokens[i]
+
+        Returns (value, end) of the longest cardinal, None if tokens[i] does not start one
+        """
+        zero = self.lexicon.match(self.lexicon.zero, tokens, i)
+        total, end = 0, i
+        for magnitude in (CRORE, LAKH, THOUSAND):
+            part = self._below_thousand(tokens, end)
+            count, count_end = part if part else (1, end)
+            if self._magnitude(tokens, count_end, magnitude):
+                total += count * magnitude
+                end = self._skip_and(tokens, count_end + 1)
+        part = self._below_thousand(tokens, end)
+        if part is not None:
+            total += part[0]
+            end = part[1]
+        if end == i:
+            return zero
+        # e.g. चार हज़ार करोड़
+        for magnitude in (CRORE, LAKH):
+            if self._magnitude(tokens, end, magnitude):
+                total, end = total * magnitude, end + 1
+                break
+        return total, end
+
+    def decimal(self, tokens: List[str], i: int) -> Optional[Tuple[str, int]]:
+        """
+        Parses a decimal such as 'बारह दशमलव पांच' starting at tokens[i]
+
+        Returns (digits, end), None if tokens[i] does not start a decimal
+        """
+        integer = self.cardinal(tokens, i)
+        integer_digits, end = (str(integer[0]), integer[1]) if integer else ("", i)
+        if end >= len(tokens) or tokens[end] not in self.lexicon.point_words:
+            return None
+        fraction = []
+        end += 1
+        while end < len(tokens):
+            digit = self.lexicon.match(self.lexicon.digit, tokens, end) or self.lexicon.match(
+                self.lexicon.zero, tokens, end
+            )
+            if digit is None:
+                break
+            fraction.append(str(digit[0]))
+            end = digit[1]
+        if not fraction:
+            return None
+        return f"{integer_digits}.{''.join(fraction)}", end
+
+    def ordinal(self, tokens: List[str], i: int) -> Optional[Tuple[str, int]]:
+        """
+        Parses an ordinal such as 'twenty first' starting at tokens[i]
+
+        Returns (digits with suffix, end), None if tokens[i] does not start an ordinal
+        """
+        for end in range(min(len(tokens), i + 8), i, -1):
+            last = tokens[end - 1]
+            for ending, replacement in self.lexicon.ordinal_endings:
+                if not last.endswith(ending) or last == ending and not replacement:
+                    continue
+                rewritten = tokens[i : end - 1] + (last[: len(last) - len(ending)] + replacement).split()
+                number = self.cardinal(rewritten, 0)
+                if number is not None and number[1] == len(rewritten):
+                    return ordinal_suffix(number[0]), end
+        return None
+
+
+def ordinal_suffix(number: int) -> str:
+    """
+    Returns number with English ordinal suffix, as the ordinal verbalizer writes it, e.g. 21 -> 21st
+    """
+    if number % 100 in (11, 12, 13):
+        return f"{number}th"
+    return f"{number}{ {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')}"
+
+
+_parsers: Dict[str, NumberParser] = {}
+_parsers_lock = threading.Lock()
+
+
+def get_parser(lang: str) -> NumberParser:
+    """
+    Returns the number parser of a language package, reading its tables on first use
+    """
+    parser = _parsers.get(lang)
+    if parser is None:
+        with _parsers_lock:
+            parser = _parsers.get(lang)
+            if parser is None:
+                logger.warning(f"pynini is not available, {lang} inverse text normalization converts numbers only")
+                parser = _parsers[lang] = NumberParser(NumberLexicon(lang))
+    return parser
+
+
+def inverse_normalize(text: str, lang: str) -> str:
+    """
+    Converts the spoken numbers of a sentence to digits and leaves all other words unchanged
+
+    Args:
+        text: sentence
+        lang: language package, e.g. 'hi'
+
+    Returns sentence with numbers in written form
+    """
+    parser = get_parser(lang)
+    tokens, punctuation = [], []
+    for word in text.split():
+        core = word if word in parser.lexicon.words else word.rstrip(TRAILING_PUNCTUATION)
+        tokens.append(core or word)
+        punctuation.append(word[len(core) :] if core else "")
+
+    output = []
+    i = 0
+    while i < len(tokens):
+        # numbers end at a word with trailing punctuation
+        stop = next((j + 1 for j in range(i, len(tokens)) if punctuation[j]), len(tokens))
+        span = tokens[:stop]
+        negative = span[i] in MINUS_WORDS and i + 1 < stop
+        start = i + 1 if negative else i
+        candidates = [parser.decimal(span, start), parser.ordinal(span, start)]
+        cardinal = parser.cardinal(span, start)
+        if cardinal is not None:
+            candidates.append((str(cardinal[0]), cardinal[1]))
+        candidates = [c for c in candidates if c is not None]
+        if not candidates:
+            output.append(tokens[i] + punctuation[i])
+            i += 1
+            continue
+        written, end = max(candidates, key=lambda c: c[1])
+        output.append(("-" if negative else "") + written + punctuation[end - 1])
+        i = end
+    return " ".join(output)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    parser.add_argument("text", help="sentence to normalize", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(inverse_normalize(args.text, args.lang))
@@ -0,0 +1,85 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+# Copyright 2015 and onwards Google, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+from typing import Dict, Tuple
+
+try:
+    import pynini
+    from inverse_text_normalization.string_file_cache import string_file
+    from pynini.examples import plurals
+    from pynini.lib import pynutil, utf8
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+English plural/singular transducers used by `get_plurals` and `get_singulars` of every language.
+
+The priority unions over NEMO_SIGMA are expensive to compile, so they are built on first use instead of
+at import time, and only once per process for all languages sharing the same `suppletive.tsv`.
+'''
+
+_graphs: Dict[str, Tuple['pynini.Fst', 'pynini.Fst']] = {}
+_lock = threading.Lock()
+
+
+def _build(suppletive_path: str) -> Tuple['pynini.Fst', 'pynini.Fst']:
+    sigma = pynini.closure(utf8.VALID_UTF8_CHAR)
+    suppletive = string_file(suppletive_path)
+    # _v = pynini.union("a", "e", "i", "o", "u")
+    _c = pynini.union(
+        "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "q", "r", "s", "t", "v", "w", "x", "y", "z"
+    )
+    _ies = sigma + _c + pynini.cross("y", "ies")
+    _es = sigma + pynini.union("s", "sh", "ch", "x", "z") + pynutil.insert("es")
+    _s = sigma + pynutil.insert("s")
+
+    graph_plural = plurals._priority_union(
+        suppletive, plurals._priority_union(_ies, plurals._priority_union(_es, _s, sigma), sigma), sigma
+    ).optimize()
+    return graph_plural, pynini.invert(graph_plural)
+
+
+def _plural_graphs(suppletive_path: str) -> Tuple['pynini.Fst', 'pynini.Fst']:
+    with open(suppletive_path, "rb") as fp:
+        digest = hashlib.sha256(fp.read()).hexdigest()
+    with _lock:
+        graphs = _graphs.get(digest)
+        if graphs is None:
+            graphs = _graphs[digest] = _build(suppletive_path)
+        return graphs
+
+
+def singular_to_plural(suppletive_path: str) -> 'pynini.Fst':
+    """
+    Returns shared transducer from English singular to plural forms
+
+    Args:
+        suppletive_path: path to tsv of irregular singular/plural pairs
+    """
+    return _plural_graphs(suppletive_path)[0]
+
+
+def plural_to_singular(suppletive_path: str) -> 'pynini.Fst':
+    """
+    Returns shared transducer from English plural to singular forms
+
+    Args:
+        suppletive_path: path to tsv of irregular singular/plural pairs
+    """
+    return _plural_graphs(suppletive_path)[1]
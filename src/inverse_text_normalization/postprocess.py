@@ -0,0 +1,212 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from inverse_text_normalization.sentence_errors import ERROR, ItemResult
+
+'''
+Post-processing of the written form in one pass per sentence, applied by `<lang>/run_predict.py` to a whole batch
+of grammar outputs. It does what the pipeline did in three passes before, with the same output:
+
+    - removes carriage returns
+    - remove_starting_zeros of the language package: leading zeros are trimmed ("007" -> "7", "0.5" stays) and
+      a currency sign is separated from its amount ("$500" -> "$ 500")
+    - format_numbers_with_commas of run_predict: the integer part of a number of more than 4 characters is cut
+      into Indian (12,34,567) or Western (1,234,567) groups, ITN_DIGIT_GROUPING, joined by ITN_DIGIT_SEPARATOR,
+      which is empty by default as the groups were always joined without separator
+
+A sentence without a zero or a currency sign is only scanned once with a compiled regex; only the others are
+split into words. Where remove_starting_zeros raised IndexError on an empty word (two spaces in a row, an empty
+output), the word is kept.
+'''
+
+DIGITS = "0123456789"
+CURRENCIES = "$₹"
+MORE_CURRENCIES = "$₹£€"
+
+# language package -> (currency signs separated from their amount, "0", "00" and "000" kept as they are)
+LANGUAGE_RULES = {
+    "hi": (CURRENCIES, True),
+    "en": (CURRENCIES, True),
+    "gu": (CURRENCIES, False),
+    "te": (CURRENCIES, False),
+    "mr": (CURRENCIES, True),
+    "pa": (MORE_CURRENCIES, False),
+    "ta": (CURRENCIES, True),
+    "bn": (MORE_CURRENCIES, False),
+    "ml": (MORE_CURRENCIES, False),
+    "ori": (MORE_CURRENCIES, True),
+    "asm": (MORE_CURRENCIES, False),
+    "kn": (MORE_CURRENCIES, False),
+}
+ZERO_WORDS = ("0", "00", "000")
+
+_processors: Dict[Tuple[str, str, str], "PostProcessor"] = {}
+_processors_lock = threading.Lock()
+
+
+def digit_grouping() -> str:
+    """
+    Returns "indian" or "western", ITN_DIGIT_GROUPING
+    """
+    return os.environ.get("ITN_DIGIT_GROUPING", "indian")
+
+
+def digit_separator() -> str:
+    """
+    Returns the separator between digit groups, ITN_DIGIT_SEPARATOR
+    """
+    return os.environ.get("ITN_DIGIT_SEPARATOR", "")
+
+
+class PostProcessor:
+    """
+    Zero trimming, currency separation and digit grouping of one language package, compiled once
+
+    Args:
+        currencies: currency signs separated from their amount
+        keep_zero_words: keep "0", "00" and "000" as they are instead of removing them
+        grouping: "indian" or "western"
+        separator: joins the digit groups
+    """
+
+    def __init__(self, currencies: str, keep_zero_words: bool, grouping: str = "indian", separator: str = ""):
+        if grouping not in ("indian", "western"):
+            raise ValueError(f"Unknown digit grouping: {grouping}")
+        self.currencies = currencies
+        self.keep_zero_words = keep_zero_words
+        self.group_size = 2 if grouping == "indian" else 3
+        self.separator = separator
+        # a word needs more than copying only if it starts with a zero or a currency sign
+        self._candidate = re.compile("(?:^| )[0" + re.escape(currencies) + "]")
+
+    def _trim(self, word: str) -> str:
+        currency = ""
+        if word[0] in self.currencies:
+            currency = word[0]
+            word = word[1:]
+        if self.keep_zero_words and word in ZERO_WORDS:
+            return word
+        if word.strip("0") == "":
+            word = ""
+        elif word[0] in DIGITS and len(word) > 1:
+            if "." in word and len(word.split(".")[0]) == 1:
+                return word
+            word = word.lstrip("0")
+        if currency:
+            return currency + " " + word
+        return word
+
+    def _group(self, word: str) -> str:
+        if len(word) <= 4 or ":" in word:
+            return word
+        # str.isdigit as the former format_numbers_with_commas, which also takes e.g. superscript digits
+        start = next((i for i, char in enumerate(word) if char.isdigit()), None)
+        if start is None:
+            return word
+        s, point, fraction = word[start:].partition(".")
+        size = self.group_size
+        groups = [s[x - size:x] for x in range(-3, -len(s), -size)][::-1] + [s[-3:]]
+        return word[:start] + self.separator.join(groups) + point + fraction
+
+    def process(self, sentence: str) -> str:
+        """
+        Post-processes one sentence
+
+        Args:
+            sentence: grammar output
+
+        Returns written form
+        """
+        if "\r" in sentence:
+            sentence = sentence.replace("\r", "")
+        if self._candidate.search(sentence) is not None:
+            sentence = " ".join(self._trim(word) if word else word for word in sentence.split(" "))
+        if self.separator:
+            # a separated currency sign is a word of its own here, as it was for format_numbers_with_commas
+            sentence = self.group_digits(sentence)
+        return sentence
+
+    def group_digits(self, sentence: str) -> str:
+        """
+        Groups the digits of every number of more than 4 characters with the separator, without trimming zeros
+
+        Args:
+            sentence: written form
+
+        Returns sentence with its digits grouped
+        """
+        return " ".join(self._group(word) for word in sentence.split(" "))
+
+    def process_batch(self, sentences: List[str]) -> List[str]:
+        """
+        Post-processes a batch of sentences
+
+        Args:
+            sentences: grammar outputs
+
+        Returns written forms in the order of sentences
+        """
+        process = self.process
+        return [process(sentence) for sentence in sentences]
+
+
+def get_postprocessor(lang: str) -> PostProcessor:
+    """
+    Returns the post-processor of a language package with the current digit grouping and separator
+
+    Args:
+        lang: language package, e.g. 'hi', 'ori'
+    """
+    key = (lang, digit_grouping(), digit_separator())
+    processor = _processors.get(key)
+    if processor is None:
+        currencies, keep_zero_words = LANGUAGE_RULES[lang]
+        with _processors_lock:
+            processor = _processors.setdefault(key, PostProcessor(currencies, keep_zero_words, key[1], key[2]))
+    return processor
+
+
+def postprocess_batch(sentences: List[str], lang: str) -> List[str]:
+    """
+    Post-processes a batch of grammar outputs of a language package
+
+    Args:
+        sentences: grammar outputs
+        lang: language package, e.g. 'hi', 'ori'
+
+    Returns written forms in the order of sentences
+    """
+    return get_postprocessor(lang).process_batch(sentences)
+
+
+def postprocess_results(texts: List[str], results: List[ItemResult], lang: str) -> List[ItemResult]:
+    """
+    Post-processes the outputs of the sentences normalized without error, see sentence_errors; the fallback output
+    of a sentence over a limit is post-processed as well
+
+    Args:
+        texts: sentences as given, a failed sentence is passed through as it is here
+        results: results of the grammars, for texts
+        lang: language package, e.g. 'hi', 'ori'
+
+    Returns results in the order of texts
+    """
+    processor = get_postprocessor(lang)
+    return [result._replace(text=text, output=processor.process(result.output) if result.status != ERROR else text)
+            for text, result in zip(texts, results)]
@@ -0,0 +1,161 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from inverse_text_normalization.grammar_cache import cache_disabled, far_path, far_version, grammar_dir, grammar_hash
+from inverse_text_normalization.grammar_registry import get_registry
+
+'''
+Exports the final tagger and verbalizer of each language to versioned FAR archives, e.g.
+
+    python -m inverse_text_normalization.pynini_export --lang hi ta
+    python -m inverse_text_normalization.pynini_export --workers 8 --output_dir build/grammars
+
+Workers that import `<lang>/inverse_normalize.py` afterwards read the archives instead of
+compiling the grammars, as long as the grammar sources and data files are unchanged.
+
+The unit of work of a worker process is one final grammar of one language; its sub-grammars are built in that
+process, in order, and released once the archive is written.
+'''
+
+LANGUAGES = ("hi", "en", "gu", "te", "mr", "pa", "ta", "bn", "ml", "ori", "asm", "kn")
+
+FINAL_GRAMMARS = {
+    "classify": ("taggers.tokenize_and_classify_final", "ClassifyFinalFst", "tokenize_and_classify_final"),
+    "verbalize": ("verbalizers.verbalize_final", "VerbalizeFinalFst", "verbalize_final"),
+}
+
+
+def lang_dir(lang: str) -> str:
+    """
+    Returns directory of a language package
+    """
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), lang)
+
+
+def export_grammar(lang: str, kind: str, force: bool = False) -> Dict[str, object]:
+    """
+    Builds the final grammar of one kind and writes it to its FAR archive, unless it is up to date
+
+    Args:
+        lang: language package, e.g. 'hi'
+        kind: 'classify' or 'verbalize'
+        force: rebuild even if an up-to-date archive exists
+
+    Returns export info: archive path, whether it was rebuilt and the time taken
+    """
+    module_name, class_name, name = FINAL_GRAMMARS[kind]
+    path = far_path(lang_dir(lang), kind, name)
+    start = time.perf_counter()
+    up_to_date = not force and far_version(path) == grammar_hash(lang_dir(lang))
+    if not up_to_date:
+        # never pick up a stale or half-written archive while rebuilding
+        with cache_disabled():
+            module = importlib.import_module(f"inverse_text_normalization.{lang}.{module_name}")
+            grammar = getattr(module, class_name)()
+            grammar.export_far()
+        # the sub-grammars are composed into the archive, do not keep them for the next language
+        get_registry(lang).clear()
+    return {
+        "lang": lang,
+        "kind": kind,
+        "far": str(path),
+        "rebuilt": not up_to_date,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+
+
+def write_manifest(infos: List[Dict[str, object]]):
+    """
+    Writes `manifest.json` next to the archives of each exported language, listing grammar version and archives
+
+    Args:
+        infos: export infos
+    """
+    for lang in sorted({info["lang"] for info in infos}):
+        lang_grammar_dir = grammar_dir(lang_dir(lang))
+        manifest = {
+            "lang": lang,
+            "version": grammar_hash(lang_dir(lang)),
+            "grammars": {
+                info["kind"]: os.path.relpath(info["far"], lang_grammar_dir) for info in infos if info["lang"] == lang
+            },
+        }
+        with open(lang_grammar_dir / "manifest.json", "w") as fp:
+            json.dump(manifest, fp, indent=2)
+
+
+def export_grammars(
+    languages: List[str], force: bool = False, workers: int = 1, output_dir: Optional[str] = None
+) -> List[Dict[str, object]]:
+    """
+    Exports tagger and verbalizer of every given language.
+    With more than one worker every (language, tagger/verbalizer) pair is compiled in its own process.
+
+    Args:
+        languages: language packages
+        force: rebuild even if up-to-date archives exist
+        workers: number of worker processes
+        output_dir: write archives to `output_dir/<lang>/...` instead of the package directories
+
+    Returns list of export infos
+    """
+    if output_dir:
+        # inherited by the worker processes
+        os.environ["ITN_GRAMMAR_DIR"] = os.path.abspath(output_dir)
+    # taggers take longest, schedule them first
+    jobs = [(lang, kind) for kind in FINAL_GRAMMARS for lang in languages]
+    if workers <= 1:
+        infos = [export_grammar(lang, kind, force=force) for lang, kind in jobs]
+    else:
+        # spawn: every job starts from a clean interpreter instead of a copy of this one
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [pool.submit(export_grammar, lang, kind, force) for lang, kind in jobs]
+            infos = [future.result() for future in futures]
+    write_manifest(infos)
+    return infos
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language packages to export", nargs="+", choices=LANGUAGES, default=LANGUAGES)
+    parser.add_argument("--force", help="rebuild even if the archives are up to date", action='store_true')
+    parser.add_argument("--workers", help="number of worker processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output_dir", help="artifact directory, defaults to the language packages", type=str)
+    parser.add_argument(
+        "--incremental", help="reuse unchanged sub-grammars from earlier builds, see grammar_deps", action='store_true'
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.incremental:
+        # inherited by the worker processes
+        os.environ["ITN_INCREMENTAL_BUILD"] = "1"
+    start = time.perf_counter()
+    infos = export_grammars(args.lang, force=args.force, workers=args.workers, output_dir=args.output_dir)
+    for info in infos:
+        status = "exported" if info["rebuilt"] else "up to date"
+        print(f"{info['lang']:>4} {info['kind']:<9} {status:<10} {info['seconds']:>8.2f}s  {info['far']}")
+    print(f"{len(infos)} grammars in {time.perf_counter() - start:.2f}s with {args.workers} workers")
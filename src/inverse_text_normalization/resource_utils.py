@@ -0,0 +1,79 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+from typing import Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+
+def current_rss() -> Optional[int]:
+    """
+    Returns resident set size of this process in bytes, None where /proc is not available
+    """
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Returns peak resident set size of this process in bytes, None where getrusage is not available.
+    A peak only grows, so unlike current_rss it does not give the memory taken by a step.
+    """
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def rss_since(rss_before: Optional[int]) -> Optional[int]:
+    """
+    Returns resident set size taken since rss_before = current_rss(), None where it is not available
+    """
+    rss_after = current_rss()
+    if rss_before is None or rss_after is None:
+        return None
+    return rss_after - rss_before
+
+
+def sum_bytes(values: Iterable[Optional[int]]) -> Optional[int]:
+    """
+    Sums byte counts, None if any of them is not available
+    """
+    total = 0
+    for value in values:
+        if value is None:
+            return None
+        total += value
+    return total
+
+
+def format_bytes(num_bytes: Optional[float]) -> str:
+    """
+    Formats byte count for reports, e.g. 1536 -> '1.5 KiB', None -> 'n/a'
+    """
+    if num_bytes is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(num_bytes) < 1024 or unit == "GiB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{int(num_bytes)} B"
+        num_bytes /= 1024
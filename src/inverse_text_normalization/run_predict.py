@@ -1,114 +1,164 @@
-from inverse_text_normalization.hi.run_predict import inverse_normalize_text as hi_itn
-from inverse_text_normalization.en.run_predict import inverse_normalize_text as en_itn
-# from inverse_text_normalization.gu.run_predict import inverse_normalize_text as gu_itn
-# from inverse_text_normalization.te.run_predict import inverse_normalize_text as te_itn
-# from inverse_text_normalization.mr.run_predict import inverse_normalize_text as mr_itn
-# from inverse_text_normalization.pa.run_predict import inverse_normalize_text as pa_itn
-from inverse_text_normalization.ta.run_predict import inverse_normalize_text as ta_itn
-from inverse_text_normalization.ta.run_predict import inverse_normalize_text as ta_itn
-# from inverse_text_normalization.bn.run_predict import inverse_normalize_text as bn_itn
-# from inverse_text_normalization.ml.run_predict import inverse_normalize_text as ml_itn
-from inverse_text_normalization.ori.run_predict import inverse_normalize_text as or_itn
-# from inverse_text_normalization.asm.run_predict import inverse_normalize_text as as_itn
-# from inverse_text_normalization.kn.run_predict import inverse_normalize_text as kn_itn
+import importlib
+import os
+import threading
+import warnings
+from concurrent.futures import Future
+from types import ModuleType
+from typing import Callable, Dict, Iterable, List
+
+from inverse_text_normalization import batch, grammar_reload, postprocess
+from inverse_text_normalization.sentence_errors import ItemResult
+
+# language code -> language package. Each package compiles (or loads) its grammars when its
+# run_predict module is first imported, so packages are only imported on first use.
+ITN_LANGUAGE_PACKAGES = {
+    'hi': 'hi',
+    'en': 'en',
+    'en_bio': 'en',
+    'gu': 'gu',
+    'te': 'te',
+    'mr': 'mr',
+    'pa': 'pa',
+    'ta': 'ta',
+    'bn': 'bn',
+    'ml': 'ml',
+    'or': 'ori',
+    'as': 'asm',
+    'kn': 'kn',
+}
+
+_itn_modules: Dict[str, ModuleType] = {}
+_itn_lock = threading.Lock()
+
+
+def _get_itn_module(lang: str) -> ModuleType:
+    package = ITN_LANGUAGE_PACKAGES.get(lang)
+    if package is None:
+        raise ValueError(f"Unsupported language for inverse text normalization: {lang}")
+    module = _itn_modules.get(package)
+    if module is None:
+        with _itn_lock:
+            module = _itn_modules.get(package)
+            if module is None:
+                module = importlib.import_module(f'inverse_text_normalization.{package}.run_predict')
+                _itn_modules[package] = module
+    return module
+
+
+def get_itn(lang: str) -> Callable:
+    """
+    Returns inverse_normalize_text of the language package, importing it on first use
+
+    Args:
+        lang: language code, e.g. 'hi', 'or'
+
+    Returns inverse text normalization function of the language
+    """
+    return _get_itn_module(lang).inverse_normalize_text
+
+
+def get_itn_results(lang: str) -> Callable:
+    """
+    Returns inverse_normalize_results of the language package, importing it on first use
+
+    Args:
+        lang: language code, e.g. 'hi', 'or'
+
+    Returns inverse text normalization function of the language with a result per sentence, see sentence_errors
+    """
+    return _get_itn_module(lang).inverse_normalize_results
+
+
+def preload_languages(langs: Iterable[str]):
+    """
+    Compiles (or loads) the grammars of the given languages ahead of the first request
+
+    Args:
+        langs: language codes
+    """
+    for lang in langs:
+        get_itn(lang)
+
+
+def loaded_languages() -> List[str]:
+    """
+    Returns language packages whose grammars are loaded
+    """
+    return sorted(_itn_modules)
+
+
+def reload_lexicons(lang: str, wait: bool = False) -> Future:
+    """
+    Rebuilds the grammars of a loaded language from its current data files in the background and swaps them in,
+    e.g. after adding an entry to whitelist.tsv. Only sub-grammars whose data files changed are compiled.
+
+    Args:
+        lang: language code, e.g. 'hi', 'or'
+        wait: block until the new grammars are in place
+
+    Returns future of the reload
+    """
+    get_itn(lang)
+    return grammar_reload.reload_lexicons(ITN_LANGUAGE_PACKAGES[lang], wait=wait)
+
 
 def format_numbers_with_commas(sent, lang):
-    words = []
-    for word in sent.split(' '):
-        word_contains_digit = any(map(str.isdigit, word))
-        currency_sign = ''
-        if word_contains_digit:
-            if len(word) > 4 and ':' not in word:
-                pos_of_first_digit_in_word = list(map(str.isdigit, word)).index(True)
-
-                if pos_of_first_digit_in_word != 0:  # word can be like $90,00,936.59
-                    currency_sign = word[:pos_of_first_digit_in_word]
-                    word = word[pos_of_first_digit_in_word:]
-
-                s, *d = str(word).partition(".")
-                # getting [num_before_decimal_point, decimal_point, num_after_decimal_point]
-                if lang == 'hi':
-                    # adding commas after every 2 digits after the last 3 digits
-                    r = "".join([s[x - 2:x] for x in range(-3, -len(s), -2)][::-1] + [s[-3:]])
-                else:
-                    r = "".join([s[x - 3:x] for x in range(-3, -len(s), -3)][::-1] + [s[-3:]])
-
-                word = "".join([r] + d)  # joining decimal points as is
-
-                if currency_sign:
-                    word = currency_sign + word
-                words.append(word)
-            else:
-                words.append(word)
-        else:
-            words.append(word)
-    return ' '.join(words)
-
-
-def inverse_normalize_text(text_list, lang):
-    if lang == 'hi':
-        itn_results = hi_itn(text_list)
-        itn_results_formatted = [format_numbers_with_commas(sent=sent, lang=lang) for sent in itn_results]
-        return itn_results_formatted
-    elif lang in ['en', 'en_bio']:
-        itn_results = en_itn(text_list)
-        itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-        return itn_results_formatted
-    elif lang == 'ta':
-        itn_results = ta_itn(text_list)
-        itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-        return itn_results_formatted
-    elif lang == 'or':
-        itn_results = or_itn(text_list)
-        itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-        return itn_results_formatted
-    
-    #     return itn_results_formatted
-    # elif lang == 'gu':
-    #     itn_results = gu_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    # elif lang == 'te':
-
-    #     itn_results = te_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    # elif lang == 'mr':
-
-    #     itn_results = mr_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    # elif lang == 'pa':
-
-    #     itn_results = pa_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-
-    # elif lang == 'bn':
-
-    #     itn_results = bn_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    # elif lang == 'ml':
-
-    #     itn_results = ml_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    # elif lang == 'as':
-
-    #     itn_results = as_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
-
-    
-    # elif lang == 'kn':
-
-    #     itn_results = kn_itn(text_list)
-    #     itn_results_formatted = [format_numbers_with_commas(sent=sent, lang='hi') for sent in itn_results]
-    #     return itn_results_formatted
+    """
+    Deprecated, the digits are grouped by the post-processing of inverse_normalize_text, see postprocess.PostProcessor
+    and ITN_DIGIT_GROUPING / ITN_DIGIT_SEPARATOR
+
+    Args:
+        sent: sentence in written form
+        lang: language code, 'hi' groups the digits the Indian way and the others the western way
+
+    Returns sentence with the digits grouped with ITN_DIGIT_SEPARATOR (none by default)
+    """
+    warnings.warn(
+        "run_predict.format_numbers_with_commas is deprecated, use postprocess.PostProcessor",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    grouping = 'indian' if lang == 'hi' else 'western'
+    return postprocess.PostProcessor('', True, grouping, postprocess.digit_separator()).group_digits(sent)
+
+
+def inverse_normalize_text(text_list, lang, workers=1, chunk_size=None):
+    """
+    Normalizes a list of sentences and formats their numbers. A sentence the grammars fail on is returned
+    unchanged, see inverse_normalize_results for its error. Raises ValueError for a lang that is not in
+    ITN_LANGUAGE_PACKAGES.
+
+    Args:
+        text_list: sentences
+        lang: language code, e.g. 'hi', 'or'
+        workers: worker processes of the batch mode, see batch.py; None for one per CPU, 1 for this process only
+        chunk_size: sentences per chunk of the batch mode, adaptive if None
+
+    Returns outputs in the order of text_list
+    """
+    results = inverse_normalize_results(text_list, lang, workers=workers, chunk_size=chunk_size)
+    return [result.output for result in results]
+
+
+def inverse_normalize_results(text_list, lang, workers=1, chunk_size=None) -> List[ItemResult]:
+    """
+    Normalizes a list of sentences and formats their numbers, with a result per sentence: its output and
+    whether the grammars handled it, see sentence_errors. sentence_errors.summarize(results) reports the errors.
+
+    Args:
+        text_list: sentences
+        lang: language code, e.g. 'hi', 'or'
+        workers: worker processes of the batch mode, see batch.py; None for one per CPU, 1 for this process only
+        chunk_size: sentences per chunk of the batch mode, adaptive if None
+
+    Returns results in the order of text_list
+    """
+    batch.check_args(workers, chunk_size)
+    if workers is None or workers > 1:
+        return batch.inverse_normalize_batch_results(text_list, lang, workers=workers, chunk_size=chunk_size)
+    # the language packages group the digits in the same pass as they trim the zeros, see postprocess
+    return get_itn_results(lang)(text_list)
+
+
+# e.g. ITN_PRELOAD_LANGS=hi,en to compile these grammars at import time
+preload_languages(lang.strip() for lang in os.environ.get('ITN_PRELOAD_LANGS', '').split(',') if lang.strip())
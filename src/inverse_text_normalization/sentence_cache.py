@@ -0,0 +1,291 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from inverse_text_normalization.grammar_cache import grammar_hash
+from inverse_text_normalization.sentence_errors import OK, ItemResult
+from inverse_text_normalization.sentence_limits import LIMITS
+
+'''
+Per-language LRU cache of normalized sentences, in front of `<lang>/run_predict.inverse_normalize_text`
+(grammars and remove_starting_zeros), for repetitive ASR output such as confirmations and IVR prompts.
+
+    ITN_SENTENCE_CACHE_SIZE   sentences kept per language, default 10000, 0 turns the cache off
+    ITN_SENTENCE_CACHE_TTL    seconds a sentence is kept, default no limit
+    ITN_SENTENCE_CACHE_DIR    persist the caches to <dir>/<lang>.<settings>.json at exit and load them at start;
+                              entries written by another grammar version of the language are dropped
+
+The output of a sentence also depends on the OUTPUT_SETTINGS (digit grouping, native verbalizer, span window,
+chunking and limits), so a language keeps a cache per combination of their values, persisted under a digest of
+them (`settings_key()`). `metrics()` returns hits, misses, evictions and expirations per language, for the
+current settings. A lexicon reload clears the caches of the language.
+'''
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZE = 10000
+PACKAGE_ROOT = os.path.dirname(os.path.abspath(__file__))
+# environment settings the output of a sentence depends on besides the grammars
+OUTPUT_SETTINGS = (
+    "ITN_DIGIT_GROUPING",
+    "ITN_DIGIT_SEPARATOR",
+    "ITN_NATIVE_VERBALIZER",
+    "ITN_SPAN_WINDOW",
+    "ITN_SPAN_CONTEXT",
+    "ITN_CHUNK_WORDS",
+    "ITN_LIMIT_FALLBACK",
+    "ITN_LIMIT_CHUNK_WORDS",
+) + tuple(name for name, _ in LIMITS.values())
+
+
+class SentenceCache:
+    """
+    Thread-safe LRU cache with optional time to live and persistence
+
+    Args:
+        maxsize: maximum number of entries
+        ttl: seconds an entry is kept, None for no limit
+        path: JSON file to load the cache from and save it to
+        version: entries of a persisted cache with another version are not loaded
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_SIZE, ttl: Optional[float] = None, path: Optional[str] = None,
+                 version: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.version = version
+        # sentence -> (output, time stored)
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        if path is not None:
+            self.load()
+
+    def get(self, text: str) -> Optional[str]:
+        """
+        Returns cached output of text, None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(text)
+            if entry is not None and self.ttl is not None and time.time() - entry[1] > self.ttl:
+                del self._entries[text]
+                self._metrics["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(text)
+            self._metrics["hits"] += 1
+            return entry[0]
+
+    def put(self, text: str, output: str, stored: Optional[float] = None):
+        """
+        Stores output of text, evicting the least recently used entries beyond maxsize
+        """
+        with self._lock:
+            self._entries[text] = (output, time.time() if stored is None else stored)
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def map(self, texts: List[str], compute: Callable[[List[str]], List[str]]) -> List[str]:
+        """
+        Returns outputs of texts, computing the missing ones in one call
+
+        Args:
+            texts: sentences
+            compute: normalizes a list of sentences
+
+        Returns outputs in the order of texts
+        """
+        outputs = [self.get(text) for text in texts]
+        missing = list(OrderedDict.fromkeys(text for text, output in zip(texts, outputs) if output is None))
+        if missing:
+            computed = dict(zip(missing, compute(missing)))
+            for text, output in computed.items():
+                self.put(text, output)
+            outputs = [computed[text] if output is None else output for text, output in zip(texts, outputs)]
+        return outputs
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        Returns hits, misses, evictions, expirations, size and maxsize
+        """
+        with self._lock:
+            return dict(self._metrics, size=len(self._entries), maxsize=self.maxsize)
+
+    def load(self):
+        """
+        Loads the entries persisted at path, if written with the same version
+        """
+        try:
+            with open(self.path, encoding="utf-8") as fp:
+                persisted = json.load(fp)
+        except (OSError, ValueError):
+            return
+        if persisted.get("version") != self.version:
+            logger.info(f"ignoring sentence cache {self.path} of another grammar version")
+            return
+        now = time.time()
+        for text, output, stored in persisted.get("entries", [])[-self.maxsize:]:
+            if self.ttl is None or now - stored <= self.ttl:
+                self.put(text, output, stored=stored)
+
+    def save(self):
+        """
+        Writes the entries to path, least recently used first
+        """
+        with self._lock:
+            entries = [[text, output, stored] for text, (output, stored) in self._entries.items()]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump({"version": self.version, "entries": entries}, fp, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+_caches: Dict[Tuple[str, str], Optional[SentenceCache]] = {}
+_caches_lock = threading.Lock()
+
+
+def settings_key() -> str:
+    """
+    Returns a digest of the current values of the OUTPUT_SETTINGS
+    """
+    values = "\n".join(f"{name}={os.environ.get(name, '')}" for name in OUTPUT_SETTINGS)
+    return hashlib.sha1(values.encode("utf-8")).hexdigest()[:12]
+
+
+def _create_cache(lang: str, settings: str) -> Optional[SentenceCache]:
+    maxsize = int(os.environ.get("ITN_SENTENCE_CACHE_SIZE", DEFAULT_SIZE))
+    if maxsize <= 0:
+        return None
+    ttl = os.environ.get("ITN_SENTENCE_CACHE_TTL")
+    cache_dir = os.environ.get("ITN_SENTENCE_CACHE_DIR")
+    if not cache_dir:
+        return SentenceCache(maxsize, ttl=float(ttl) if ttl else None)
+    return SentenceCache(
+        maxsize,
+        ttl=float(ttl) if ttl else None,
+        path=os.path.join(cache_dir, f"{lang}.{settings}.json"),
+        version=grammar_hash(os.path.join(PACKAGE_ROOT, lang)),
+    )
+
+
+def get_cache(lang: str) -> Optional[SentenceCache]:
+    """
+    Returns the sentence cache of a language package for the current settings, None if caching is off
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    key = (lang, settings_key())
+    if key not in _caches:
+        with _caches_lock:
+            if key not in _caches:
+                _caches[key] = _create_cache(*key)
+    return _caches[key]
+
+
+def cached(lang: str, texts: List[str], compute: Callable[[List[str]], List[str]]) -> List[str]:
+    """
+    Normalizes texts through the sentence cache of a language package
+
+    Args:
+        lang: language package, e.g. 'hi'
+        texts: sentences
+        compute: normalizes a list of sentences without the cache
+
+    Returns outputs in the order of texts
+    """
+    cache = get_cache(lang)
+    if cache is None:
+        return compute(texts)
+    return cache.map(texts, compute)
+
+
+def cached_results(lang: str, texts: List[str], compute: Callable[[List[str]], List[ItemResult]]) -> List[ItemResult]:
+    """
+    Normalizes texts through the sentence cache of a language package, caching only the sentences normalized
+    without error, see sentence_errors
+
+    Args:
+        lang: language package, e.g. 'hi'
+        texts: sentences
+        compute: normalizes a list of sentences without the cache
+
+    Returns results in the order of texts
+    """
+    cache = get_cache(lang)
+    if cache is None:
+        return compute(texts)
+    outputs = [cache.get(text) for text in texts]
+    missing = list(OrderedDict.fromkeys(text for text, output in zip(texts, outputs) if output is None))
+    computed = dict(zip(missing, compute(missing))) if missing else {}
+    for text, result in computed.items():
+        if result.status == OK:
+            cache.put(text, result.output)
+    return [computed[text] if output is None else ItemResult(text, output) for text, output in zip(texts, outputs)]
+
+
+def clear(lang: Optional[str] = None):
+    """
+    Empties the sentence caches of a language package, e.g. after a lexicon reload
+
+    Args:
+        lang: language package, all if None
+    """
+    for (name, _), cache in list(_caches.items()):
+        if cache is not None and (lang is None or name == lang):
+            cache.clear()
+
+
+def metrics() -> Dict[str, Dict[str, int]]:
+    """
+    Returns cache metrics per language package, of the caches of the current settings
+    """
+    settings = settings_key()
+    return {
+        lang: cache.metrics()
+        for (lang, cache_settings), cache in sorted(_caches.items())
+        if cache is not None and cache_settings == settings
+    }
+
+
+@atexit.register
+def save_caches():
+    """
+    Persists the caches created with ITN_SENTENCE_CACHE_DIR
+    """
+    for (lang, _), cache in list(_caches.items()):
+        if cache is not None and cache.path is not None:
+            try:
+                cache.save()
+            except OSError as e:
+                logger.warning(f"could not save the {lang} sentence cache: {e}")
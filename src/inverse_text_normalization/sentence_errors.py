@@ -0,0 +1,160 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from inverse_text_normalization import sentence_limits
+
+'''
+Per-sentence error isolation: a sentence the grammars cannot handle (e.g. `inverse_normalize` raises ValueError
+when no field order of its tokens verbalizes) no longer aborts its batch. `<lang>/inverse_normalize.py`
+normalizes every sentence of a batch through normalize_items, which returns one ItemResult per sentence:
+
+    status "ok"      output is the written form
+    status "limit"   output is the fallback of sentence_limits (chunks within the limits, or the sentence
+                     unchanged), error names the first limit tripped
+    status "error"   output is the sentence unchanged, error names the exception
+
+`run_predict.inverse_normalize_results` returns these results for a whole batch (with the process pool too),
+and `run_predict.inverse_normalize_text` their outputs. `summarize(results)` counts the errors of a batch per
+exception and keeps sample inputs; `metrics()` and `samples()` do the same for everything normalized in this
+process. Only "ok" results are cached, so that a fixed grammar picks up failed sentences after a lexicon reload
+and a sentence that tripped a limit (e.g. the time budget on a busy worker) is normalized again next time.
+'''
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+LIMIT = "limit"
+ERROR = "error"
+SAMPLES = 20
+SAMPLE_CHARS = 200
+
+_errors: Dict[str, Dict[str, int]] = {}
+_samples: Dict[str, deque] = {}
+_errors_lock = threading.Lock()
+
+
+class ItemResult(NamedTuple):
+    """
+    Result of one sentence of a batch
+
+    Args:
+        text: input sentence
+        output: written form, or the input sentence if normalizing it failed
+        status: OK, LIMIT or ERROR
+        error: exception type and message if normalizing it failed or tripped a limit
+    """
+    text: str
+    output: str
+    status: str = OK
+    error: Optional[str] = None
+
+
+def describe(error: Exception) -> str:
+    """
+    Returns exception type and message, e.g. "ValueError" for a bare ValueError()
+    """
+    message = str(error)
+    return f"{type(error).__name__}: {message}" if message else type(error).__name__
+
+
+def _record(lang: str, error: Exception, text: str):
+    name = type(error).__name__
+    with _errors_lock:
+        errors = _errors.setdefault(lang, {})
+        errors[name] = errors.get(name, 0) + 1
+        first = errors[name] == 1
+        _samples.setdefault(lang, deque(maxlen=SAMPLES)).append(
+            {"error": describe(error), "text": text[:SAMPLE_CHARS]})
+    if first:
+        logger.warning(f"{lang} sentence passed through unchanged, {describe(error)}: {text[:SAMPLE_CHARS]}",
+                       exc_info=error)
+
+
+def normalize_items(texts: List[str], lang: str, normalize: Callable[[str], str]) -> List[ItemResult]:
+    """
+    Normalizes sentences one by one, passing those that raise through unchanged
+
+    Args:
+        texts: sentences
+        lang: language package, e.g. 'hi'
+        normalize: normalizes one sentence
+
+    Returns results in the order of texts
+    """
+    results = []
+    for text in texts:
+        try:
+            with sentence_limits.tracked_trips() as trips:
+                output = normalize(text)
+        except Exception as e:
+            _record(lang, e, text)
+            results.append(ItemResult(text, text, ERROR, describe(e)))
+            continue
+        if trips:
+            results.append(ItemResult(text, output, LIMIT, describe(trips[0])))
+        else:
+            results.append(ItemResult(text, output))
+    return results
+
+
+def summarize(results: List[ItemResult], max_samples: int = SAMPLES) -> Dict[str, object]:
+    """
+    Reports the errors of a batch
+
+    Args:
+        results: results of the batch
+        max_samples: failed inputs to keep
+
+    Returns sentences, errors, sentences over a limit, errors per exception type and the first failed inputs with
+    their errors
+    """
+    failed = [result for result in results if result.status == ERROR]
+    error_types: Dict[str, int] = {}
+    for result in failed:
+        name = result.error.split(":", 1)[0]
+        error_types[name] = error_types.get(name, 0) + 1
+    return {
+        "sentences": len(results),
+        "errors": len(failed),
+        "limits": sum(result.status == LIMIT for result in results),
+        "error_types": error_types,
+        "samples": [{"error": result.error, "text": result.text[:SAMPLE_CHARS]} for result in failed[:max_samples]],
+    }
+
+
+def metrics(lang: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Returns failed sentences per language package and exception type, in this process
+
+    Args:
+        lang: only this language package
+    """
+    with _errors_lock:
+        return {k: dict(v) for k, v in _errors.items() if lang is None or k == lang}
+
+
+def samples(lang: str) -> List[Dict[str, str]]:
+    """
+    Returns the last sentences of a language package that failed in this process, oldest first
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    with _errors_lock:
+        return list(_samples.get(lang, ()))
@@ -0,0 +1,278 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from inverse_text_normalization.chunking import chunk_spans
+from inverse_text_normalization.trigger_filter import get_filter, split_words
+
+'''
+Limits on the work the grammars may spend on one sentence, so that pathological ASR hypotheses (very long ones,
+runs of digits or magnitude words) cannot stall a worker. `<lang>/inverse_normalize.normalize_with_grammars`
+runs every sentence or span through normalize_within_limits:
+
+    ITN_MAX_INPUT_CHARS        characters composed with the tagger at once, default 1000
+    ITN_MAX_NUMBER_WORDS       words with a number trigger (see trigger_filter) composed at once, default 64
+    ITN_MAX_LATTICE_STATES     states of the tagged lattice, default 200000
+    ITN_MAX_LATTICE_ARCS       arcs of the tagged lattice, default 1000000
+    ITN_SENTENCE_TIME_BUDGET   seconds per sentence, default 5; checked after tagging and after the shortest
+                               path, a composition already running is not interrupted
+    ITN_LIMIT_FALLBACK         what a sentence over a limit gets: "chunk" (default) normalizes it again in
+                               chunks of about ITN_LIMIT_CHUNK_WORDS words (default 16) cut between number
+                               phrases as in chunking.py, each within the limits and copied unchanged if it
+                               trips one again; "identity" copies the sentence unchanged
+
+Only the input characters and number words are checked before the composition with the tagger; the states and
+arcs of the tagged lattice are checked once it is composed, so they bound its shortest path and the verbalizer,
+not the memory of the composition itself. The arcs are only counted when the states times the most arcs leaving
+a state of the tagger (computed once per tagger) could exceed ITN_MAX_LATTICE_ARCS. A limit of 0 turns it off.
+
+The output of a sentence over a limit is degraded: within tracked_trips (sentence_errors.normalize_items wraps
+every sentence in it) the limits tripped are collected, and the sentence gets status "limit" instead of "ok", so
+that neither the sentence cache nor the span cache keeps it. `metrics()` counts the trips per language and limit,
+and `samples()` keeps the last offending inputs so that the patterns behind them can be fixed in the grammars.
+'''
+
+logger = logging.getLogger(__name__)
+
+LIMITS = {
+    "input_chars": ("ITN_MAX_INPUT_CHARS", 1000),
+    "number_words": ("ITN_MAX_NUMBER_WORDS", 64),
+    "lattice_states": ("ITN_MAX_LATTICE_STATES", 200000),
+    "lattice_arcs": ("ITN_MAX_LATTICE_ARCS", 1000000),
+    "seconds": ("ITN_SENTENCE_TIME_BUDGET", 5.0),
+}
+DEFAULT_CHUNK_WORDS = 16
+SAMPLES = 20
+SAMPLE_CHARS = 200
+
+_trips: Dict[str, Dict[str, int]] = {}
+_samples: Dict[str, deque] = {}
+_trips_lock = threading.Lock()
+# language package -> (grammar, most arcs leaving one of its states)
+_out_degrees: Dict[str, Tuple[object, int]] = {}
+_out_degrees_lock = threading.Lock()
+# limits tripped while normalizing the current sentence, see tracked_trips
+_tripped = ContextVar("itn_tripped_limits", default=None)
+
+
+def limit(name: str) -> float:
+    """
+    Returns the current value of a limit, 0 if it is off
+
+    Args:
+        name: key of LIMITS
+    """
+    env, default = LIMITS[name]
+    return float(os.environ.get(env, default))
+
+
+def fallback_mode() -> str:
+    """
+    Returns "chunk" or "identity", ITN_LIMIT_FALLBACK
+    """
+    return os.environ.get("ITN_LIMIT_FALLBACK", "chunk")
+
+
+def chunk_words() -> int:
+    """
+    Returns words per chunk of the chunk fallback, ITN_LIMIT_CHUNK_WORDS
+    """
+    return int(os.environ.get("ITN_LIMIT_CHUNK_WORDS", DEFAULT_CHUNK_WORDS))
+
+
+def max_out_degree(lang: str, grammar: 'pynini.Fst') -> int:
+    """
+    Returns the most arcs leaving a state of the current grammar of a language package, computed once per grammar
+
+    Args:
+        lang: language package, e.g. 'hi'
+        grammar: e.g. the tagger fst
+    """
+    cached = _out_degrees.get(lang)
+    if cached is not None and cached[0] is grammar:
+        return cached[1]
+    degree = max((grammar.num_arcs(state) for state in grammar.states()), default=0)
+    with _out_degrees_lock:
+        _out_degrees[lang] = (grammar, degree)
+    return degree
+
+
+class LimitExceeded(Exception):
+    """
+    Raised when a sentence exceeds a limit
+
+    Args:
+        name: key of LIMITS
+        value: value that exceeded the limit
+    """
+
+    def __init__(self, name: str, value: float):
+        super().__init__(f"{name} {value} over the limit of {limit(name):g}")
+        self.name = name
+        self.value = value
+
+
+class Budget:
+    """
+    Lattice and time limits of one sentence, checked by the grammars between their stages
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+
+    def __init__(self, lang: Optional[str] = None):
+        self.lang = lang
+        self.start = time.perf_counter()
+        self.max_states = limit("lattice_states")
+        self.max_arcs = limit("lattice_arcs")
+        self.max_seconds = limit("seconds")
+
+    def check_time(self):
+        """
+        Raises LimitExceeded if the sentence has used up its time
+        """
+        elapsed = time.perf_counter() - self.start
+        if self.max_seconds and elapsed > self.max_seconds:
+            raise LimitExceeded("seconds", round(elapsed, 3))
+
+    def check_lattice(self, lattice: 'pynini.Fst', grammar: Optional['pynini.Fst'] = None):
+        """
+        Raises LimitExceeded if a lattice has too many states or arcs, or the sentence has used up its time
+
+        Args:
+            lattice: e.g. the tagged lattice, before its shortest path
+            grammar: fst a linear sentence was composed with into lattice; no state of lattice has more arcs
+                than one of grammar, so its arcs are only counted when that bound is over the limit
+        """
+        self.check_time()
+        states = lattice.num_states()
+        if self.max_states and states > self.max_states:
+            raise LimitExceeded("lattice_states", states)
+        if not self.max_arcs:
+            return
+        if grammar is not None and self.lang is not None:
+            if states * max_out_degree(self.lang, grammar) <= self.max_arcs:
+                return
+        arcs = sum(lattice.num_arcs(state) for state in lattice.states())
+        if arcs > self.max_arcs:
+            raise LimitExceeded("lattice_arcs", arcs)
+
+
+@contextmanager
+def tracked_trips() -> Iterator[List[LimitExceeded]]:
+    """
+    Collects the limits tripped while normalizing inside the block, also by chunks normalized on other threads in a
+    copy of this context (see chunking); a nested block passes its trips on to the enclosing one
+
+    Returns list of the LimitExceeded, filled as the block runs
+    """
+    trips = []
+    token = _tripped.set(trips)
+    try:
+        yield trips
+    finally:
+        _tripped.reset(token)
+        outer = _tripped.get()
+        if outer is not None:
+            outer.extend(trips)
+
+
+def _record(lang: str, error: LimitExceeded, text: str):
+    trips = _tripped.get()
+    if trips is not None:
+        trips.append(error)
+    with _trips_lock:
+        trips = _trips.setdefault(lang, {name: 0 for name in LIMITS})
+        trips[error.name] += 1
+        first = trips[error.name] == 1
+        _samples.setdefault(lang, deque(maxlen=SAMPLES)).append(
+            {"limit": error.name, "value": error.value, "text": text[:SAMPLE_CHARS]})
+    if first:
+        logger.warning(f"{lang} sentence over a limit, {error}: {text[:SAMPLE_CHARS]}")
+
+
+def _normalize(text: str, lang: str, normalize: Callable[[str, Budget], str]) -> str:
+    max_chars = limit("input_chars")
+    if max_chars and len(text) > max_chars:
+        raise LimitExceeded("input_chars", len(text))
+    max_number_words = limit("number_words")
+    words = split_words(text)
+    # runs of digits and magnitude words make the tagged lattice blow up before any of its limits can be checked
+    if max_number_words and len(words) > max_number_words:
+        number_words = sum(get_filter(lang).trigger_tokens(words))
+        if number_words > max_number_words:
+            raise LimitExceeded("number_words", number_words)
+    return normalize(text, Budget(lang))
+
+
+def normalize_within_limits(text: str, lang: str, normalize: Callable[[str, Budget], str]) -> str:
+    """
+    Normalizes a sentence, falling back to chunks or to the sentence itself when it exceeds a limit
+
+    Args:
+        text: sentence, or candidate span of a sentence
+        lang: language package, e.g. 'hi'
+        normalize: normalizes text with the grammars, checking the budget between its stages
+
+    Returns written form
+    """
+    try:
+        return _normalize(text, lang, normalize)
+    except LimitExceeded as e:
+        _record(lang, e, text)
+    words = split_words(text)
+    size = max(chunk_words(), 1)
+    if fallback_mode() != "chunk" or len(words) <= size:
+        return " ".join(words)
+    outputs = []
+    for start, end in chunk_spans(words, lang, size):
+        chunk = " ".join(words[start:end])
+        try:
+            output = _normalize(chunk, lang, normalize)
+        except LimitExceeded as e:
+            _record(lang, e, chunk)
+            output = chunk
+        if output:
+            outputs.append(output)
+    return " ".join(outputs)
+
+
+def metrics(lang: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Returns limit trips per language package and limit
+
+    Args:
+        lang: only this language package
+    """
+    with _trips_lock:
+        return {k: dict(v) for k, v in _trips.items() if lang is None or k == lang}
+
+
+def samples(lang: str) -> List[Dict[str, object]]:
+    """
+    Returns the last inputs of a language package that exceeded a limit, oldest first
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    with _trips_lock:
+        return list(_samples.get(lang, ()))
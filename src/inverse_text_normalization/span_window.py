@@ -0,0 +1,231 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+from argparse import ArgumentParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from inverse_text_normalization.sentence_cache import SentenceCache
+from inverse_text_normalization.sentence_limits import tracked_trips
+from inverse_text_normalization.trigger_filter import get_filter, split_words
+
+'''
+Span-windowed inverse text normalization: `<lang>/inverse_normalize.py` composes only the candidate spans of each
+chunk of a sentence with the tagger and verbalizer instead of the whole chunk; ITN_SPAN_WINDOW=0 composes whole
+chunks again.
+
+A candidate span is a maximal run of words that contain a trigger of trigger_filter (number, magnitude, unit,
+month or whitelist word, digit or punctuation mark), widened by ITN_SPAN_CONTEXT words (default 1) on each side
+so that context words of the grammars, e.g. "minus", "the" or a plural unit, stay with their number. Spans that
+touch after widening are merged. The words between spans are copied, and the normalized spans spliced back in,
+so the composed lattices grow with the numeric content of a sentence rather than its length.
+
+Number phrases recur inside otherwise unique sentences ("दो हज़ार पाँच सौ", "दस लाख"), so the output of every
+span is memoized in a per-language LRU cache of ITN_SPAN_CACHE_SIZE spans (default 50000, 0 turns it off).
+The cache is keyed on the trigger run of a span, without its context words, so a number phrase hits next to any
+neighbours. Each context word is learned once per language: a word the grammars copied unchanged next to a run
+is passive, one they consumed or rewrote ("minus five") is kept in the key of every run it borders from then on.
+A span with a context word not seen yet is always composed, to learn it. A word the grammars consume only next
+to some runs (en "the" before an ordinal and a month) is learned when first consumed, which is why spans are
+widened by a whole word of context. A lexicon reload clears the cache and the learned words of the language, and
+`span_cache_metrics()` reports hits, misses and evictions.
+
+The spans of a sentence:
+
+    python -m inverse_text_normalization.span_window --lang hi "मुझे दो सौ पानी की बोतल दो"
+'''
+
+DEFAULT_CONTEXT = 1
+DEFAULT_SPAN_CACHE_SIZE = 50000
+
+_span_caches: Dict[str, Optional[SentenceCache]] = {}
+_span_caches_lock = threading.Lock()
+# context words per language package, True for a word the grammars consumed or rewrote next to a trigger run
+_context_words: Dict[str, Dict[str, bool]] = {}
+
+
+def enabled() -> bool:
+    """
+    Returns whether span-windowed normalization is on, set ITN_SPAN_WINDOW=0 to compose whole chunks
+    """
+    return os.environ.get("ITN_SPAN_WINDOW", "1") == "1"
+
+
+def context_words() -> int:
+    """
+    Returns words of context added on each side of a span, ITN_SPAN_CONTEXT
+    """
+    return int(os.environ.get("ITN_SPAN_CONTEXT", DEFAULT_CONTEXT))
+
+
+def get_span_cache(lang: str) -> Optional[SentenceCache]:
+    """
+    Returns the span cache of a language package, None if span caching is off
+
+    Args:
+        lang: language package, e.g. 'hi'
+    """
+    if lang not in _span_caches:
+        with _span_caches_lock:
+            if lang not in _span_caches:
+                maxsize = int(os.environ.get("ITN_SPAN_CACHE_SIZE", DEFAULT_SPAN_CACHE_SIZE))
+                _span_caches[lang] = SentenceCache(maxsize) if maxsize > 0 else None
+    return _span_caches[lang]
+
+
+def clear_span_cache(lang: Optional[str] = None):
+    """
+    Empties the span cache of a language package, e.g. after a lexicon reload
+
+    Args:
+        lang: language package, all if None
+    """
+    for name, cache in list(_span_caches.items()):
+        if cache is not None and (lang is None or name == lang):
+            cache.clear()
+    for name in list(_context_words):
+        if lang is None or name == lang:
+            del _context_words[name]
+
+
+def span_cache_metrics() -> Dict[str, Dict[str, int]]:
+    """
+    Returns span cache metrics per language package
+    """
+    return {lang: cache.metrics() for lang, cache in sorted(_span_caches.items()) if cache is not None}
+
+
+def candidate_spans(words: List[str], lang: str, context: int = DEFAULT_CONTEXT) -> List[Tuple[int, int]]:
+    """
+    Finds the spans of a sentence to normalize
+
+    Args:
+        words: words of the sentence
+        lang: language package, e.g. 'hi'
+        context: words added on each side of a run of trigger words
+
+    Returns (start, end) word indices of the spans, in order and not touching
+    """
+    return _spans(get_filter(lang).trigger_tokens(words), context)
+
+
+def _spans(triggers: List[bool], context: int) -> List[Tuple[int, int]]:
+    spans = []
+    for i, is_trigger in enumerate(triggers):
+        if not is_trigger:
+            continue
+        start, end = max(i - context, 0), min(i + 1 + context, len(triggers))
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def normalize_spans(text: str, lang: str, normalize: Callable[[str], str], context: int = None) -> str:
+    """
+    Normalizes the candidate spans of a sentence and splices them back
+
+    Args:
+        text: sentence
+        lang: language package, e.g. 'hi'
+        normalize: normalizes a span with the grammars
+        context: words added on each side of a run of trigger words, ITN_SPAN_CONTEXT if None
+
+    Returns sentence in written form, with its whitespace normalized
+    """
+    words = split_words(text)
+    triggers = get_filter(lang).trigger_tokens(words)
+    output = []
+    position = 0
+    for start, end in _spans(triggers, context_words() if context is None else context):
+        output += words[position:start]
+        run_start = triggers.index(True, start, end)
+        run_end = end - triggers[start:end][::-1].index(True)
+        normalized = _normalize_span(words[start:run_start], words[run_start:run_end], words[run_end:end], lang,
+                                     normalize)
+        if normalized:
+            output.append(normalized)
+        position = end
+    output += words[position:]
+    return " ".join(output)
+
+
+def _normalize_span(left: List[str], run: List[str], right: List[str], lang: str,
+                    normalize: Callable[[str], str]) -> str:
+    """
+    Normalizes a trigger run with its context words through the span cache of the language package
+    """
+    cache = get_span_cache(lang)
+    span = " ".join(left + run + right)
+    if cache is None:
+        return normalize(span)
+    # tabs do not occur inside words, so a run kept with its context words never meets a bare run
+    context_key = "\t".join((" ".join(left), " ".join(run), " ".join(right)))
+    learned = _context_words.setdefault(lang, {})
+    consumed = [learned.get(word) for word in left + right]
+    if any(consumed):
+        normalized = cache.get(context_key)
+        if normalized is not None:
+            return normalized
+    elif None not in consumed:
+        normalized = cache.get(" ".join(run))
+        if normalized is not None:
+            return " ".join(left + [normalized] + right) if normalized else " ".join(left + right)
+    with tracked_trips() as trips:
+        normalized = normalize(span)
+    # the fallback output of a span over a limit is not kept
+    if trips:
+        return normalized
+    head = " ".join(left) + " " if left else ""
+    tail = " " + " ".join(right) if right else ""
+    kept_left = normalized.startswith(head)
+    kept_right = normalized.endswith(tail) and len(normalized) >= len(head) + len(tail)
+    for side, kept in ((left, kept_left), (right, kept_right)):
+        for word in side:
+            learned[word] = learned.get(word, False) or not kept
+    if kept_left and kept_right and not any(consumed):
+        cache.put(" ".join(run), normalized[len(head):len(normalized) - len(tail)].strip())
+    else:
+        cache.put(context_key, normalized)
+    return normalized
+
+
+def span_normalizer(lang: str, normalize: Callable[[str], str]) -> Callable[[str], str]:
+    """
+    Returns the normalizer of a chunk: its spans through the span cache, or the whole chunk with ITN_SPAN_WINDOW=0
+
+    Args:
+        lang: language package, e.g. 'hi'
+        normalize: normalizes a span with the grammars
+    """
+    if not enabled():
+        return normalize
+    return lambda text: normalize_spans(text, lang, normalize)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    parser.add_argument("--context", help="words of context on each side", type=int, default=DEFAULT_CONTEXT)
+    parser.add_argument("text", help="sentence", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sentence_words = split_words(args.text)
+    for span_start, span_end in candidate_spans(sentence_words, args.lang, args.context):
+        print(" ".join(sentence_words[span_start:span_end]))
@@ -0,0 +1,306 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import importlib.abc
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from inverse_text_normalization.resource_utils import current_rss, format_bytes, peak_rss, rss_since, sum_bytes
+
+'''
+Reports where worker cold start time and memory go, e.g.
+
+    python -m inverse_text_normalization.startup_profiler --itn_lang hi en
+    python -m inverse_text_normalization.startup_profiler --punctuate_lang hi --json startup.json
+
+Run it in a fresh process per target: modules imported by an earlier phase (torch for punctuation, say)
+are not imported, and so not counted, again. The report has
+
+    phases    wall time and RSS growth of `import punctuate.punctuate_text`, `import
+              inverse_text_normalization.run_predict`, the grammars of each ITN language and each
+              punctuation model load
+    modules   every module imported during the phases, with time and RSS growth including and excluding
+              the modules it imports in turn (the same numbers as `python -X importtime`, plus RSS)
+    packages  module self time and RSS summed per top-level package, e.g. torch, transformers, nemo
+    grammars  per-grammar compile (or FAR load) time and RSS of each ITN language, see grammar_profiler
+'''
+
+
+class _TimedLoader:
+    """
+    Delegates to a module loader and times module creation and execution
+    """
+
+    def __init__(self, loader, profiler: 'ImportProfiler', name: str):
+        self.loader = loader
+        self.profiler = profiler
+        self.name = name
+
+    def create_module(self, spec):
+        # extension modules are loaded (dlopen) here
+        return self.profiler._timed(self.name, lambda: self.loader.create_module(spec))
+
+    def exec_module(self, module):
+        # the module keeps the real loader, e.g. for importlib.resources
+        module.__loader__ = self.loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self.loader
+        return self.profiler._timed(self.name, lambda: self.loader.exec_module(module))
+
+    def __getattr__(self, attr):
+        return getattr(self.loader, attr)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """
+    Meta path finder that records time and RSS growth of every module imported while it is installed
+    """
+
+    def __init__(self):
+        self.records: Dict[str, Dict[str, object]] = {}
+        self._stack: List[Dict[str, object]] = []
+        self._finding = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def _timed(self, name: str, fn: Callable):
+        record = self.records.setdefault(
+            name, {"name": name, "seconds": 0.0, "self_seconds": 0.0, "rss_bytes": 0, "self_rss_bytes": 0}
+        )
+        frame = {"children_seconds": 0.0, "children_rss": 0}
+        self._stack.append(frame)
+        rss_before = current_rss()
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            seconds = time.perf_counter() - start
+            rss_bytes = rss_since(rss_before)
+            self._stack.pop()
+            record["seconds"] += seconds
+            record["self_seconds"] += seconds - frame["children_seconds"]
+            record["rss_bytes"] = sum_bytes([record["rss_bytes"], rss_bytes])
+            self_rss_bytes = None if rss_bytes is None else rss_bytes - frame["children_rss"]
+            record["self_rss_bytes"] = sum_bytes([record["self_rss_bytes"], self_rss_bytes])
+            if self._stack:
+                self._stack[-1]["children_seconds"] += seconds
+                self._stack[-1]["children_rss"] = sum_bytes([self._stack[-1]["children_rss"], rss_bytes])
+
+    def __enter__(self):
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        return False
+
+    def modules(self) -> List[Dict[str, object]]:
+        """
+        Returns per-module records, slowest (self time) first
+        """
+        records = [dict(r, seconds=round(r["seconds"], 4), self_seconds=round(r["self_seconds"], 4))
+                   for r in self.records.values()]
+        return sorted(records, key=lambda r: r["self_seconds"], reverse=True)
+
+    def packages(self) -> List[Dict[str, object]]:
+        """
+        Returns module self time and RSS summed per top-level package, slowest first
+        """
+        packages: Dict[str, Dict[str, object]] = {}
+        for r in self.records.values():
+            name = r["name"].split(".")[0]
+            package = packages.setdefault(name, {"name": name, "modules": 0, "seconds": 0.0, "rss_bytes": 0})
+            package["modules"] += 1
+            package["seconds"] += r["self_seconds"]
+            package["rss_bytes"] = sum_bytes([package["rss_bytes"], r["self_rss_bytes"]])
+        for package in packages.values():
+            package["seconds"] = round(package["seconds"], 4)
+        return sorted(packages.values(), key=lambda p: p["seconds"], reverse=True)
+
+
+class StartupProfiler:
+    """
+    Times the startup phases of a worker with the imports made during them
+
+    Args:
+        imports: import profiler installed for the phases
+    """
+
+    def __init__(self, imports: ImportProfiler):
+        self.imports = imports
+        self.phases: List[Dict[str, object]] = []
+        self.grammars: Dict[str, List[Dict[str, object]]] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        rss_before = current_rss()
+        start = time.perf_counter()
+        record = {"phase": name}
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - start, 4)
+            record["rss_bytes"] = rss_since(rss_before)
+            self.phases.append(record)
+
+    def profile_itn(self, langs: List[str]):
+        """
+        Imports inverse_text_normalization.run_predict and loads the grammars of langs, profiling each grammar
+        """
+        with self.phase("import inverse_text_normalization.run_predict"):
+            run_predict = importlib.import_module("inverse_text_normalization.run_predict")
+        for lang in langs:
+            package = run_predict.ITN_LANGUAGE_PACKAGES[lang]
+            with self.phase(f"itn grammars {lang}") as record:
+                grammar_profiler = _grammar_profiler(package)
+                if grammar_profiler is None:
+                    run_predict.get_itn(lang)
+                else:
+                    with grammar_profiler:
+                        run_predict.get_itn(lang)
+                    self.grammars[lang] = grammar_profiler.report()["grammars"]
+                    # only the final tagger and verbalizer are constructed when both load from FARs
+                    record["grammars_built"] = len(self.grammars[lang])
+
+    def profile_punctuate(self, langs: List[str]):
+        """
+        Imports punctuate.punctuate_text and loads the punctuation model of langs
+        """
+        with self.phase("import punctuate.punctuate_text"):
+            punctuate_text = importlib.import_module("punctuate.punctuate_text")
+        for lang in langs:
+            with self.phase(f"punctuation model {lang}"):
+                punctuate_text.Punctuation(lang)
+
+    def report(self, top: Optional[int] = None) -> Dict[str, object]:
+        """
+        Returns phases, modules (the `top` slowest), packages and grammars
+        """
+        modules = self.imports.modules()
+        return {
+            "phases": self.phases,
+            "total_seconds": round(sum(p["seconds"] for p in self.phases), 4),
+            "total_rss_bytes": sum_bytes(p["rss_bytes"] for p in self.phases),
+            "peak_rss_bytes": peak_rss(),
+            "modules": modules[:top] if top else modules,
+            "packages": self.imports.packages(),
+            "grammars": self.grammars,
+        }
+
+
+def _grammar_profiler(package: str):
+    """
+    Returns a GrammarProfiler of the language package, None where pynini (and so any grammar) is not available
+    """
+    try:
+        import pynini  # noqa: F401
+    except (ModuleNotFoundError, ImportError):
+        return None
+    from inverse_text_normalization.grammar_profiler import GrammarProfiler
+
+    return GrammarProfiler(package, check_optimize=False)
+
+
+def profile_startup(itn_langs: List[str], punctuate_langs: List[str], top: Optional[int] = 30) -> Dict[str, object]:
+    """
+    Profiles the startup of a punctuation and/or inverse text normalization worker in this process
+
+    Args:
+        itn_langs: ITN language codes whose grammars to load, e.g. ['hi', 'or']
+        punctuate_langs: language codes whose punctuation model to load
+        top: number of slowest modules to report, all if None
+
+    Returns startup report
+    """
+    with ImportProfiler() as imports:
+        profiler = StartupProfiler(imports)
+        if punctuate_langs:
+            profiler.profile_punctuate(punctuate_langs)
+        if itn_langs:
+            profiler.profile_itn(itn_langs)
+    return profiler.report(top=top)
+
+
+def format_report(report: Dict[str, object], top_grammars: int = 10) -> str:
+    """
+    Formats a startup report as tables
+    """
+    lines = [f"{'phase':<52} {'seconds':>9} {'rss':>11}"]
+    for p in report["phases"]:
+        lines.append(f"{p['phase']:<52} {p['seconds']:>9.3f} {format_bytes(p['rss_bytes']):>11}")
+    lines.append(f"{'total':<52} {report['total_seconds']:>9.3f} {format_bytes(report['total_rss_bytes']):>11}")
+    lines.append(f"{'peak':<52} {'':>9} {format_bytes(report['peak_rss_bytes']):>11}")
+
+    lines += ["", f"{'package':<32} {'modules':>8} {'self s':>9} {'self rss':>11}"]
+    for p in report["packages"]:
+        lines.append(f"{p['name']:<32} {p['modules']:>8} {p['seconds']:>9.3f} {format_bytes(p['rss_bytes']):>11}")
+
+    lines += ["", f"{'module':<60} {'total s':>9} {'self s':>9} {'rss':>11} {'self rss':>11}"]
+    for m in report["modules"]:
+        lines.append(
+            f"{m['name']:<60} {m['seconds']:>9.3f} {m['self_seconds']:>9.3f} "
+            f"{format_bytes(m['rss_bytes']):>11} {format_bytes(m['self_rss_bytes']):>11}"
+        )
+
+    for lang, grammars in report["grammars"].items():
+        lines += ["", f"{'grammars ' + lang:<48} {'total s':>8} {'self s':>8} {'rss':>10}"]
+        for g in grammars[:top_grammars]:
+            lines.append(
+                f"{g['name']:<48} {g['seconds']:>8.3f} {g['self_seconds']:>8.3f} {format_bytes(g['rss_bytes']):>10}"
+            )
+    return "\n".join(lines)
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--itn_lang", help="ITN language codes to load", nargs="*", default=[])
+    parser.add_argument("--punctuate_lang", help="punctuation model language codes to load", nargs="*", default=[])
+    parser.add_argument("--top", help="number of slowest modules to report, 0 for all", type=int, default=30)
+    parser.add_argument("--json", help="write the report to this JSON file", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not args.itn_lang and not args.punctuate_lang:
+        args.itn_lang = ["hi"]
+    startup_report = profile_startup(args.itn_lang, args.punctuate_lang, top=args.top or None)
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump(startup_report, fp, indent=2, ensure_ascii=False)
+    else:
+        print(format_report(startup_report))
@@ -0,0 +1,75 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+from typing import Dict
+
+try:
+    import pynini
+
+    PYNINI_AVAILABLE = True
+except (ModuleNotFoundError, ImportError):
+    PYNINI_AVAILABLE = False
+
+'''
+Process-wide cache for `pynini.string_file`, keyed by file content.
+
+Identical tables, whether read twice by one grammar or shipped by several languages, are compiled once.
+Callers get a copy of the cached fst: copies share the compiled states until one of them is modified
+(e.g. by `.invert()` or `.optimize()`), so the cached fst is never changed by its users.
+'''
+
+_cache: Dict[tuple, 'pynini.Fst'] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def string_file(path: str, **kwargs) -> 'pynini.Fst':
+    """
+    Drop-in replacement for pynini.string_file that compiles each distinct table once per process
+
+    Args:
+        path: path to tsv or txt file
+        kwargs: passed on to pynini.string_file, e.g. input_token_type
+
+    Returns fst compiled from the file
+    """
+    with open(path, "rb") as fp:
+        digest = hashlib.sha256(fp.read()).hexdigest()
+    key = (digest, tuple(sorted(kwargs.items())))
+    with _lock:
+        fst = _cache.get(key)
+        if fst is None:
+            _stats["misses"] += 1
+            fst = _cache[key] = pynini.string_file(path, **kwargs)
+        else:
+            _stats["hits"] += 1
+        return fst.copy()
+
+
+def cache_info() -> Dict[str, int]:
+    """
+    Returns hit and miss counts and number of cached tables
+    """
+    with _lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "tables": len(_cache)}
+
+
+def clear_cache():
+    """
+    Drops all cached tables to release their memory. Keeps statistics.
+    """
+    with _lock:
+        _cache.clear()
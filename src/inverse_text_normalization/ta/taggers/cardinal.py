@@ -17,6 +17,7 @@
 import pynini
 from pynini.lib import pynutil, utf8
 
+from inverse_text_normalization.string_file_cache import string_file
 from inverse_text_normalization.ta.data_loader_utils import get_abs_path
 from inverse_text_normalization.ta.graph_utils import (
     NEMO_DIGIT,
@@ -65,22 +66,22 @@ class CardinalFst(GraphFst):
         TAMIL_DIGIT = pynini.union(*tamil_digits).optimize()
         TAMIL_DIGIT_WITH_ZERO = pynini.union(*tamil_digits_with_zero).optimize()
 
-        tamil_graph_zero = pynini.string_file(get_abs_path(data_path + "numbers/ta_zero.tsv"))
-        tamil_graph_tens = pynini.string_file(get_abs_path(data_path + "numbers/ta_tens.tsv"))
-        tamil_graph_digit = pynini.string_file(get_abs_path(data_path + "numbers/ta_digit.tsv"))
-        tamil_graph_hundred_digit = pynini.string_file(get_abs_path(data_path + "numbers/ta_hundred_digit.tsv"))
-        tamil_graph_thousand_digit = pynini.string_file(get_abs_path(data_path + "numbers/ta_thousand_digit.tsv"))
-        tamil_graph_lakh_digit = pynini.string_file(get_abs_path(data_path + "numbers/ta_lakh_digit.tsv"))
-        tamil_graph_crore_digit = pynini.string_file(get_abs_path(data_path + "numbers/ta_crore_digit.tsv"))
-        tamil_graph_exception_list = pynini.string_file(get_abs_path(data_path + "numbers/ta_exceptions.tsv"))
-
-        graph_zero = pynini.string_file(get_abs_path(data_path + "numbers/zero.tsv"))  
-        graph_digit = pynini.string_file(get_abs_path(data_path + "numbers/digit.tsv"))
-        graph_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
-        graph_ties = pynini.string_file(get_abs_path(data_path + "numbers/ties.tsv"))
-        graph_chars = pynini.string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
-        graph_char_multiples = pynini.string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
-        graph_tens_en = pynini.string_file(get_abs_path(data_path + "numbers/tens-en.tsv"))
+        tamil_graph_zero = string_file(get_abs_path(data_path + "numbers/ta_zero.tsv"))
+        tamil_graph_tens = string_file(get_abs_path(data_path + "numbers/ta_tens.tsv"))
+        tamil_graph_digit = string_file(get_abs_path(data_path + "numbers/ta_digit.tsv"))
+        tamil_graph_hundred_digit = string_file(get_abs_path(data_path + "numbers/ta_hundred_digit.tsv"))
+        tamil_graph_thousand_digit = string_file(get_abs_path(data_path + "numbers/ta_thousand_digit.tsv"))
+        tamil_graph_lakh_digit = string_file(get_abs_path(data_path + "numbers/ta_lakh_digit.tsv"))
+        tamil_graph_crore_digit = string_file(get_abs_path(data_path + "numbers/ta_crore_digit.tsv"))
+        tamil_graph_exception_list = string_file(get_abs_path(data_path + "numbers/ta_exceptions.tsv"))
+
+        graph_zero = string_file(get_abs_path(data_path + "numbers/zero.tsv"))  
+        graph_digit = string_file(get_abs_path(data_path + "numbers/digit.tsv"))
+        graph_multiples = string_file(get_abs_path(data_path + "numbers/multiples.tsv"))
+        graph_ties = string_file(get_abs_path(data_path + "numbers/ties.tsv"))
+        graph_chars = string_file(get_abs_path(data_path + "numbers/alphabets.tsv"))
+        graph_char_multiples = string_file(get_abs_path(data_path + "numbers/multiples_alphabets.tsv"))
+        graph_tens_en = string_file(get_abs_path(data_path + "numbers/tens-en.tsv"))
 
         tamil_cents = pynini.accep("ற்று") | pynini.accep('த்தி')
         tamil_thousands = pynini.accep('யிரத்து') | pynini.accep('யிரத்தி') | pynini.accep('யிரம்')
@@ -0,0 +1,128 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+import string
+from collections import OrderedDict
+from typing import List, Tuple, Union
+
+'''
+Parser of the tagger output shared by all language packages. It reads one `key: "value"`, `key {` or
+`preserve_order: true` entry per regex match instead of one character per call, and gives the same dictionaries
+as the per-character parser each language package used to carry (kept in benchmarks/token_parser.py).
+'''
+
+PRESERVE_ORDER_KEY = "preserve_order"
+EOS = "<EOS>"
+
+KEY_CHARS = string.ascii_letters + "_"
+
+# one entry: key, then `: true` (preserve_order only), `: "value"` up to the first quote followed by a space, or `{`
+_ENTRY = re.compile(
+    r' *(?P<key>[A-Za-z_]+) *'
+    r'(?:(?P<true>: *true)|: *"(?P<value>(?![ \t\n\r\x0b\x0c]).*?)"(?= )|(?P<open>\{))',
+    re.DOTALL,
+)
+_SPACES = re.compile(r" *")
+
+
+def parse_entries(text: str, index: int = 0) -> Tuple[List[Tuple[str, Union[str, bool, dict]]], int]:
+    """
+    Implements grammar:
+    F-> no_space KG no_space
+    G-> no_space :"VALUE" no_space | no_space {A} no_space
+
+    Args:
+        text: tokenized text
+        index: position to start at
+
+    Returns (key, value) pairs up to the end of the text or the first character that starts no key, and
+    the position of that character
+    """
+    entries = []
+    while True:
+        match = _ENTRY.match(text, index)
+        if match is None:
+            break
+        key, true, value, open_brace = match.groups()
+        if key == PRESERVE_ORDER_KEY or true is not None:
+            if key != PRESERVE_ORDER_KEY or true is None:
+                raise ValueError(f"malformed {key} at {match.start(1)}")
+            value = True
+            index = match.end()
+        elif open_brace is not None:
+            nested, index = parse_entries(text, match.end())
+            index = _SPACES.match(text, index).end()
+            if index >= len(text) or text[index] != "}":
+                raise ValueError(f"missing }} of {key} at {index}")
+            # flatten tokens
+            value = OrderedDict(nested)
+            index += 1
+        else:
+            value = value or None
+            index = match.end()
+        entries.append((key, value))
+
+    index = _SPACES.match(text, index).end()
+    if index < len(text) and (text[index] in KEY_CHARS or text[index] in string.whitespace):
+        raise ValueError(f"malformed entry at {index}")
+    return entries, index
+
+
+def parse_tokens(text: str) -> List[dict]:
+    """
+    Parses tokenized/classified text without any shared state, safe to call from several threads
+
+    Args:
+        text: tokenized text, e.g. 'tokens { cardinal { integer: "420" } }'
+
+    Returns list of dictionaries, raises ValueError on malformed text
+    """
+    if not text:
+        raise IndexError("cannot parse an empty string")
+    entries, _ = parse_entries(text)
+    return [OrderedDict([entry]) for entry in entries]
+
+
+class TokenParser:
+    """
+    Parses tokenized/classified text, e.g. 'tokens { money { integer: "20" currency: "$" } } tokens { name: "left"}'.
+    Keeps the text between the two calls, so an instance must not be shared between threads; see parse_tokens.
+
+    Args
+        text: tokenized text
+    """
+
+    def __call__(self, text):
+        """
+        Setup function
+
+        Args:
+            text: text to be parsed
+
+        """
+        if not text:
+            raise IndexError("cannot parse an empty string")
+        self.text = text
+        self.index = 0
+
+    def parse(self) -> List[dict]:
+        """
+        Main function. Implements grammar:
+        A -> space F space F space F ... space
+
+        Returns list of dictionaries, raises ValueError on malformed text
+        """
+        entries, self.index = parse_entries(self.text, self.index)
+        return [OrderedDict([entry]) for entry in entries]
@@ -0,0 +1,366 @@
+# Copyright (c) 2021, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import logging
+import os
+import re
+import string
+import threading
+from argparse import ArgumentParser
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+'''
+Prefilter that lets `<lang>/inverse_normalize.py` skip the grammars for sentences without anything to normalize.
+
+Every conversion the tagger makes contains a digit, a punctuation mark or a trigger word. The trigger words come
+from the compiled tagger itself: `<lang>/inverse_normalize.py` registers a function tagging a single word
+(register_tagger), and a word triggers when the tagger does not tag it alone as the unchanged `name` of the
+WordFst branch, e.g. "five", "o" for zero or "doctor" -> "dr.". The answer is cached per word (TAGGED_WORDS
+words per language). The words of the data tables (numbers and ordinals, also as part of a fused word (e.g.
+Tamil), months, units, magnitudes and multi-word whitelist entries) are compiled into an Aho-Corasick automaton
+checked first, and are the only triggers where no tagger is registered, as without pynini. A sentence without
+digits, punctuation or triggers is returned with its whitespace normalized, as the grammars would return it.
+
+The share of sentences taking this fast path is logged every LOG_EVERY sentences and returned by `stats()`.
+Set ITN_TRIGGER_PREFILTER=0 to always run the grammars. The table triggers of a language, or whether a sentence
+takes the fast path with the tagger of the language:
+
+    python -m inverse_text_normalization.trigger_filter --lang hi [--text "..."]
+'''
+
+logger = logging.getLogger(__name__)
+
+LOG_EVERY = 1000
+PACKAGE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# data tables -> (column with the spoken form, whole words only). The grammars of the other tables (time zones,
+# suppletive plurals...) only apply next to a number
+TRIGGER_TABLES = {
+    "numbers": (0, False),
+    "ordinals": (0, False),
+    "months.tsv": (0, True),
+    "currency.tsv": (1, True),
+    "magnitudes.tsv": (1, True),
+    "measurements.tsv": (1, True),
+    "whitelist.tsv": (1, True),
+}
+WHOLE_WORD_NUMBER_TABLES = ("alphabets.tsv", "multiples_alphabets.tsv")
+# words per language whose single-word tagging is cached
+TAGGED_WORDS = 200000
+
+# whitespace deleted by delete_space / delete_extra_space of the grammars
+GRAMMAR_WHITESPACE = " \t\n\r\u00a0"
+_GRAMMAR_WHITESPACE_RUN = re.compile(f"[{GRAMMAR_WHITESPACE}]+")
+# digits, punctuation (PunctuationFst splits it off words) and any other whitespace always go through the grammars
+_NEEDS_GRAMMARS = re.compile(r"[\d" + re.escape(string.punctuation) + r"।॥]|[^\S" + GRAMMAR_WHITESPACE + r"]")
+
+
+def enabled() -> bool:
+    """
+    Returns whether the prefilter is on, set ITN_TRIGGER_PREFILTER=0 to turn it off
+    """
+    return os.environ.get("ITN_TRIGGER_PREFILTER", "1") != "0"
+
+
+class TriggerMatcher:
+    """
+    Aho-Corasick automaton over a set of trigger strings
+
+    Args:
+        patterns: trigger strings
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        # lengths of the patterns ending in each state, including those of its fail states
+        self.outputs: List[Tuple[int, ...]] = [()]
+        self.num_patterns = 0
+        for pattern in patterns:
+            self._add(pattern)
+        self.fail = [0] * len(self.goto)
+        self._link()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = self.goto[state][char] = len(self.goto)
+                self.goto.append({})
+                self.outputs.append(())
+            state = next_state
+        if len(pattern) not in self.outputs[state]:
+            self.outputs[state] += (len(pattern),)
+            self.num_patterns += 1
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                # children of the root fail to the root
+                self.fail[next_state] = self.goto[fail].get(char, 0) if state else 0
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (start, end) of every trigger occurrence in text, by end position
+        """
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in outputs[state]:
+                yield end - length, end
+
+    def search(self, text: str) -> bool:
+        """
+        Returns whether text contains a trigger
+        """
+        return next(self.finditer(text), None) is not None
+
+
+def _table_words(path: str, column: int) -> Set[str]:
+    words = set()
+    with open(path, encoding="utf-8") as fp:
+        for line in fp:
+            columns = [c.strip() for c in line.rstrip("\r\n").split("\t")]
+            if not columns[0]:
+                continue
+            if len(columns) > 1 and columns[0] == columns[1]:
+                # e.g. A -> A, nothing to normalize
+                continue
+            words.add(" ".join(columns[min(column, len(columns) - 1)].split()))
+    return words
+
+
+def trigger_words(lang: str) -> Dict[str, bool]:
+    """
+    Collects the triggers of a language package from its data tables
+
+    Args:
+        lang: language package, e.g. 'hi'
+
+    Returns trigger -> whether it only matches as whole words
+    """
+    data_dir = os.path.join(PACKAGE_ROOT, lang, "data")
+    tables = []
+    for name, (column, whole_word) in TRIGGER_TABLES.items():
+        path = os.path.join(data_dir, name)
+        if os.path.isdir(path):
+            for file_name in sorted(os.listdir(path)):
+                if file_name.endswith(".tsv"):
+                    tables.append((os.path.join(path, file_name), column, whole_word or file_name in WHOLE_WORD_NUMBER_TABLES))
+        elif os.path.exists(path):
+            tables.append((path, column, whole_word))
+
+    words = {}
+    for path, column, whole_word in tables:
+        for word in _table_words(path, column):
+            # a word that also matches anywhere stays a number trigger
+            words[word] = words.get(word, True) and whole_word
+    # sentences with digits or punctuation go through the grammars anyway
+    return {word: whole_word for word, whole_word in words.items() if word and not _NEEDS_GRAMMARS.search(word)}
+
+
+class TriggerFilter:
+    """
+    Decides per sentence whether the grammars of a language package can change it
+
+    Args:
+        lang: language package, e.g. 'hi'
+        tag_word: tags a single word with the compiled tagger, None to use the data tables only
+    """
+
+    def __init__(self, lang: str, tag_word: Optional[Callable[[str], str]] = None):
+        self.lang = lang
+        # whole-word triggers are padded with spaces, and so are the sentences
+        self.matcher = TriggerMatcher(
+            sorted(f" {word} " if whole_word else word for word, whole_word in trigger_words(lang).items())
+        )
+        self.tag_word = tag_word
+        self.is_tagger_trigger = lru_cache(maxsize=TAGGED_WORDS)(self._is_tagger_trigger)
+
+    def _is_tagger_trigger(self, word: str) -> bool:
+        """
+        Returns whether the tagger changes word on its own
+        """
+        if self.tag_word is None:
+            return False
+        try:
+            return self.tag_word(word) != f'tokens {{ name: "{word}" }}'
+        except Exception:
+            # e.g. over a limit, the grammars decide
+            return True
+
+    def needs_grammars(self, text: str) -> bool:
+        """
+        Returns whether text, with its whitespace normalized, contains a digit, punctuation mark or trigger
+        """
+        if _NEEDS_GRAMMARS.search(text) is not None or self.matcher.search(f" {text} "):
+            return True
+        is_tagger_trigger = self.is_tagger_trigger
+        return any(is_tagger_trigger(word) for word in text.split(" ") if word)
+
+    def trigger_tokens(self, tokens: List[str]) -> List[bool]:
+        """
+        Marks the tokens of a sentence that contain a digit, punctuation mark or (part of) a trigger
+
+        Args:
+            tokens: words of the sentence
+
+        Returns flag per token
+        """
+        flags = [_NEEDS_GRAMMARS.search(token) is not None for token in tokens]
+        starts = []
+        position = 1
+        for token in tokens:
+            starts.append(position)
+            position += len(token) + 1
+        for start, end in self.matcher.finditer(f" {' '.join(tokens)} "):
+            # whole-word triggers include the spaces around them
+            i = max(bisect_right(starts, start) - 1, 0)
+            while i < len(tokens) and starts[i] < end:
+                if starts[i] + len(tokens[i]) > start:
+                    flags[i] = True
+                i += 1
+        is_tagger_trigger = self.is_tagger_trigger
+        return [flag or is_tagger_trigger(token) for flag, token in zip(flags, tokens)]
+
+
+_filters: Dict[str, TriggerFilter] = {}
+_filters_lock = threading.Lock()
+_taggers: Dict[str, Callable[[str], str]] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def get_filter(lang: str) -> TriggerFilter:
+    """
+    Returns the trigger filter of a language package, compiling it on first use
+    """
+    trigger_filter = _filters.get(lang)
+    if trigger_filter is None:
+        with _filters_lock:
+            trigger_filter = _filters.get(lang)
+            if trigger_filter is None:
+                trigger_filter = _filters[lang] = TriggerFilter(lang, _taggers.get(lang))
+    return trigger_filter
+
+
+def register_tagger(lang: str, tag_word: Optional[Callable[[str], str]]):
+    """
+    Sets the function tagging a single word with the compiled tagger of a language package, whose output decides
+    which words trigger
+
+    Args:
+        lang: language package, e.g. 'hi'
+        tag_word: word -> shortest path of the tagger, None to use the data tables only
+    """
+    with _filters_lock:
+        if tag_word is None:
+            _taggers.pop(lang, None)
+        else:
+            _taggers[lang] = tag_word
+        _filters.pop(lang, None)
+
+
+def clear(lang: Optional[str] = None):
+    """
+    Drops the compiled trigger filters and their tagged words, e.g. after a lexicon reload
+
+    Args:
+        lang: language package, all if None
+    """
+    with _filters_lock:
+        if lang is None:
+            _filters.clear()
+        else:
+            _filters.pop(lang, None)
+
+
+def _count(lang: str, fast_path: bool):
+    with _stats_lock:
+        counts = _stats.setdefault(lang, {"sentences": 0, "fast_path": 0})
+        counts["sentences"] += 1
+        counts["fast_path"] += fast_path
+        sentences, fast = counts["sentences"], counts["fast_path"]
+    if sentences % LOG_EVERY == 0:
+        logger.info(f"{lang}: fast path for {fast} of {sentences} sentences ({100 * fast / sentences:.1f}%)")
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Splits text on the whitespace the grammars delete
+    """
+    return [word for word in _GRAMMAR_WHITESPACE_RUN.split(text) if word]
+
+
+def skip_grammars(text: str, lang: str) -> Optional[str]:
+    """
+    Returns the normalized text of a sentence the grammars would not change, None if it needs the grammars
+
+    Args:
+        text: sentence
+        lang: language package, e.g. 'hi'
+
+    Returns text with whitespace normalized, or None
+    """
+    if not enabled():
+        return None
+    normalized = " ".join(split_words(text))
+    fast_path = not get_filter(lang).needs_grammars(normalized)
+    _count(lang, fast_path)
+    return normalized if fast_path else None
+
+
+def stats(lang: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Returns sentences seen and sentences that took the fast path, per language package
+
+    Args:
+        lang: only this language package
+    """
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items() if lang is None or k == lang}
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument("--lang", help="language package, e.g. hi", required=True, type=str)
+    parser.add_argument("--text", help="report whether this sentence needs the grammars", type=str)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.text is not None:
+        # registers the tagger
+        importlib.import_module(f"inverse_text_normalization.{args.lang}.inverse_normalize")
+        print("fast path" if skip_grammars(args.text, args.lang) is not None else "grammars")
+    else:
+        for word, whole_word in sorted(trigger_words(args.lang).items()):
+            print(f"{word}\t{'word' if whole_word else 'anywhere'}")